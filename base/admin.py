@@ -6,10 +6,15 @@ Contents can be added to or modified for the various content types.
 """
 
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext_lazy as _
 
 from .models import Category, Content, Comment, Course
 from .models import CourseStructureEntry, Favorite, Period, Profile
-from .models import Rating, Tag, Topic
+from .models import MediaBlob, Rating, Tag, Topic
+from .slow_queries import clear_samples, get_samples, group_samples
 
 
 @admin.register(Course)
@@ -101,6 +106,22 @@ class FavoriteAdmin(admin.ModelAdmin):
     list_display_links = ['user', 'course', 'content']
 
 
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    """Media blob admin
+
+    Represents the media blob model in the admin panel.
+
+    :attr MediaBlobAdmin.list_display: Controls which fields are displayed on the change
+    list page of the admin
+    :type MediaBlobAdmin.list_display: list[str]
+    :attr MediaBlobAdmin.readonly_fields: Controls which fields are non-editable
+    :type MediaBlobAdmin.readonly_fields: list[str]
+    """
+    list_display = ['name', 'size', 'references', 'creation_date']
+    readonly_fields = ['name', 'size', 'references', 'creation_date']
+
+
 @admin.register(Period)
 class PeriodAdmin(admin.ModelAdmin):
     """Period admin
@@ -144,3 +165,28 @@ class TopicAdmin(admin.ModelAdmin):
 
     Represents the topic model in the admin panel.
     """
+
+
+def slow_queries_view(request):
+    """Slow queries view
+
+    Shows the captured slow queries grouped by their normalized SQL to superusers, the
+    samples are deleted by a POST request.
+
+    :param request: The given request
+    :type request: HttpRequest
+
+    :return: the page of the slow queries
+    :rtype: HttpResponse
+    """
+    if not request.user.is_superuser:
+        raise PermissionDenied
+    if request.method == 'POST':
+        clear_samples()
+        return redirect('slow-queries')
+    context = {
+        **admin.site.each_context(request),
+        'title': _('Slow queries'),
+        'groups': group_samples(get_samples()),
+    }
+    return TemplateResponse(request, 'admin/base/slow_queries.html', context)
@@ -15,3 +15,13 @@ class BaseConfig(AppConfig):
     :type BaseConfig.name: str
     """
     name = 'base'
+
+    def ready(self):
+        """Ready
+
+        Registers the signal receivers which invalidate the snapshots of the courses and
+        which configure the connections to the database.
+        """
+        # pylint: disable=import-outside-toplevel, unused-import
+        import base.database
+        import base.signals
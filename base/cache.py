@@ -0,0 +1,418 @@
+"""Purpose of this file
+
+This file contains the helpers to build cache keys which are invalidated by versions, to
+cache values in namespaces, to count the hits and misses of the namespaces and to cache the
+pages shown to anonymous users.
+"""
+
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from functools import partial, wraps
+from uuid import uuid4
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connection, transaction
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.translation import get_language
+
+# int: Seconds until a cached page of an anonymous user is rendered again, the pages are
+# also invalidated on every change of their course
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 60 * 60
+
+# int: Seconds for which proxies and browsers may reuse a page of an anonymous user
+ANONYMOUS_PAGE_MAX_AGE = 60
+
+# str: The key of the kinds of namespaces whose hits and misses were counted
+STATISTICS_KINDS_KEY = 'statistics:kinds'
+
+# Counter: The hits and misses by the kinds of namespaces, which were counted by this
+# process since they were last added to the shared statistics
+_COUNTS = Counter()
+
+# object: The marker of a missing cache entry, as None may be cached
+_MISSING = object()
+
+
+def new_version():
+    """New version
+
+    Returns a new random version. The version starts with the current time in microseconds,
+    so that the time when a namespace was invalidated can be read from its version.
+
+    :return: the new version
+    :rtype: str
+    """
+    return f'{time.time_ns() // 1000:x}-{uuid4().hex}'
+
+
+def get_version_date(version):
+    """Version date
+
+    Returns the date when the version was created, i.e. when its namespace was invalidated
+    or, if the version was evicted, created again.
+
+    :param version: The version of a namespace
+    :type version: str
+
+    :return: the date of the version or None if the version does not contain a date
+    :rtype: datetime or None
+    """
+    timestamp, _, random = version.partition('-')
+    if not random:
+        return None
+    return datetime.fromtimestamp(int(timestamp, 16) / 10 ** 6, timezone.utc)
+
+
+def get_version(namespace):
+    """Version
+
+    Returns the current version of the namespace. The version is created if the namespace
+    does not have a version yet.
+
+    :param namespace: The namespace of the cache entries
+    :type namespace: str
+
+    :return: the current version of the namespace
+    :rtype: str
+    """
+    return cache.get_or_set(f'version:{namespace}', new_version, None)
+
+
+def get_versions(namespaces):
+    """Versions
+
+    Returns the current versions of the namespaces with a single cache lookup. The versions
+    are created for the namespaces which do not have a version yet.
+
+    :param namespaces: The namespaces of the cache entries
+    :type namespaces: list[str]
+
+    :return: the current versions by their namespaces
+    :rtype: dict[str, str]
+    """
+    keys = {f'version:{namespace}': namespace for namespace in namespaces}
+    versions = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        # Overwriting a version created in the meantime only causes cache misses
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return {namespace: versions[key] for key, namespace in keys.items()}
+
+
+def bump_version(namespace):
+    """Bump version
+
+    Replaces the version of the namespace, so that all cache entries with a key of the
+    previous version are not used anymore. A random version is used, so that an evicted
+    version can never be reused for stale entries.
+
+    :param namespace: The namespace of the cache entries
+    :type namespace: str
+    """
+    cache.set(f'version:{namespace}', new_version(), None)
+
+
+def invalidate_version(namespace):
+    """Invalidate version
+
+    Bumps the version of the namespace now and again after the current transaction was
+    committed. Until the commit other requests still read the previous data and may cache it
+    under the new version, the second bump drops these entries. The first bump lets the
+    request itself read its changes.
+
+    :param namespace: The namespace of the cache entries
+    :type namespace: str
+    """
+    bump_version(namespace)
+    if connection.in_atomic_block:
+        transaction.on_commit(partial(bump_version, namespace))
+
+
+def make_key(namespace, *parts):
+    """Make key
+
+    Returns the cache key for an entry in the namespace with its current version.
+
+    :param namespace: The namespace of the cache entry
+    :type namespace: str
+    :param parts: The parts identifying the entry in the namespace
+    :type parts: Any
+
+    :return: the cache key
+    :rtype: str
+    """
+    return ':'.join([namespace, get_version(namespace), *map(str, parts)])
+
+
+def get_kind(namespace):
+    """Kind
+
+    Returns the kind of the namespace, which is its first part, e.g. course-pages for the
+    namespace course-pages:1.
+
+    :param namespace: The namespace of the cache entries
+    :type namespace: str
+
+    :return: the kind of the namespace
+    :rtype: str
+    """
+    return namespace.split(':', 1)[0]
+
+
+def count(namespace, hits=0, misses=0):
+    """Count
+
+    Counts hits and misses of the namespace for the statistics.
+
+    :param namespace: The namespace of the cache entries
+    :type namespace: str
+    :param hits: The number of hits
+    :type hits: int
+    :param misses: The number of misses
+    :type misses: int
+    """
+    kind = get_kind(namespace)
+    if hits:
+        _COUNTS[kind, 'hits'] += hits
+    if misses:
+        _COUNTS[kind, 'misses'] += misses
+
+
+def cached(namespace, parts, compute, timeout=DEFAULT_TIMEOUT, alias=DEFAULT_CACHE_ALIAS):
+    """Cached
+
+    Returns the value of the entry in the namespace with its current version. The value is
+    computed and cached if the entry is missing.
+
+    :param namespace: The namespace of the cache entry
+    :type namespace: str
+    :param parts: The parts identifying the entry in the namespace
+    :type parts: Iterable[Any]
+    :param compute: The function computing the value
+    :type compute: Callable[[], Any]
+    :param timeout: Seconds until the entry expires, defaults to the timeout of the cache
+    :type timeout: int or None
+    :param alias: The alias of the cache
+    :type alias: str
+
+    :return: the value of the entry
+    :rtype: Any
+    """
+    key = make_key(namespace, *parts)
+    value = caches[alias].get(key, _MISSING)
+    if value is _MISSING:
+        count(namespace, misses=1)
+        value = compute()
+        caches[alias].set(key, value, timeout)
+    else:
+        count(namespace, hits=1)
+    return value
+
+
+def flush_statistics():
+    """Flush statistics
+
+    Adds the hits and misses counted by this process to the statistics in the cache, which
+    are shared by all processes if the cache is shared.
+    """
+    if not _COUNTS:
+        return
+    counts = dict(_COUNTS)
+    _COUNTS.clear()
+    kinds = cache.get(STATISTICS_KINDS_KEY, set())
+    new_kinds = {kind for kind, _ in counts} - kinds
+    if new_kinds:
+        cache.set(STATISTICS_KINDS_KEY, kinds | new_kinds, None)
+    for (kind, name), value in counts.items():
+        key = f'statistics:{kind}:{name}'
+        if not cache.add(key, value, None):
+            try:
+                cache.incr(key, value)
+            except ValueError:
+                # The entry was evicted in the meantime
+                cache.set(key, value, None)
+
+
+def get_statistics():
+    """Statistics
+
+    Returns the hits and misses of the kinds of namespaces which were flushed to the cache.
+
+    :return: the hits and misses by the kinds of namespaces
+    :rtype: dict[str, dict[str, int]]
+    """
+    kinds = sorted(cache.get(STATISTICS_KINDS_KEY, set()))
+    keys = {f'statistics:{kind}:{name}': (kind, name)
+            for kind in kinds for name in ('hits', 'misses')}
+    values = cache.get_many(keys)
+    statistics = {kind: {'hits': 0, 'misses': 0} for kind in kinds}
+    for key, (kind, name) in keys.items():
+        statistics[kind][name] = values.get(key, 0)
+    return statistics
+
+
+def reset_statistics():
+    """Reset statistics
+
+    Deletes the hits and misses of all kinds of namespaces.
+    """
+    kinds = cache.get(STATISTICS_KINDS_KEY, set())
+    cache.delete_many([f'statistics:{kind}:{name}'
+                       for kind in kinds for name in ('hits', 'misses')])
+    cache.delete(STATISTICS_KINDS_KEY)
+    _COUNTS.clear()
+
+
+def course_pages_namespace(course_id):
+    """Course pages namespace
+
+    Returns the cache namespace of the pages of the course and its contents.
+
+    :param course_id: The id of the course
+    :type course_id: int
+
+    :return: the cache namespace
+    :rtype: str
+    """
+    return f'course-pages:{course_id}'
+
+
+def topic_contents_namespace(topic_id):
+    """Topic contents namespace
+
+    Returns the cache namespace of the rendered contents of the topic.
+
+    :param topic_id: The id of the topic
+    :type topic_id: int
+
+    :return: the cache namespace
+    :rtype: str
+    """
+    return f'topic-contents:{topic_id}'
+
+
+def content_card_namespace(content_id):
+    """Content card namespace
+
+    Returns the cache namespace of the rendered cards of the content.
+
+    :param content_id: The id of the content
+    :type content_id: int
+
+    :return: the cache namespace
+    :rtype: str
+    """
+    return f'content-card:{content_id}'
+
+
+def get_page_query(request, query_form, query_params):
+    """Page query
+
+    Returns the validated query of a page shown to anonymous users, which is part of the key
+    of the cached page. Only the parameters of the form are allowed, so that the number of
+    cached pages is bounded by the choices of the form.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param query_form: The form validating the query or None if only the page without a
+    query is cached
+    :type query_form: type or None
+    :param query_params: The query parameters of the fields of the form
+    :type query_params: dict[str, str]
+
+    :return: the cleaned values of the fields or None if the query is not cached
+    :rtype: tuple or None
+    """
+    if not request.GET:
+        return ()
+    if query_form is None:
+        return None
+    fields = list(query_form.base_fields)
+    params = [query_params.get(field, field) for field in fields]
+    if not set(request.GET).issubset(params):
+        return None
+    form = query_form(data={field: request.GET.get(param)
+                            for field, param in zip(fields, params)})
+    if not form.is_valid():
+        return None
+    return tuple(form.cleaned_data[field] for field in fields)
+
+
+def cache_anonymous_course_page(course_kwarg, query_form=None, query_params=None):
+    """Cache anonymous course page
+
+    Decorator which caches the pages of a course shown to anonymous users until the course
+    is changed. The responses are marked as public for a short time, so that a proxy can
+    serve them, while the responses of logged in users are marked as private. The pages are
+    cached by the validated query of the form, pages with other queries are not cached.
+
+    :param course_kwarg: The name of the view argument containing the id of the course
+    :type course_kwarg: str
+    :param query_form: The form validating the query of the page
+    :type query_form: type or None
+    :param query_params: The query parameters of the fields of the form which are not named
+    after their field
+    :type query_params: dict[str, str] or None
+
+    :return: the decorator of the view
+    :rtype: Callable
+    """
+    query_params = query_params or {}
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                response = view(request, *args, **kwargs)
+                patch_cache_control(response, private=True)
+                return response
+
+            query = get_page_query(request, query_form, query_params)
+            if query is None:
+                response = view(request, *args, **kwargs)
+            else:
+                namespace = course_pages_namespace(kwargs[course_kwarg])
+                key = make_key(namespace, request.path, *query, get_language())
+                response = cache.get(key)
+                if response is not None:
+                    count(namespace, hits=1)
+                else:
+                    count(namespace, misses=1)
+                    response = view(request, *args, **kwargs)
+                    if response.status_code == 200:
+                        store_page(request, response, key)
+            if response.status_code == 200:
+                patch_cache_control(response, public=True, max_age=ANONYMOUS_PAGE_MAX_AGE)
+                patch_vary_headers(response, ('Cookie',))
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def store_page(request, response, key):
+    """Store page
+
+    Caches the page of an anonymous user once it was rendered. Pages with a csrf token or
+    cookies belong to a single visitor and are not cached.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param response: The response of the page
+    :type response: HttpResponse
+    :param key: The key of the cached page
+    :type key: str
+    """
+
+    def store(rendered):
+        if not request.META.get('CSRF_COOKIE_USED') and not rendered.cookies:
+            cache.set(key, rendered, ANONYMOUS_PAGE_CACHE_TIMEOUT)
+
+    if hasattr(response, 'add_post_render_callback'):
+        response.add_post_render_callback(store)
+    else:
+        store(response)
@@ -0,0 +1,74 @@
+"""Purpose of this file
+
+This file contains the serialization format 'zjson', which stores the JSON serialization
+compressed. The format is registered in the setting SERIALIZATION_MODULES, so that
+compacted versions of the reversion can still be deserialized by their format.
+"""
+
+import base64
+import zlib
+
+from django.core.serializers import json
+
+
+def compress(data):
+    """Compress
+
+    Returns the compressed form of the serialized data as text.
+
+    :param data: The serialized data
+    :type data: str
+
+    :return: the compressed data
+    :rtype: str
+    """
+    return base64.b64encode(zlib.compress(data.encode('utf-8'), 9)).decode('ascii')
+
+
+def decompress(data):
+    """Decompress
+
+    Returns the serialized data of its compressed form.
+
+    :param data: The compressed data
+    :type data: str or bytes
+
+    :return: the serialized data
+    :rtype: str
+    """
+    return zlib.decompress(base64.b64decode(data)).decode('utf-8')
+
+
+class Serializer(json.Serializer):
+    """Serializer
+
+    Serializes the objects to compressed JSON.
+    """
+
+    def getvalue(self):
+        """Value
+
+        Returns the compressed JSON of the serialized objects.
+
+        :return: the compressed JSON
+        :rtype: str
+        """
+        return compress(super().getvalue())
+
+
+def Deserializer(stream_or_string, **options):  # pylint: disable=invalid-name
+    """Deserializer
+
+    Deserializes the objects of compressed JSON.
+
+    :param stream_or_string: The compressed JSON
+    :type stream_or_string: str or bytes or IO
+    :param options: The options of the JSON deserializer
+    :type options: dict[str, Any]
+
+    :return: the deserialized objects
+    :rtype: Iterator[DeserializedObject]
+    """
+    if not isinstance(stream_or_string, (bytes, str)):
+        stream_or_string = stream_or_string.read()
+    yield from json.Deserializer(decompress(stream_or_string), **options)
@@ -0,0 +1,131 @@
+"""Purpose of this file
+
+This file contains the tuning of SQLite for concurrent requests. New connections are
+configured by the pragmas of the settings and the write requests of all processes of the
+server are serialized by a lock file, because SQLite only allows one writer at a time.
+"""
+
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # File locks are not available on Windows, the writes are only retried there
+    fcntl = None  # pylint: disable=invalid-name
+
+# float: The number of seconds between two attempts to acquire the write lock
+LOCK_POLL_INTERVAL = 0.01
+
+
+def is_locked_error(error):
+    """Is locked error
+
+    Returns if the error was raised because the database was locked by another writer.
+
+    :param error: The raised error
+    :type error: Exception
+
+    :return: true iff the database was locked
+    :rtype: bool
+    """
+    return isinstance(error, OperationalError) and 'locked' in str(error)
+
+
+def is_read_only(connection):
+    """Is read only
+
+    Returns if the connection opens the SQLite database read-only by the URI of its name,
+    like the connection of the replica.
+
+    :param connection: The database wrapper of the connection
+    :type connection: BaseDatabaseWrapper
+
+    :return: true iff the database is opened read-only
+    :rtype: bool
+    """
+    return 'mode=ro' in str(connection.settings_dict['NAME'])
+
+
+def apply_pragmas(connection, pragmas=None):
+    """Apply pragmas
+
+    Applies the pragmas to a connection of the sqlite3 module.
+
+    :param connection: The connection of the sqlite3 module
+    :type connection: sqlite3.Connection
+    :param pragmas: The values of the pragmas, defaults to the setting SQLITE_PRAGMAS
+    :type pragmas: dict[str, Any] or None
+    """
+    if pragmas is None:
+        pragmas = settings.SQLITE_PRAGMAS
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):  # pylint: disable=unused-argument
+    """Configure connection
+
+    Applies the pragmas of the settings to a new SQLite connection.
+
+    :param sender: The class of the database wrapper
+    :type sender: type
+    :param connection: The database wrapper of the new connection
+    :type connection: BaseDatabaseWrapper
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = settings.SQLITE_PRAGMAS
+    if is_read_only(connection):
+        # The journal mode can only be changed by a connection which may write
+        pragmas = {name: value for name, value in pragmas.items() if name != 'journal_mode'}
+    apply_pragmas(connection.connection, pragmas)
+
+
+@contextmanager
+def write_lock(path=None, timeout=None):
+    """Write lock
+
+    Holds the lock file of the writes, which is shared by all processes and threads. If the
+    lock can not be acquired in time, the block is executed without it and SQLite waits for
+    the other writer by its busy timeout.
+
+    :param path: The path of the lock file, defaults to the write serializer settings
+    :type path: str or None
+    :param timeout: The number of seconds to wait for the lock, defaults to the settings
+    :type timeout: float or None
+
+    :return: if the lock was acquired
+    :rtype: Iterator[bool]
+    """
+    if fcntl is None:
+        yield False
+        return
+    config = settings.SQLITE_WRITE_SERIALIZER
+    path = config['LOCK_FILE'] if path is None else path
+    timeout = config['TIMEOUT'] if timeout is None else timeout
+
+    with open(path, 'a', encoding='utf-8') as file:
+        deadline = time.monotonic() + timeout
+        acquired = False
+        while not acquired:
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(file, fcntl.LOCK_UN)
@@ -0,0 +1,151 @@
+"""Purpose of this file
+
+This file contains the command which measures the lock errors of concurrent writes to SQLite.
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from multiprocessing import Pool
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from base.database import apply_pragmas, write_lock
+
+# int: The number of rows of the benchmark table
+ROWS = 100
+
+
+def run_worker(path, lock_path, transactions, tuned):
+    """Run worker
+
+    Executes transactions which read a row and write it back like the write requests of the
+    application, e.g. rating a content.
+
+    :param path: The path of the database
+    :type path: str
+    :param lock_path: The path of the lock file of the writes
+    :type lock_path: str
+    :param transactions: The number of transactions
+    :type transactions: int
+    :param tuned: Whether the pragmas and the write serializer are used
+    :type tuned: bool
+
+    :return: the number of failed transactions
+    :rtype: int
+    """
+    connection = sqlite3.connect(path, isolation_level=None)
+    if tuned:
+        apply_pragmas(connection)
+    errors = 0
+    for _ in range(transactions):
+        row = random.randrange(ROWS)
+        try:
+            if tuned:
+                with write_lock(lock_path, settings.SQLITE_WRITE_SERIALIZER['TIMEOUT']):
+                    execute_transaction(connection, row)
+            else:
+                execute_transaction(connection, row)
+        except sqlite3.OperationalError as error:
+            if 'locked' not in str(error):
+                raise
+            errors += 1
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+    connection.close()
+    return errors
+
+
+def execute_transaction(connection, row):
+    """Execute transaction
+
+    Reads a row, works on it for a moment and writes it back in one transaction.
+
+    :param connection: The connection to the database
+    :type connection: sqlite3.Connection
+    :param row: The id of the row
+    :type row: int
+    """
+    connection.execute('BEGIN')
+    value = connection.execute('SELECT value FROM benchmark WHERE id = ?', (row,)).fetchone()[0]
+    time.sleep(0.001)
+    connection.execute('UPDATE benchmark SET value = ? WHERE id = ?', (value + 1, row))
+    connection.execute('INSERT INTO benchmark_log (row, value) VALUES (?, ?)', (row, value))
+    connection.execute('COMMIT')
+
+
+class Command(BaseCommand):
+    """Benchmark SQLite command
+
+    Runs concurrent read-then-write transactions on a temporary SQLite database, once with
+    the defaults of SQLite and once with the pragmas of the setting SQLITE_PRAGMAS and the
+    write serializer, and reports the rate of the transactions which failed because the
+    database was locked.
+    """
+    help = "Measures the lock errors of concurrent writes with and without the SQLite tuning."
+
+    def add_arguments(self, parser):
+        """Add arguments
+
+        Adds the options of the number of processes and transactions to the command.
+
+        :param parser: The parser of the arguments
+        :type parser: CommandParser
+        """
+        parser.add_argument('--processes', type=int, default=8,
+                            help="Number of processes which write concurrently.")
+        parser.add_argument('--transactions', type=int, default=200,
+                            help="Number of transactions per process.")
+
+    def handle(self, *args, **options):
+        """Handle
+
+        Runs the benchmark without and with the tuning.
+
+        :param args: The arguments
+        :type args: Any
+        :param options: The options of the command
+        :type options: dict[str, Any]
+        """
+        for label, tuned in (("default", False), ("tuned", True)):
+            errors, elapsed = self.benchmark(options['processes'], options['transactions'],
+                                             tuned)
+            total = options['processes'] * options['transactions']
+            self.stdout.write(f"{label}: {errors} of {total} transactions failed "
+                              f"({errors / total:.1%}) in {elapsed:.2f}s, "
+                              f"{(total - errors) / elapsed:.0f} transactions/s")
+
+    @staticmethod
+    def benchmark(processes, transactions, tuned):
+        """Benchmark
+
+        Runs the workers on a new database.
+
+        :param processes: The number of processes
+        :type processes: int
+        :param transactions: The number of transactions per process
+        :type transactions: int
+        :param tuned: Whether the pragmas and the write serializer are used
+        :type tuned: bool
+
+        :return: the number of failed transactions and the elapsed seconds
+        :rtype: tuple[int, float]
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'benchmark.sqlite3')
+            lock_path = os.path.join(directory, 'benchmark.lock')
+            connection = sqlite3.connect(path, isolation_level=None)
+            connection.execute('CREATE TABLE benchmark (id INTEGER PRIMARY KEY, value INTEGER)')
+            connection.execute('CREATE TABLE benchmark_log (row INTEGER, value INTEGER)')
+            connection.executemany('INSERT INTO benchmark VALUES (?, 0)',
+                                   [(row,) for row in range(ROWS)])
+            connection.close()
+
+            start = time.monotonic()
+            with Pool(processes) as pool:
+                errors = pool.starmap(run_worker, [(path, lock_path, transactions, tuned)]
+                                      * processes)
+            return sum(errors), time.monotonic() - start
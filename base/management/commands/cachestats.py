@@ -0,0 +1,50 @@
+"""Purpose of this file
+
+This file contains the command which reports the hits and misses of the cache.
+"""
+
+from django.core.management.base import BaseCommand
+
+from base.cache import get_statistics, reset_statistics
+
+
+class Command(BaseCommand):
+    """Cache statistics command
+
+    Reports the hits, misses and hit rates of the kinds of cache namespaces, which were
+    counted by all processes sharing the cache since the statistics were last reset.
+    """
+    help = "Reports the hits and misses of the cache namespaces."
+
+    def add_arguments(self, parser):
+        """Add arguments
+
+        Adds the option to reset the statistics to the command.
+
+        :param parser: The parser of the arguments
+        :type parser: CommandParser
+        """
+        parser.add_argument('--reset', action='store_true',
+                            help="Reset the statistics after reporting them.")
+
+    def handle(self, *args, **options):
+        """Handle
+
+        Prints the statistics of every kind of namespace.
+
+        :param args: The arguments
+        :type args: Any
+        :param options: The options of the command
+        :type options: dict[str, Any]
+        """
+        statistics = get_statistics()
+        if not statistics:
+            self.stdout.write("No cache lookups were counted.")
+        for kind, counts in statistics.items():
+            lookups = counts['hits'] + counts['misses']
+            rate = counts['hits'] / lookups if lookups else 0
+            self.stdout.write(f"{kind}: {counts['hits']} hits, {counts['misses']} misses "
+                              f"({rate:.1%} hit rate)")
+        if options['reset']:
+            reset_statistics()
+            self.stdout.write("The statistics were reset.")
@@ -0,0 +1,63 @@
+"""Purpose of this file
+
+This file contains the command which deletes the orphaned files of the media.
+"""
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from base.media import delete_orphaned_files, find_orphaned_files
+from base.versions import BATCH_SIZE
+
+
+class Command(BaseCommand):
+    """Clean media command
+
+    Deletes the files of the media which are neither referenced by a file field of the base
+    and the content models nor by a version of the history. Files which were modified in the
+    grace period are kept.
+    """
+    help = "Deletes the files of the media which are not referenced anymore."
+
+    def add_arguments(self, parser):
+        """Add arguments
+
+        Adds the options of the grace period and the dry run to the command.
+
+        :param parser: The parser of the arguments
+        :type parser: CommandParser
+        """
+        parser.add_argument('--grace-hours', type=int,
+                            help="Age in hours after which unreferenced files are deleted.")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report the files which would be deleted.")
+
+    def handle(self, *args, **options):
+        """Handle
+
+        Deletes the orphaned files in batches while the media is walked.
+
+        :param args: The arguments
+        :type args: Any
+        :param options: The options of the command
+        :type options: dict[str, Any]
+        """
+        count = size = 0
+        batch = []
+        for name, file_size in find_orphaned_files(options['grace_hours']):
+            count += 1
+            size += file_size
+            if options['verbosity'] > 1:
+                self.stdout.write(name)
+            if not options['dry_run']:
+                batch.append(name)
+                if len(batch) >= BATCH_SIZE:
+                    delete_orphaned_files(batch)
+                    batch = []
+        delete_orphaned_files(batch)
+
+        if options['dry_run']:
+            self.stdout.write(f"{count} files would be deleted, "
+                              f"{filesizeformat(size)} can be reclaimed.")
+        else:
+            self.stdout.write(f"Deleted {count} files, reclaimed {filesizeformat(size)}.")
@@ -0,0 +1,60 @@
+"""Purpose of this file
+
+This file contains the command which compacts the history stored by the reversion.
+"""
+
+from django.core.management.base import BaseCommand
+
+from base.versions import compress_versions, delete_revisions, get_retention, \
+    get_stale_revision_ids
+
+
+class Command(BaseCommand):
+    """Compact versions command
+
+    Deletes the revisions which are not kept by the retention policy and compresses the
+    data of old versions. The retention policy is read from the setting REVERSION_RETENTION
+    and can be overridden by the options of the command.
+    """
+    help = "Thins out the revisions by the retention policy and compresses old versions."
+
+    def add_arguments(self, parser):
+        """Add arguments
+
+        Adds the options of the retention policy to the command.
+
+        :param parser: The parser of the arguments
+        :type parser: CommandParser
+        """
+        parser.add_argument('--keep-last', type=int, dest='KEEP_LAST',
+                            help="Number of latest versions which are kept for each object.")
+        parser.add_argument('--keep-daily-days', type=int, dest='KEEP_DAILY_DAYS',
+                            help="Number of days in which one version per day is kept.")
+        parser.add_argument('--keep-weekly-weeks', type=int, dest='KEEP_WEEKLY_WEEKS',
+                            help="Number of weeks in which one version per week is kept.")
+        parser.add_argument('--compress-after-days', type=int, dest='COMPRESS_AFTER_DAYS',
+                            help="Age in days after which the versions are compressed.")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report the number of revisions which would be deleted.")
+
+    def handle(self, *args, **options):
+        """Handle
+
+        Compacts the history.
+
+        :param args: The arguments
+        :type args: Any
+        :param options: The options of the command
+        :type options: dict[str, Any]
+        """
+        retention = get_retention(**{key: options[key] for key in (
+            'KEEP_LAST', 'KEEP_DAILY_DAYS', 'KEEP_WEEKLY_WEEKS', 'COMPRESS_AFTER_DAYS')})
+        revision_ids = get_stale_revision_ids(retention)
+        if options['dry_run']:
+            self.stdout.write(f"{len(revision_ids)} revisions would be deleted.")
+            return
+
+        delete_revisions(revision_ids)
+        self.stdout.write(f"Deleted {len(revision_ids)} revisions.")
+        count = compress_versions(retention)
+        self.stdout.write(f"Compressed {count} versions.")
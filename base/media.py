@@ -0,0 +1,159 @@
+"""Purpose of this file
+
+This file contains the collection of the orphaned files of the media. Deleted contents,
+replaced PDFs, recompiled LaTeX PDFs and regenerated previews leave files behind which are
+not referenced by any file field or any version of the history anymore.
+"""
+
+import json
+import os
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+from reversion.models import Version
+
+from base.compressed_json import decompress
+from base.models import MediaBlob
+from base.storage import get_source_name
+
+# tuple[str]: The applications whose file fields refer to the media
+MEDIA_APPS = ('base', 'content')
+
+
+def get_file_fields():
+    """File fields
+
+    Returns the file and image fields of the models of the media applications.
+
+    :return: the names of the file fields of every model with file fields
+    :rtype: dict[type, list[str]]
+    """
+    file_fields = {}
+    for app_label in MEDIA_APPS:
+        for model in apps.get_app_config(app_label).get_models():
+            fields = [field.name for field in model._meta.get_fields()
+                      if isinstance(field, models.FileField)]
+            if fields:
+                file_fields[model] = fields
+    return file_fields
+
+
+def get_version_data(version):
+    """Version data
+
+    Returns the serialized fields of a version. The JSON formats are read without the
+    models, so that versions of fields which were changed since are read as well.
+
+    :param version: The version
+    :type version: Version
+
+    :return: the serialized fields of the version
+    :rtype: dict[str, Any]
+    """
+    if version.format == 'json':
+        return json.loads(version.serialized_data)[0]['fields']
+    if version.format == 'zjson':
+        return json.loads(decompress(version.serialized_data))[0]['fields']
+    return {name: getattr(value, 'name', value) for name, value in version.field_dict.items()}
+
+
+def get_referenced_names():
+    """Referenced names
+
+    Returns the names of all files which are referenced by an object or by a version of the
+    history.
+
+    :return: the names of the referenced files
+    :rtype: set[str]
+    """
+    names = set()
+    file_fields = get_file_fields()
+    for model, fields in file_fields.items():
+        for values in model.objects.order_by().values_list(*fields).iterator():
+            names.update(values)
+
+    content_types = ContentType.objects.get_for_models(*file_fields)
+    fields_of_types = {content_types[model].pk: fields
+                       for model, fields in file_fields.items()}
+    versions = Version.objects.filter(content_type__in=fields_of_types) \
+        .only('content_type', 'format', 'serialized_data')
+    for version in versions.iterator():
+        data = get_version_data(version)
+        names.update(data.get(field) for field in fields_of_types[version.content_type_id])
+    return names - {'', None}
+
+
+def walk_media(root, excluded=()):
+    """Walk media
+
+    Yields the files below the root one by one, so that the media is not listed at once.
+
+    :param root: The directory to walk
+    :type root: str
+    :param excluded: The absolute paths of directories which are skipped
+    :type excluded: Collection[str]
+
+    :return: the names of the files relative to the root and their status
+    :rtype: Iterator[tuple[str, os.stat_result]]
+    """
+    directories = [root]
+    while directories:
+        directory = directories.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path not in excluded:
+                        directories.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    name = os.path.relpath(entry.path, root).replace(os.sep, '/')
+                    yield name, entry.stat(follow_symlinks=False)
+
+
+def find_orphaned_files(grace_hours=None):
+    """Find orphaned files
+
+    Yields the files of the media which are not referenced and which were not modified in
+    the grace period. The grace period protects files which were just saved by a request
+    whose transaction is not committed yet.
+
+    :param grace_hours: The grace period in hours, defaults to the setting MEDIA_GRACE_HOURS
+    :type grace_hours: int or None
+
+    :return: the names of the orphaned files and their sizes
+    :rtype: Iterator[tuple[str, int]]
+    """
+    if grace_hours is None:
+        grace_hours = settings.MEDIA_GRACE_HOURS
+    limit = time.time() - grace_hours * 60 * 60
+    root = os.path.abspath(settings.MEDIA_ROOT)
+    # The assembled chunks of uploads belong to the uploads, not to the media
+    excluded = {os.path.abspath(settings.CHUNKED_UPLOAD['ROOT'])}
+    referenced = get_referenced_names()
+    if not os.path.isdir(root):
+        return
+    for name, stat in walk_media(root, excluded):
+        # The files derived from a PDF are kept as long as the PDF is referenced
+        if name in referenced or get_source_name(name) in referenced:
+            continue
+        if stat.st_mtime < limit:
+            yield name, stat.st_size
+
+
+def delete_orphaned_files(names):
+    """Delete orphaned files
+
+    Deletes the files of the media with the given names together with their blobs.
+
+    :param names: The names of the files
+    :type names: list[str]
+    """
+    for name in names:
+        try:
+            os.remove(os.path.join(settings.MEDIA_ROOT, name))
+        except FileNotFoundError:
+            pass
+    MediaBlob.objects.filter(name__in=names).delete()
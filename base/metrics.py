@@ -0,0 +1,428 @@
+"""Purpose of this file
+
+This file contains the metrics of the requests, which are aggregated into histograms and
+exposed in the text format of Prometheus. Every process of the server counts its own
+observations and writes them to a snapshot file from time to time, the snapshots of all
+processes are added up when the metrics are exposed.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+from base.cache import get_statistics
+
+# tuple[float]: The upper bounds of the buckets of the durations in seconds
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# tuple[int]: The upper bounds of the buckets of the numbers of queries
+QUERIES_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# threading.local: The metrics of the request of the current thread
+_STATE = threading.local()
+
+# dict[str, float]: The monotonic time when this process last wrote its snapshot
+_SNAPSHOT = {'written': float('-inf')}
+
+
+class Histogram:
+    """Histogram
+
+    Counts the observed values by their labels in cumulative buckets like a histogram of
+    Prometheus.
+
+    :attr Histogram.name: The name of the metric
+    :type Histogram.name: str
+    :attr Histogram.documentation: The description of the metric
+    :type Histogram.documentation: str
+    :attr Histogram.label_names: The names of the labels
+    :type Histogram.label_names: tuple[str]
+    :attr Histogram.buckets: The upper bounds of the buckets
+    :type Histogram.buckets: tuple[float]
+    :attr Histogram.values: The counts of the buckets followed by the sum by the labels
+    :type Histogram.values: dict[tuple[str], list[float]]
+    """
+
+    def __init__(self, name, documentation, label_names, buckets):
+        """Initializer
+
+        Initializes the histogram without observations.
+
+        :param name: The name of the metric
+        :type name: str
+        :param documentation: The description of the metric
+        :type documentation: str
+        :param label_names: The names of the labels
+        :type label_names: tuple[str]
+        :param buckets: The upper bounds of the buckets
+        :type buckets: tuple[float]
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        """Observe
+
+        Counts a value in the bucket of the smallest upper bound which is not exceeded. The
+        last bucket counts the values exceeding all upper bounds.
+
+        :param labels: The values of the labels
+        :type labels: tuple[str]
+        :param value: The observed value
+        :type value: float
+        """
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            values = self.values.get(labels)
+            if values is None:
+                values = self.values[labels] = [0] * (len(self.buckets) + 2)
+            values[index] += 1
+            values[-1] += value
+
+    def snapshot(self):
+        """Snapshot
+
+        Returns a copy of the observations which can be serialized as JSON.
+
+        :return: the labels and the values of every observed combination of labels
+        :rtype: list[list]
+        """
+        with self.lock:
+            return [[list(labels), list(values)] for labels, values in self.values.items()]
+
+
+# Histogram: The wall time of the requests
+REQUEST_DURATION = Histogram('collab_request_duration_seconds',
+                             "Wall time of the requests.",
+                             ('view', 'method', 'status'), SECONDS_BUCKETS)
+
+# Histogram: The number of database queries of the requests
+DB_QUERIES = Histogram('collab_db_queries', "Database queries per request.",
+                       ('view',), QUERIES_BUCKETS)
+
+# Histogram: The time of the database queries of the requests
+DB_DURATION = Histogram('collab_db_duration_seconds',
+                        "Time of the database queries per request.",
+                        ('view',), SECONDS_BUCKETS)
+
+# Histogram: The time of rendering the templates of the requests
+TEMPLATE_DURATION = Histogram('collab_template_render_seconds',
+                              "Time of rendering the templates per request.",
+                              ('view',), SECONDS_BUCKETS)
+
+# Histogram: The wall time of the external programs, e.g. pdflatex
+PROGRAM_DURATION = Histogram('collab_program_duration_seconds',
+                             "Wall time of the external programs.",
+                             ('program',), SECONDS_BUCKETS)
+
+# tuple[Histogram]: The exposed histograms
+HISTOGRAMS = (REQUEST_DURATION, DB_QUERIES, DB_DURATION, TEMPLATE_DURATION, PROGRAM_DURATION)
+
+
+class RequestMetrics:  # pylint: disable=too-few-public-methods
+    """Request metrics
+
+    Sums up the queries and the rendering of a request.
+
+    :attr RequestMetrics.queries: The number of queries
+    :type RequestMetrics.queries: int
+    :attr RequestMetrics.db_time: The seconds of the queries
+    :type RequestMetrics.db_time: float
+    :attr RequestMetrics.template_time: The seconds of rendering the templates
+    :type RequestMetrics.template_time: float
+    :attr RequestMetrics.rendering: Whether a template is being rendered
+    :type RequestMetrics.rendering: bool
+    """
+
+    def __init__(self):
+        """Initializer
+
+        Initializes the metrics of a new request.
+        """
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.rendering = False
+
+
+def start_request():
+    """Start request
+
+    Starts collecting the metrics of the request of the current thread.
+
+    :return: the metrics of the request
+    :rtype: RequestMetrics
+    """
+    _STATE.request = RequestMetrics()
+    return _STATE.request
+
+
+def finish_request(view, method, status, duration):
+    """Finish request
+
+    Adds the metrics of the request of the current thread to the histograms.
+
+    :param view: The name of the view
+    :type view: str
+    :param method: The method of the request
+    :type method: str
+    :param status: The status code of the response
+    :type status: int
+    :param duration: The wall time of the request in seconds
+    :type duration: float
+    """
+    metrics = getattr(_STATE, 'request', None)
+    _STATE.request = None
+    REQUEST_DURATION.observe((view, method, str(status)), duration)
+    if metrics is not None:
+        DB_QUERIES.observe((view,), metrics.queries)
+        DB_DURATION.observe((view,), metrics.db_time)
+        TEMPLATE_DURATION.observe((view,), metrics.template_time)
+    write_snapshot(force=False)
+
+
+def record_query(execute, sql, params, many, context):
+    """Record query
+
+    Executes a query and adds it to the metrics of the request. This function is installed
+    by connection.execute_wrapper().
+
+    :param execute: The execution of the query
+    :type execute: Callable
+    :param sql: The SQL of the query
+    :type sql: str
+    :param params: The parameters of the query
+    :type params: Any
+    :param many: Whether the query is executed for many parameters
+    :type many: bool
+    :param context: The connection and the cursor of the query
+    :type context: dict[str, Any]
+
+    :return: the result of the execution
+    :rtype: Any
+    """
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics = getattr(_STATE, 'request', None)
+        if metrics is not None:
+            metrics.queries += 1
+            metrics.db_time += time.perf_counter() - start
+
+
+@contextmanager
+def time_program(program):
+    """Time program
+
+    Measures the wall time of an external program which runs in the block.
+
+    :param program: The name of the program
+    :type program: str
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PROGRAM_DURATION.observe((program,), time.perf_counter() - start)
+
+
+class TimedTemplate(Template):
+    """Timed template
+
+    Template of the Django template engine which adds its rendering to the metrics of the
+    request. Templates rendered while rendering another template, e.g. the content cards,
+    are part of the outer rendering.
+    """
+
+    def render(self, context=None, request=None):
+        """Render
+
+        Renders the template and measures the time if no other template is being rendered.
+
+        :param context: The context of the template
+        :type context: dict[str, Any] or None
+        :param request: The given request
+        :type request: HttpRequest or None
+
+        :return: the rendered template
+        :rtype: SafeString
+        """
+        metrics = getattr(_STATE, 'request', None)
+        if metrics is None or metrics.rendering:
+            return super().render(context, request)
+        metrics.rendering = True
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+            metrics.rendering = False
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Timed Django templates
+
+    Template backend of the Django template engine whose templates are timed.
+    """
+
+    def from_string(self, template_code):
+        """From string
+
+        Returns the timed template of the code.
+
+        :param template_code: The code of the template
+        :type template_code: str
+
+        :return: the template
+        :rtype: TimedTemplate
+        """
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        """Get template
+
+        Returns the timed template with the name.
+
+        :param template_name: The name of the template
+        :type template_name: str
+
+        :return: the template
+        :rtype: TimedTemplate
+        """
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+def get_snapshot_path(pid):
+    """Snapshot path
+
+    Returns the path of the snapshot file of a process.
+
+    :param pid: The id of the process
+    :type pid: int
+
+    :return: the path of the snapshot
+    :rtype: str
+    """
+    return os.path.join(settings.METRICS['DIRECTORY'], f'{pid}.json')
+
+
+def write_snapshot(force=True):
+    """Write snapshot
+
+    Writes the observations of this process to its snapshot file, which is replaced at once
+    so that it is never read partially. Unless forced, the snapshot is only written if the
+    last one is older than the seconds of the setting METRICS.
+
+    :param force: Whether the snapshot is written in any case
+    :type force: bool
+    """
+    now = time.monotonic()
+    if not force and now - _SNAPSHOT['written'] < settings.METRICS['SECONDS']:
+        return
+    _SNAPSHOT['written'] = now
+    snapshot = {histogram.name: histogram.snapshot() for histogram in HISTOGRAMS}
+    path = get_snapshot_path(os.getpid())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f'{path}.{threading.get_ident()}.tmp', 'w', encoding='utf-8') as file:
+        json.dump(snapshot, file)
+    os.replace(file.name, path)
+
+
+def collect():
+    """Collect
+
+    Adds up the observations of all processes. The snapshot of this process is replaced by
+    its current observations.
+
+    :return: the values by the labels of every histogram
+    :rtype: dict[str, dict[tuple[str], list[float]]]
+    """
+    snapshots = [{histogram.name: histogram.snapshot() for histogram in HISTOGRAMS}]
+    directory = settings.METRICS['DIRECTORY']
+    own_path = get_snapshot_path(os.getpid())
+    if os.path.isdir(directory):
+        for entry in os.scandir(directory):
+            if entry.name.endswith('.json') and entry.path != own_path:
+                try:
+                    with open(entry.path, encoding='utf-8') as file:
+                        snapshots.append(json.load(file))
+                except (OSError, ValueError):
+                    continue
+
+    collected = {histogram.name: {} for histogram in HISTOGRAMS}
+    for snapshot in snapshots:
+        for name, observations in snapshot.items():
+            if name not in collected:
+                continue
+            for labels, values in observations:
+                total = collected[name].setdefault(tuple(labels), [0] * len(values))
+                if len(total) == len(values):
+                    for index, value in enumerate(values):
+                        total[index] += value
+    return collected
+
+
+def format_labels(names, values):
+    """Format labels
+
+    Returns the labels in the text format of Prometheus.
+
+    :param names: The names of the labels
+    :type names: Iterable[str]
+    :param values: The values of the labels
+    :type values: Iterable[str]
+
+    :return: the formatted labels
+    :rtype: str
+    """
+    labels = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+        labels.append(f'{name}="{value}"')
+    return '{' + ','.join(labels) + '}'
+
+
+def render_metrics():
+    """Render metrics
+
+    Returns the histograms of all processes and the statistics of the cache in the text
+    format of Prometheus.
+
+    :return: the metrics
+    :rtype: str
+    """
+    collected = collect()
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.append(f'# HELP {histogram.name} {histogram.documentation}')
+        lines.append(f'# TYPE {histogram.name} histogram')
+        for labels, values in sorted(collected[histogram.name].items()):
+            cumulative = 0
+            for bound, value in zip(histogram.buckets + ('+Inf',), values):
+                cumulative += value
+                bucket_labels = format_labels(histogram.label_names + ('le',),
+                                              labels + (str(bound),))
+                lines.append(f'{histogram.name}_bucket{bucket_labels} {cumulative}')
+            series_labels = format_labels(histogram.label_names, labels)
+            lines.append(f'{histogram.name}_sum{series_labels} {values[-1]}')
+            lines.append(f'{histogram.name}_count{series_labels} {cumulative}')
+
+    statistics = get_statistics()
+    for name in ('hits', 'misses'):
+        metric = f'collab_cache_{name}_total'
+        lines.append(f'# HELP {metric} Cache {name} by the kind of namespace.')
+        lines.append(f'# TYPE {metric} counter')
+        for kind, counts in statistics.items():
+            lines.append(f"{metric}{format_labels(('kind',), (kind,))} {counts[name]}")
+    return '\n'.join(lines) + '\n'
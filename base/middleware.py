@@ -0,0 +1,278 @@
+"""Purpose of this file
+
+This file contains the middleware which serializes the known write requests, the
+middleware which pins the reads of writing users to the primary database, the middleware
+which measures the requests and the middleware which captures the slow queries.
+"""
+
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+from base.database import is_locked_error, write_lock
+from base.metrics import finish_request, record_query, start_request
+from base.slow_queries import capture_slow_query, set_view_request
+from base.routers import pin_primary
+
+LOGGER = logging.getLogger(__name__)
+
+# tuple[str]: The methods of the requests which do not write
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# float: The number of seconds before the first retry, which grows with every retry
+RETRY_DELAY = 0.1
+
+
+def get_view_name(request):
+    """View name
+
+    Returns the name of the view of the request.
+
+    :param request: The given request
+    :type request: HttpRequest
+
+    :return: the name of the view or None if the path is not resolved
+    :rtype: str or None
+    """
+    try:
+        return resolve(request.path_info).view_name
+    except Resolver404:
+        return None
+
+
+def is_writing(request):
+    """Is writing
+
+    Returns if the request may write, which are the requests with unsafe methods and the
+    requests of the views which write on GET.
+
+    :param request: The given request
+    :type request: HttpRequest
+
+    :return: true iff the request may write
+    :rtype: bool
+    """
+    if request.method not in SAFE_METHODS:
+        return True
+    return get_view_name(request) in settings.SQLITE_WRITE_SERIALIZER['GET_VIEWS']
+
+
+class WriteSerializerMiddleware:
+    """Write serializer middleware
+
+    Executes the write requests of the views in the setting SQLITE_WRITE_SERIALIZER one
+    after another while holding the write lock, so that their transactions do not collide
+    with each other. A request which still failed because the database was locked, e.g. by
+    a command, is retried after its transaction was rolled back. The middleware has to be
+    placed before the RevisionMiddleware, which wraps the request in the transaction.
+
+    :attr WriteSerializerMiddleware.get_response: The next handler of the request
+    :type WriteSerializerMiddleware.get_response: Callable
+    """
+
+    def __init__(self, get_response):
+        """Initializer
+
+        Initializes the middleware with the next handler.
+
+        :param get_response: The next handler of the request
+        :type get_response: Callable
+        """
+        self.get_response = get_response
+
+    @staticmethod
+    def is_write_request(request):
+        """Is write request
+
+        Returns if the request writes by one of the serialized views.
+
+        :param request: The given request
+        :type request: HttpRequest
+
+        :return: true iff the request is serialized
+        :rtype: bool
+        """
+        view_name = get_view_name(request)
+        config = settings.SQLITE_WRITE_SERIALIZER
+        if view_name in config['GET_VIEWS']:
+            return True
+        return request.method not in SAFE_METHODS and view_name in config['VIEWS']
+
+    def __call__(self, request):
+        """Call
+
+        Handles the request while holding the write lock and retries it if the database
+        was locked.
+
+        :param request: The given request
+        :type request: HttpRequest
+
+        :return: the response
+        :rtype: HttpResponse
+        """
+        if not self.is_write_request(request):
+            return self.get_response(request)
+
+        retries = settings.SQLITE_WRITE_SERIALIZER['RETRIES']
+        for attempt in range(retries + 1):
+            request.database_locked = False
+            with write_lock():
+                response = self.get_response(request)
+            # Uploaded files were already read, so these requests can not be repeated
+            if not request.database_locked or attempt == retries or request.FILES:
+                return response
+            LOGGER.warning("The database was locked, %s is retried", request.path)
+            time.sleep(RETRY_DELAY * (attempt + 1))
+        return response
+
+    def process_exception(self, request, exception):  # pylint: disable=no-self-use
+        """Process exception
+
+        Marks the request if its view failed because the database was locked.
+
+        :param request: The given request
+        :type request: HttpRequest
+        :param exception: The raised exception
+        :type exception: Exception
+        """
+        if is_locked_error(exception):
+            request.database_locked = True
+
+
+class PrimaryPinningMiddleware:
+    """Primary pinning middleware
+
+    Pins the reads of the writing requests to the primary database and marks the user by a
+    cookie, so that the reads of the user stay on the primary for the seconds of the setting
+    DATABASE_REPLICA and the user reads back the own changes even if the replica lags
+    behind. The middleware has to be placed before the middleware which read the database,
+    like the SessionMiddleware.
+
+    :attr PrimaryPinningMiddleware.get_response: The next handler of the request
+    :type PrimaryPinningMiddleware.get_response: Callable
+    """
+
+    def __init__(self, get_response):
+        """Initializer
+
+        Initializes the middleware with the next handler.
+
+        :param get_response: The next handler of the request
+        :type get_response: Callable
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Call
+
+        Handles the request with the reads pinned to the primary if the request writes or
+        if the user wrote recently.
+
+        :param request: The given request
+        :type request: HttpRequest
+
+        :return: the response
+        :rtype: HttpResponse
+        """
+        config = settings.DATABASE_REPLICA
+        writing = is_writing(request)
+        with pin_primary(writing or config['COOKIE_NAME'] in request.COOKIES):
+            response = self.get_response(request)
+        if writing and response.status_code < 400:
+            response.set_cookie(config['COOKIE_NAME'], '1', max_age=config['PIN_SECONDS'],
+                                httponly=True, samesite='Lax')
+        return response
+
+
+class MetricsMiddleware:
+    """Metrics middleware
+
+    Measures the wall time, the database queries and the rendering of the templates of
+    every request and adds them to the histograms of base.metrics by the name of the view.
+    The middleware has to be placed first to measure the other middleware as well.
+
+    :attr MetricsMiddleware.get_response: The next handler of the request
+    :type MetricsMiddleware.get_response: Callable
+    """
+
+    def __init__(self, get_response):
+        """Initializer
+
+        Initializes the middleware with the next handler.
+
+        :param get_response: The next handler of the request
+        :type get_response: Callable
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Call
+
+        Handles the request while its queries are recorded.
+
+        :param request: The given request
+        :type request: HttpRequest
+
+        :return: the response
+        :rtype: HttpResponse
+        """
+        start = time.perf_counter()
+        start_request()
+        status = 500
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(record_query))
+                response = self.get_response(request)
+            status = response.status_code
+        finally:
+            match = request.resolver_match
+            finish_request(match.view_name if match else 'unresolved', request.method, status,
+                           time.perf_counter() - start)
+        return response
+
+
+class SlowQueryMiddleware:
+    """Slow query middleware
+
+    Captures the slow queries of the requests if the setting SLOW_QUERIES enables it.
+
+    :attr SlowQueryMiddleware.get_response: The next handler of the request
+    :type SlowQueryMiddleware.get_response: Callable
+    """
+
+    def __init__(self, get_response):
+        """Initializer
+
+        Initializes the middleware with the next handler.
+
+        :param get_response: The next handler of the request
+        :type get_response: Callable
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Call
+
+        Handles the request while its slow queries are captured.
+
+        :param request: The given request
+        :type request: HttpRequest
+
+        :return: the response
+        :rtype: HttpResponse
+        """
+        if not settings.SLOW_QUERIES['ENABLED']:
+            return self.get_response(request)
+        set_view_request(request)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(capture_slow_query))
+                return self.get_response(request)
+        finally:
+            set_view_request(None)
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.7 on 2026-10-19 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0016_auto_20210302_2352'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['content', 'creation_date'], name='base_comment_content_date'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.0.7 on 2026-10-19 01:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0017_comment_content_date_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSnapshot',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='base.Course', verbose_name='Course')),
+                ('data', models.TextField(verbose_name='Data')),
+                ('creation_date', models.DateTimeField(auto_now=True, verbose_name='Creation date')),
+            ],
+            options={
+                'verbose_name': 'Course Snapshot',
+                'verbose_name_plural': 'Course Snapshots',
+            },
+        ),
+    ]
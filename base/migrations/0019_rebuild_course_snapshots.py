@@ -0,0 +1,19 @@
+# Generated by Django 3.0.7 on 2026-10-19 09:12
+
+from django.db import migrations
+
+
+def delete_snapshots(apps, schema_editor):  # pylint: disable=unused-argument
+    """Deletes the snapshots, so that they are rebuilt with the public content counts."""
+    apps.get_model('base', 'CourseSnapshot').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0018_course_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_snapshots, migrations.RunPython.noop),
+    ]
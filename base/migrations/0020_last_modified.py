@@ -0,0 +1,32 @@
+# Generated by Django 3.0.7 on 2026-10-19 02:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0019_rebuild_course_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='content',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Last modified'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Last modified'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='favorite',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Last modified'),
+            preserve_default=False,
+        ),
+    ]
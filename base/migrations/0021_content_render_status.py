@@ -0,0 +1,18 @@
+# Generated by Django 3.0.7 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0020_last_modified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='content',
+            name='render_status',
+            field=models.CharField(choices=[('rendered', 'Rendered'), ('pending', 'Pending'), ('failed', 'Failed')], default='rendered', max_length=10, verbose_name='Render status'),
+        ),
+    ]
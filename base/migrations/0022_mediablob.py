@@ -0,0 +1,27 @@
+# Generated by Django 3.0.7 on 2026-10-19 02:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0021_content_render_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('name', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='Name')),
+                ('size', models.BigIntegerField(verbose_name='Size')),
+                ('references', models.PositiveIntegerField(default=0, verbose_name='References')),
+                ('creation_date', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Creation Date')),
+            ],
+            options={
+                'verbose_name': 'Media Blob',
+                'verbose_name_plural': 'Media Blobs',
+            },
+        ),
+    ]
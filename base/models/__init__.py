@@ -11,3 +11,7 @@ from .content import Course, Category, Period, Topic, Content, CourseStructureEn
 from .social import Comment, Rating
 
 from .coursebook import Favorite
+
+from .snapshot import CourseSnapshot
+
+from .blob import MediaBlob
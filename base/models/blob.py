@@ -0,0 +1,84 @@
+"""Purpose of this file
+
+This file describes the files of the media which are stored by their content, so that
+identical files are only stored once.
+"""
+
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class MediaBlob(models.Model):
+    """Media blob
+
+    This model represents a file of the media which is stored under the SHA-256 hash of its
+    content. The file is shared by all objects referring to the same content and is only
+    removed once it is not referenced anymore.
+
+    :attr MediaBlob.name: The name of the file in the storage
+    :type MediaBlob.name: CharField
+    :attr MediaBlob.size: The size of the file in bytes
+    :type MediaBlob.size: BigIntegerField
+    :attr MediaBlob.references: The number of objects referring to the file
+    :type MediaBlob.references: PositiveIntegerField
+    :attr MediaBlob.creation_date: Describes when the file was stored
+    :type MediaBlob.creation_date: DateTimeField
+    """
+    name = models.CharField(verbose_name=_("Name"), max_length=255, primary_key=True)
+    size = models.BigIntegerField(verbose_name=_("Size"))
+    references = models.PositiveIntegerField(verbose_name=_("References"), default=0)
+    creation_date = models.DateTimeField(verbose_name=_('Creation Date'),
+                                         default=timezone.now)
+
+    class Meta:
+        """Meta options
+
+        This class handles all possible meta options that you can give to this model.
+
+        :attr Meta.verbose_name: A human-readable name for the object in singular
+        :type Meta.verbose_name: __proxy__
+        :attr Meta.verbose_name_plural: A human-readable name for the object in plural
+        :type Meta.verbose_name_plural: __proxy__
+        """
+        verbose_name = _("Media Blob")
+        verbose_name_plural = _("Media Blobs")
+
+    def __str__(self):
+        """String representation
+
+        Returns the string representation of this object.
+
+        :return: the string representation of this object
+        :rtype: str
+        """
+        return f"{self.name} ({self.references})"
+
+    @staticmethod
+    def add_references(names, count=1):
+        """Add references
+
+        Adds the given number of references to the blobs with the given names. Names which
+        do not belong to a blob are ignored.
+
+        :param names: The names of the files
+        :type names: Iterable[str]
+        :param count: The number of added references
+        :type count: int
+        """
+        MediaBlob.objects.filter(name__in=set(names)) \
+            .update(references=F('references') + count)
+
+    @staticmethod
+    def remove_references(names):
+        """Remove references
+
+        Removes one reference from the blobs with the given names. The counters never drop
+        below zero, e.g. for blobs which were referenced before they were counted.
+
+        :param names: The names of the files
+        :type names: Iterable[str]
+        """
+        MediaBlob.objects.filter(name__in=set(names), references__gt=0) \
+            .update(references=F('references') - 1)
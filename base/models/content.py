@@ -7,7 +7,8 @@ content of the course book and can be registered in admin.py.
 
 from django.conf import settings
 from django.db import models
-from django.db.models import Avg, Count
+from django.db.models import Avg, Count, IntegerField
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -15,6 +16,7 @@ import reversion
 
 from fontawesome_5.fields import IconField
 
+from base.cache import course_pages_namespace, invalidate_version
 from base.models import Profile
 
 from .social import Rating
@@ -117,6 +119,8 @@ class Course(models.Model):
     :type Course.description: TextField
     :attr Course.creation_date: The creation date of the course
     :type Course.creation_date: DateTimeField
+    :attr Course.last_modified: The date when the course was last modified
+    :type Course.last_modified: DateTimeField
     :attr Course.image: The image of the course
     :type Course.image: ImageField
     :attr Course.topics: Describes the topic content in the course
@@ -140,6 +144,7 @@ class Course(models.Model):
     creation_date = models.DateTimeField(verbose_name=_('Creation Date'),
                                          default=timezone.now,
                                          blank=True)
+    last_modified = models.DateTimeField(verbose_name=_("Last modified"), auto_now=True)
 
     image = models.ImageField(verbose_name=_("Title Image"),
                               blank=True,
@@ -194,6 +199,20 @@ class Course(models.Model):
         """
         return self.topics.order_by('child_topic__index')
 
+    @staticmethod
+    def touch(course_ids):
+        """Touch
+
+        Marks the courses as modified by invalidating the cached pages of the courses, again
+        after the current transaction was committed. The validators of the pages are derived
+        from the version of the pages, so the courses themselves are not written.
+
+        :param course_ids: The ids of the courses
+        :type course_ids: Iterable[int]
+        """
+        for course_id in set(course_ids):
+            invalidate_version(course_pages_namespace(course_id))
+
     def __str__(self):
         """String representation
 
@@ -278,13 +297,19 @@ class Topic(models.Model):
         # the topic can be sorted (even as an addition to filter)
         # the user decides, if they want to sort by rating or by date
         # and the String represent their decision
+        # the primary key breaks ties, so that the order is the same on every page
         if sorted_by != 'None' and sorted_by is not None:
             if sorted_by == 'Rating':
-                contents = sorted(contents, key=lambda x: x.get_rate(), reverse=True)
+                # same value as get_rate: the truncated average or -1 without ratings
+                contents = contents.annotate(
+                    rate=Coalesce(Cast(Avg('rating__rating'), IntegerField()), -1)
+                ).order_by('-rate', 'pk')
             elif sorted_by == 'Date':
-                contents = contents.order_by('-' + 'creation_date')
+                contents = contents.order_by('-' + 'creation_date', 'pk')
             else:
-                contents = contents.order_by('-' + sorted_by)
+                contents = contents.order_by('-' + sorted_by, 'pk')
+        else:
+            contents = contents.order_by('pk')
         return contents
 
 
@@ -352,11 +377,33 @@ class Content(models.Model):
     :type Content.public: BooleanField
     :attr Content.creation_date: Describes when the content was created
     :type Content.creation_date: DateTimeField
+    :attr Content.last_modified: Describes when the content was last modified
+    :type Content.last_modified: DateTimeField
     :attr Content.preview: The preview image of the content
     :type Content.preview: ImageField
+    :attr Content.render_status: Describes if the PDF and the preview of the content are
+    rendered, waiting to be rendered or failed to render
+    :type Content.render_status: CharField
     :attr Content.ratings: Describes the ratings of the content
     :type Content.ratings: ManyToManyField - Profile
+    :attr Content.RENDERED: The render status of a rendered content
+    :type Content.RENDERED: str
+    :attr Content.RENDER_PENDING: The render status of a content waiting to be rendered
+    :type Content.RENDER_PENDING: str
+    :attr Content.RENDER_FAILED: The render status of a content which failed to render
+    :type Content.RENDER_FAILED: str
+    :attr Content.RENDER_STATUS_CHOICES: The choices of the render status
+    :type Content.RENDER_STATUS_CHOICES: list[tuple[str, __proxy__]]
     """
+    RENDERED = 'rendered'
+    RENDER_PENDING = 'pending'
+    RENDER_FAILED = 'failed'
+    RENDER_STATUS_CHOICES = [
+        (RENDERED, _("Rendered")),
+        (RENDER_PENDING, _("Pending")),
+        (RENDER_FAILED, _("Failed")),
+    ]
+
     topic = models.ForeignKey(Topic, verbose_name=_("Topic"),
                               related_name='contents',
                               on_delete=models.CASCADE)
@@ -387,9 +434,14 @@ class Content(models.Model):
     creation_date = models.DateTimeField(verbose_name=_('Creation Date'),
                                          default=timezone.now,
                                          blank=True)
+    last_modified = models.DateTimeField(verbose_name=_("Last modified"), auto_now=True)
     preview = models.ImageField(verbose_name=_("Rendered preview"),
                                 blank=True,
                                 null=True)
+    render_status = models.CharField(verbose_name=_("Render status"),
+                                     max_length=10,
+                                     choices=RENDER_STATUS_CHOICES,
+                                     default=RENDERED)
 
     ratings = models.ManyToManyField("Profile",
                                      through='Rating')
@@ -453,6 +505,22 @@ class Content(models.Model):
             return int(rating)
         return -1
 
+    def get_rate_summary(self):
+        """Rating summary
+
+        Returns the average rating together with the total count of ratings using a single
+        query. As in get_rate, the average rating is -1 if there are no ratings present.
+
+        :return: the average rating and the count of ratings
+        :rtype: tuple[int, int]
+        """
+        summary = Rating.objects.filter(content_id=self.id).aggregate(Avg('rating'),
+                                                                      Count('rating'))
+        rating = summary['rating__avg']
+        if rating is not None:
+            return int(rating), summary['rating__count']
+        return -1, summary['rating__count']
+
     def get_rate_count(self):
         """ Ratings count
 
@@ -488,8 +556,10 @@ class Content(models.Model):
         :return: the rating of an user
         :rtype: int
         """
-        if self.user_already_rated(user):
-            return self.ratings.get(user=user).rating_set.first().rating
+        rating = Rating.objects.filter(content_id=self.id, user_id=user.pk) \
+            .values_list('rating', flat=True).first()
+        if rating is not None:
+            return rating
         return 0
 
     def rate_content(self, user, rating):
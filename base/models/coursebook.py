@@ -18,12 +18,15 @@ class Favorite(models.Model):
     :type Favorite.course: ForeignKey - Course
     :attr Favorite.content: Describes the favourites contents of the user
     :type Favorite.content: ForeignKey - Content
+    :attr Favorite.last_modified: The date when the favorite was last modified
+    :type Favorite.last_modified: DateTimeField
     """
 
     user = models.ForeignKey("Profile", verbose_name=_("User"), on_delete=models.CASCADE,
                              related_name="user_favorites")
     course = models.ForeignKey("Course", verbose_name=_("Course"), on_delete=models.CASCADE)
     content = models.ForeignKey("Content", verbose_name=_("Content"), on_delete=models.CASCADE)
+    last_modified = models.DateTimeField(verbose_name=_("Last modified"), auto_now=True)
 
     class Meta:
         """Meta options
@@ -0,0 +1,198 @@
+"""Purpose of this file
+
+This file describes the denormalized read model of a course which is used to display the
+course without rebuilding its structure on every request.
+"""
+
+import json
+
+from django.db import connection, models, transaction
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from .content import Content, Course, CourseStructureEntry
+
+
+class CourseSnapshot(models.Model):
+    """Course snapshot
+
+    This model represents the snapshot of the structure of a course containing the ordered
+    topics and subtopics with the summaries of their contents. A snapshot is deleted when
+    the course changes and is rebuilt when it is read the next time.
+
+    :attr CourseSnapshot.course: The course of the snapshot
+    :type CourseSnapshot.course: OneToOneField - Course
+    :attr CourseSnapshot.data: The json document of the snapshot
+    :type CourseSnapshot.data: TextField
+    :attr CourseSnapshot.creation_date: The date on which the snapshot was built
+    :type CourseSnapshot.creation_date: DateTimeField
+    """
+    course = models.OneToOneField(Course, verbose_name=_("Course"),
+                                  related_name='snapshot',
+                                  on_delete=models.CASCADE,
+                                  primary_key=True)
+    data = models.TextField(verbose_name=_("Data"))
+    creation_date = models.DateTimeField(verbose_name=_("Creation date"), auto_now=True)
+
+    class Meta:
+        """Meta options
+
+        This class handles all possible meta options that you can give to this model.
+
+        :attr Meta.verbose_name: A human-readable name for the object in singular
+        :type Meta.verbose_name: __proxy__
+        :attr Meta.verbose_name_plural: A human-readable name for the object in plural
+        :type Meta.verbose_name_plural: __proxy__
+        """
+        verbose_name = _("Course Snapshot")
+        verbose_name_plural = _("Course Snapshots")
+
+    @staticmethod
+    def summarize_content(content):
+        """Summarize content
+
+        Returns the summary of a content which is stored in the snapshot. The ratings and the
+        tags are not part of it, they are shown by the cards of the contents.
+
+        :param content: The content
+        :type content: Content
+
+        :return: the summary of the content
+        :rtype: dict[str, Any]
+        """
+        return {
+            'id': content.id,
+            'type': content.type,
+            'description': content.description,
+            'language': content.language,
+            'public': content.public,
+        }
+
+    @classmethod
+    def build(cls, course):
+        """Build
+
+        Builds and saves the snapshot of the course from its structure entries, topics and
+        contents.
+
+        :param course: The course of the snapshot
+        :type course: Course
+
+        :return: the built snapshot
+        :rtype: CourseSnapshot
+        """
+        entries = list(CourseStructureEntry.objects.filter(course=course)
+                       .select_related('topic__category').order_by('index'))
+        contents = {}
+        for content in Content.objects \
+                .filter(topic_id__in=[entry.topic_id for entry in entries]).order_by('pk'):
+            contents.setdefault(content.topic_id, []).append(cls.summarize_content(content))
+
+        structure = []
+        for entry in entries:
+            topic = {'id': entry.topic.id,
+                     'title': entry.topic.title,
+                     'value': str(entry.topic),
+                     'contents': contents.get(entry.topic.id, [])}
+            topic['content_count'] = len(topic['contents'])
+            topic['public_content_count'] = sum(content['public']
+                                                for content in topic['contents'])
+            # Only handle up to one subtopic level
+            if len(entry.index.split('/')) == 1:
+                topic['subtopics'] = []
+                structure.append(topic)
+            else:
+                structure[-1]['subtopics'].append(topic)
+
+        return cls.objects.update_or_create(
+            course=course, defaults={'data': json.dumps({'structure': structure})})[0]
+
+    @classmethod
+    def get_for_course(cls, course):
+        """Get for course
+
+        Returns the snapshot of the course. The snapshot is built if the course does not
+        have a snapshot yet or the snapshot was invalidated.
+
+        :param course: The course of the snapshot
+        :type course: Course
+
+        :return: the snapshot of the course
+        :rtype: CourseSnapshot
+        """
+        try:
+            return cls.objects.get(course=course)
+        except cls.DoesNotExist:
+            return cls.build(course)
+
+    @classmethod
+    def invalidate(cls, course_ids):
+        """Invalidate
+
+        Deletes the snapshots of the courses, so that they are rebuilt on the next read,
+        and marks the courses as modified. The snapshots are deleted again after the current
+        transaction was committed, because other requests may rebuild them from the previous
+        data until then.
+
+        :param course_ids: The ids of the courses
+        :type course_ids: Iterable[int]
+        """
+        course_ids = set(course_ids)
+        snapshots = cls.objects.filter(course_id__in=course_ids)
+        snapshots.delete()
+        if connection.in_atomic_block:
+            transaction.on_commit(snapshots.delete)
+        Course.touch(course_ids)
+
+    @cached_property
+    def structure(self):
+        """Structure
+
+        Returns the ordered topics of the course with their subtopics and the summaries of
+        their contents.
+
+        :return: the structure of the course
+        :rtype: list[dict[str, Any]]
+        """
+        return json.loads(self.data)['structure']
+
+    def get_content_ids(self):
+        """Content ids
+
+        Returns the ids of the contents in the order of the structure of the course.
+
+        :return: the ids of the contents
+        :rtype: list[int]
+        """
+        return [content['id']
+                for topic in self.structure
+                for entry in [topic, *topic['subtopics']]
+                for content in entry['contents']]
+
+    def get_structure_json(self):
+        """Structure json
+
+        Returns the json object representing the topics of the course structure in the
+        format of the structure editor.
+
+        :return: a json object of the topic structure
+        :rtype: list[dict[str, Union[int, str, list]]]
+        """
+        json_obj = []
+        for topic in self.structure:
+            topic_json = {'value': topic['value'], 'id': topic['id']}
+            if topic['subtopics']:
+                topic_json['children'] = [{'value': subtopic['value'], 'id': subtopic['id']}
+                                          for subtopic in topic['subtopics']]
+            json_obj.append(topic_json)
+        return json_obj
+
+    def __str__(self):
+        """String representation
+
+        Returns the string representation of this object.
+
+        :return: the string representation of this object
+        :rtype: str
+        """
+        return f"{self.course} ({self.creation_date})"
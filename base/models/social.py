@@ -98,9 +98,14 @@ class Comment(models.Model):
         :type Meta.verbose_name: __proxy__
         :param Meta.verbose_name_plural: A human-readable name for the object in plural
         :type Meta.verbose_name_plural: __proxy__
+        :param Meta.indexes: The indexes of the model
+        :type Meta.indexes: list[Index]
         """
         verbose_name = _("Comment")
         verbose_name_plural = _("Comments")
+        indexes = [
+            models.Index(fields=['content', 'creation_date'], name='base_comment_content_date')
+        ]
 
     def __str__(self):
         """String representation
@@ -0,0 +1,143 @@
+"""Purpose of this file
+
+This file contains the database router which sends the reads to the replica, so that the
+reading requests do not share the connection of the writes.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# threading.local: The pinning of the reads of the current thread to the primary
+_STATE = threading.local()
+
+
+def is_pinned():
+    """Is pinned
+
+    Returns if the reads of the current thread are pinned to the primary.
+
+    :return: true iff the reads are pinned
+    :rtype: bool
+    """
+    return getattr(_STATE, 'pinned', 0) > 0
+
+
+@contextmanager
+def pin_primary(pinned=True):
+    """Pin primary
+
+    Sends the reads in the block to the primary, e.g. while a request writes or right after
+    a user wrote, so that the changes are read back.
+
+    :param pinned: Whether the reads are pinned
+    :type pinned: bool
+    """
+    if not pinned:
+        yield
+        return
+    _STATE.pinned = getattr(_STATE, 'pinned', 0) + 1
+    try:
+        yield
+    finally:
+        _STATE.pinned -= 1
+
+
+def get_replica():
+    """Replica
+
+    Returns the alias of the replica of the setting DATABASE_REPLICA if it is configured.
+    While testing the replica mirrors the primary and is not used, because a second
+    connection would not see the transaction of the test.
+
+    :return: the alias of the replica or None
+    :rtype: str or None
+    """
+    alias = settings.DATABASE_REPLICA['ALIAS']
+    if alias not in settings.DATABASES:
+        return None
+    if connections[alias].settings_dict['NAME'] == \
+            connections[DEFAULT_DB_ALIAS].settings_dict['NAME']:
+        return None
+    return alias
+
+
+class PrimaryReplicaRouter:
+    """Primary replica router
+
+    Sends the reads to the replica and the writes to the primary. The reads are sent to the
+    primary as well while they are pinned or while the primary is in a transaction, whose
+    changes are only visible through the primary.
+    """
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        """Database for read
+
+        Returns the database which the model is read from.
+
+        :param model: The read model
+        :type model: type
+        :param hints: The hints of the query
+        :type hints: dict[str, Any]
+
+        :return: the alias of the database
+        :rtype: str
+        """
+        replica = get_replica()
+        if replica is None or is_pinned() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        """Database for write
+
+        Returns the database which the model is written to.
+
+        :param model: The written model
+        :type model: type
+        :param hints: The hints of the query
+        :type hints: dict[str, Any]
+
+        :return: the alias of the database
+        :rtype: str
+        """
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        """Allow relation
+
+        Allows all relations, because the replica holds the same data as the primary.
+
+        :param obj1: The first object
+        :type obj1: Model
+        :param obj2: The second object
+        :type obj2: Model
+        :param hints: The hints of the relation
+        :type hints: dict[str, Any]
+
+        :return: true
+        :rtype: bool
+        """
+        return True
+
+    # pylint: disable=unused-argument
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Allow migrate
+
+        Allows the migrations only on the primary, the replica follows it.
+
+        :param db: The alias of the database
+        :type db: str
+        :param app_label: The label of the migrated application
+        :type app_label: str
+        :param model_name: The name of the migrated model
+        :type model_name: str or None
+        :param hints: The hints of the migration
+        :type hints: dict[str, Any]
+
+        :return: true iff the database is the primary
+        :rtype: bool
+        """
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,320 @@
+"""Purpose of this file
+
+This file contains the signal receivers which invalidate the snapshots and the cached pages
+of the courses and the cached fragments of their topics and contents, and which share the
+statistics of the cache.
+"""
+
+from django.core.signals import request_finished
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from base.cache import content_card_namespace, course_pages_namespace, flush_statistics, \
+    invalidate_version, topic_contents_namespace
+from base.models import Category, Comment, Content, Course, CourseSnapshot, \
+    CourseStructureEntry, Rating, Tag, Topic
+
+
+def get_course_ids(**lookups):
+    """Course ids
+
+    Returns the ids of the courses whose structure entries match the lookups.
+
+    :param lookups: The lookups of the structure entries
+    :type lookups: dict[str, Any]
+
+    :return: the ids of the courses
+    :rtype: set[int]
+    """
+    return set(CourseStructureEntry.objects.filter(**lookups)
+               .values_list('course_id', flat=True))
+
+
+def invalidate_courses(**lookups):
+    """Invalidate courses
+
+    Invalidates the snapshots and the cached pages of all courses whose structure entries
+    match the lookups.
+
+    :param lookups: The lookups of the structure entries
+    :type lookups: dict[str, Any]
+    """
+    CourseSnapshot.invalidate(get_course_ids(**lookups))
+
+
+def invalidate_course_pages(**lookups):
+    """Invalidate course pages
+
+    Marks all courses whose structure entries match the lookups as modified. The snapshots
+    of the courses are kept because the change is not part of them.
+
+    :param lookups: The lookups of the structure entries
+    :type lookups: dict[str, Any]
+    """
+    Course.touch(get_course_ids(**lookups))
+
+
+def invalidate_topics(topic_ids):
+    """Invalidate topics
+
+    Invalidates the cached rendered contents of the topics together with the snapshots and
+    the cached pages of the courses containing the topics.
+
+    :param topic_ids: The ids of the topics
+    :type topic_ids: Iterable[int]
+    """
+    topic_ids = set(topic_ids)
+    for topic_id in topic_ids:
+        invalidate_version(topic_contents_namespace(topic_id))
+    invalidate_courses(topic_id__in=topic_ids)
+
+
+def invalidate_contents(content_ids):
+    """Invalidate contents
+
+    Invalidates the cached rendered cards of the contents, the cached rendered contents of
+    their topics and the cached pages of the courses containing them. The topics and the
+    courses are looked up together in one query. The snapshots of the courses are kept, so
+    this is meant for changes which are not part of them.
+
+    :param content_ids: The ids of the contents
+    :type content_ids: Iterable[int]
+    """
+    content_ids = set(content_ids)
+    for content_id in content_ids:
+        invalidate_version(content_card_namespace(content_id))
+    entries = set(CourseStructureEntry.objects.filter(topic__contents__in=content_ids)
+                  .values_list('topic_id', 'course_id'))
+    for topic_id in {topic_id for topic_id, _ in entries}:
+        invalidate_version(topic_contents_namespace(topic_id))
+    Course.touch(course_id for _, course_id in entries)
+
+
+@receiver(post_save, sender=CourseStructureEntry)
+@receiver(post_delete, sender=CourseStructureEntry)
+def structure_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Structure changed
+
+    Invalidates the course of a structure entry which was saved or deleted.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved or deleted structure entry
+    :type instance: CourseStructureEntry
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    CourseSnapshot.invalidate([instance.course_id])
+
+
+@receiver(post_save, sender=Course)
+def course_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Course changed
+
+    Invalidates the cached pages of a course which was saved.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved course
+    :type instance: Course
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    invalidate_version(course_pages_namespace(instance.pk))
+
+
+@receiver(m2m_changed, sender=Course.owners.through)
+def course_owners_changed(sender, instance, action, reverse, pk_set,
+                          **kwargs):  # pylint: disable=unused-argument, too-many-arguments
+    """Course owners changed
+
+    Marks the courses whose owners were changed as modified.
+
+    :param sender: The intermediate model class
+    :type sender: type
+    :param instance: The course or the profile whose relation was changed
+    :type instance: Course or Profile
+    :param action: The kind of the change
+    :type action: str
+    :param reverse: If the relation was changed from the profile side
+    :type reverse: bool
+    :param pk_set: The ids of the added or removed objects
+    :type pk_set: set[int] or None
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Course.touch([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        Course.touch(pk_set)
+    elif action == 'pre_clear':
+        # The courses are not known anymore after the relation was cleared
+        Course.touch(instance.owned_courses.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Topic)
+def topic_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Topic changed
+
+    Invalidates the courses containing a topic which was saved.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved topic
+    :type instance: Topic
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    invalidate_courses(topic=instance)
+
+
+@receiver(post_save, sender=Category)
+def category_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Category changed
+
+    Invalidates the courses containing topics of a category which was saved because the
+    category is part of the name of the topics.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved category
+    :type instance: Category
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    invalidate_courses(topic__category=instance)
+
+
+@receiver(pre_save, sender=Content)
+def content_moved(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Content moved
+
+    Invalidates the previous topic of a content which will be saved, in case the content is
+    moved to another topic.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The content that will be saved
+    :type instance: Content
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    if instance.pk is not None:
+        invalidate_topics(Content.objects.filter(pk=instance.pk)
+                          .exclude(topic_id=instance.topic_id)
+                          .values_list('topic_id', flat=True))
+
+
+@receiver(post_save, sender=Content)
+@receiver(post_delete, sender=Content)
+def content_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Content changed
+
+    Invalidates the cards and the topic of a content which was saved or deleted.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved or deleted content
+    :type instance: Content
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    invalidate_version(content_card_namespace(instance.pk))
+    invalidate_topics([instance.topic_id])
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+def rating_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Rating changed
+
+    Invalidates a rated content because its card and the pages of its courses show the
+    rating. The snapshots are kept because the ratings are not part of them.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved or deleted rating
+    :type instance: Rating
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    invalidate_contents([instance.content_id])
+
+
+@receiver(post_save, sender=Tag)
+def tag_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Tag changed
+
+    Invalidates the contents with a tag which was saved because their cards show the tag.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved tag
+    :type instance: Tag
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    invalidate_contents(instance.contents.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Content.tags.through)
+def content_tags_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):  # pylint: disable=unused-argument, too-many-arguments
+    """Content tags changed
+
+    Invalidates the contents whose tags were added or removed.
+
+    :param sender: The intermediate model class
+    :type sender: type
+    :param instance: The content or the tag whose relation was changed
+    :type instance: Content or Tag
+    :param action: The kind of the change
+    :type action: str
+    :param reverse: If the relation was changed from the tag side
+    :type reverse: bool
+    :param pk_set: The ids of the added or removed objects
+    :type pk_set: set[int] or None
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_contents([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        invalidate_contents(pk_set)
+    elif action == 'pre_clear':
+        # The contents are not known anymore after the relation was cleared
+        invalidate_contents(instance.contents.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Comment changed
+
+    Invalidates the cached pages of the courses containing a commented content.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved or deleted comment
+    :type instance: Comment
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    invalidate_course_pages(topic__contents=instance.content_id)
+
+
+@receiver(request_finished)
+def request_finished_statistics(sender, **kwargs):  # pylint: disable=unused-argument
+    """Request finished statistics
+
+    Adds the hits and misses of the cache counted during the request to the shared
+    statistics.
+
+    :param sender: The class of the handler of the request
+    :type sender: type
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    flush_statistics()
@@ -0,0 +1,244 @@
+"""Purpose of this file
+
+This file contains the capture of slow queries. Queries exceeding the threshold of the
+setting SLOW_QUERIES are sampled with their normalized SQL, the call site in the code of the
+project, the view and the query plan of the database. The samples are kept in a ring
+buffer in the cache, which is shared by the processes of the server.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.base import Template
+
+# str: The key of the number of samples which were written to the ring buffer
+SAMPLE_COUNT_KEY = 'slow-queries:count'
+
+# Pattern: The string literals of SQL
+STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+
+# Pattern: The number literals of SQL
+NUMBER_PATTERN = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+# Pattern: The lists of placeholders, e.g. of IN lookups
+LIST_PATTERN = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+
+# Pattern: The white space of SQL
+SPACE_PATTERN = re.compile(r'\s+')
+
+# tuple[str]: The beginnings of the queries which are explained
+EXPLAINED_STATEMENTS = ('SELECT', 'WITH')
+
+# tuple[str]: The modules of the project which only pass the queries through
+IGNORED_MODULES = ('base/metrics.py', 'base/middleware.py', 'base/slow_queries.py')
+
+# threading.local: The request of the current thread
+_STATE = threading.local()
+
+
+def normalize_sql(sql):
+    """Normalize SQL
+
+    Returns the SQL with placeholders instead of literals and lists, so that the same query
+    with other parameters has the same SQL.
+
+    :param sql: The SQL of the query
+    :type sql: str
+
+    :return: the normalized SQL
+    :rtype: str
+    """
+    sql = STRING_PATTERN.sub('%s', sql)
+    sql = NUMBER_PATTERN.sub('%s', sql)
+    sql = LIST_PATTERN.sub('(...)', sql)
+    return SPACE_PATTERN.sub(' ', sql).strip()
+
+
+def get_call_site():
+    """Call site
+
+    Returns the frames of the stack in the code of the project which led to the query,
+    starting with the innermost frame. The templates being rendered are part of the stack,
+    because the querysets of the class based views are evaluated by their templates.
+
+    :return: the frames as file, line and function and the templates
+    :rtype: list[str]
+    """
+    root = str(settings.BASE_DIR) + os.sep
+    frames = []
+    for frame, line in traceback.walk_stack(None):
+        code = frame.f_code
+        # Every template is rendered by the frame of Template._render, which has no public
+        # counterpart holding the template
+        if code is Template._render.__code__:  # pylint: disable=protected-access
+            origin = frame.f_locals['self'].origin
+            frames.append(f'{origin.template_name or origin.name} (template)')
+        else:
+            path = os.path.abspath(code.co_filename)
+            if not path.startswith(root) or 'site-packages' in path:
+                continue
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            if name in IGNORED_MODULES:
+                continue
+            frames.append(f'{name}:{line} in {code.co_name}')
+        if len(frames) >= settings.SLOW_QUERIES['STACK_DEPTH']:
+            break
+    return frames
+
+
+def explain(connection, sql, params):
+    """Explain
+
+    Returns the query plan of a query. The plan is queried on a cursor of the database
+    backend, so that it is not captured itself.
+
+    :param connection: The database wrapper of the query
+    :type connection: BaseDatabaseWrapper
+    :param sql: The SQL of the query
+    :type sql: str
+    :param params: The parameters of the query
+    :type params: Any
+
+    :return: the rows of the plan or the error if the query could not be explained
+    :rtype: list[str]
+    """
+    if not sql.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+        return []
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+        rows = cursor.fetchall()
+    except Exception as error:  # pylint: disable=broad-except
+        return [f'{type(error).__name__}: {error}']
+    finally:
+        cursor.close()
+    if connection.vendor == 'sqlite':
+        # The rows of SQLite start with the ids of the steps of the plan
+        return [row[-1] for row in rows]
+    return [' '.join(map(str, row)) for row in rows]
+
+
+def add_sample(sample):
+    """Add sample
+
+    Writes the sample to the next slot of the ring buffer, which overwrites the oldest
+    sample once the buffer is full.
+
+    :param sample: The sample of the slow query
+    :type sample: dict[str, Any]
+    """
+    cache.add(SAMPLE_COUNT_KEY, 0, None)
+    try:
+        number = cache.incr(SAMPLE_COUNT_KEY)
+    except ValueError:
+        # The counter was evicted in the meantime
+        number = 1
+        cache.set(SAMPLE_COUNT_KEY, number, None)
+    cache.set(f'slow-queries:{number % settings.SLOW_QUERIES["SIZE"]}', sample, None)
+
+
+def get_samples():
+    """Samples
+
+    Returns the samples of the ring buffer, starting with the latest sample.
+
+    :return: the samples of the slow queries
+    :rtype: list[dict[str, Any]]
+    """
+    keys = [f'slow-queries:{slot}' for slot in range(settings.SLOW_QUERIES['SIZE'])]
+    samples = list(cache.get_many(keys).values())
+    return sorted(samples, key=lambda sample: sample['time'], reverse=True)
+
+
+def clear_samples():
+    """Clear samples
+
+    Deletes all samples of the ring buffer.
+    """
+    cache.delete_many([f'slow-queries:{slot}' for slot in range(settings.SLOW_QUERIES['SIZE'])])
+    cache.delete(SAMPLE_COUNT_KEY)
+
+
+def group_samples(samples):
+    """Group samples
+
+    Groups the samples by their normalized SQL, the groups with the largest total duration
+    come first. The latest sample of every group is kept as example.
+
+    :param samples: The samples starting with the latest sample
+    :type samples: list[dict[str, Any]]
+
+    :return: the groups with the count, the total and the maximal duration and the example
+    :rtype: list[dict[str, Any]]
+    """
+    groups = {}
+    for sample in samples:
+        group = groups.get(sample['sql'])
+        if group is None:
+            group = groups[sample['sql']] = {'sql': sample['sql'], 'count': 0, 'total': 0.0,
+                                             'max': 0.0, 'views': set(), 'example': sample}
+        group['count'] += 1
+        group['total'] += sample['duration']
+        group['max'] = max(group['max'], sample['duration'])
+        group['views'].add(sample['view'])
+    return sorted(groups.values(), key=lambda group: group['total'], reverse=True)
+
+
+def set_view_request(request):
+    """Set view request
+
+    Sets the request of the current thread, whose view is stored with the samples.
+
+    :param request: The given request or None after the request
+    :type request: HttpRequest or None
+    """
+    _STATE.request = request
+
+
+def capture_slow_query(execute, sql, params, many, context):
+    """Capture slow query
+
+    Executes a query and samples it if it exceeds the threshold. This function is installed
+    by connection.execute_wrapper().
+
+    :param execute: The execution of the query
+    :type execute: Callable
+    :param sql: The SQL of the query
+    :type sql: str
+    :param params: The parameters of the query
+    :type params: Any
+    :param many: Whether the query is executed for many parameters
+    :type many: bool
+    :param context: The connection and the cursor of the query
+    :type context: dict[str, Any]
+
+    :return: the result of the execution
+    :rtype: Any
+    """
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = (time.perf_counter() - start) * 1000
+    config = settings.SLOW_QUERIES
+    if duration < config['THRESHOLD_MS'] or random.random() >= config['SAMPLE_RATE']:
+        return result
+
+    request = getattr(_STATE, 'request', None)
+    match = getattr(request, 'resolver_match', None)
+    connection = context['connection']
+    add_sample({
+        'sql': normalize_sql(sql),
+        'duration': duration,
+        'time': time.time(),
+        'database': connection.alias,
+        'view': match.view_name if match else '',
+        'path': request.path if request else '',
+        'stack': get_call_site(),
+        'plan': [] if many else explain(connection, sql, params),
+    })
+    return result
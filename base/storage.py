@@ -0,0 +1,189 @@
+"""Purpose of this file
+
+This file contains the content addressed storage of the uploaded PDFs and images. A file is
+stored under the SHA-256 hash of its content, so that identical uploads, e.g. the slides of
+a duplicated course, share one file and its generated preview.
+"""
+
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+from base.models import MediaBlob
+
+# str: Path of the folder containing the blobs
+BLOB_FOLDER = 'uploads/blobs/'
+
+# str: Path of the folder containing the previews
+PREVIEW_FOLDER = 'uploads/previews/'
+
+# str: Path of the folder containing the linearized copies of the PDFs
+LINEARIZED_FOLDER = 'uploads/linearized/'
+
+# str: Path of the folder containing the folders of the page images of the PDFs
+PAGES_FOLDER = 'uploads/pages/'
+
+# str: Name of the file in a folder of page images which describes the pages
+PAGES_MANIFEST = 'pages.json'
+
+# Pattern: The name of a blob, which contains the hash of its content
+BLOB_NAME_PATTERN = re.compile(r'^' + re.escape(BLOB_FOLDER) + r'[0-9a-f]{2}/([0-9a-f]{64})')
+
+# Pattern: The name of a file derived from a PDF blob, which contains the hash of the PDF
+DERIVATIVE_NAME_PATTERN = re.compile(
+    r'^(?:' + '|'.join(re.escape(folder)
+                       for folder in (PREVIEW_FOLDER, LINEARIZED_FOLDER, PAGES_FOLDER))
+    + r')([0-9a-f]{64})[./]')
+
+
+def hash_file(file):
+    """Hash file
+
+    Returns the SHA-256 hash of the content of the file, which is read in chunks.
+
+    :param file: The file to hash
+    :type file: File
+
+    :return: the hexadecimal hash of the file
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_blob_name(digest, name):
+    """Blob name
+
+    Returns the name of the blob with the given hash. The extension of the original name is
+    kept, so that the type of the file is still known when it is served.
+
+    :param digest: The hash of the content
+    :type digest: str
+    :param name: The original name of the file
+    :type name: str
+
+    :return: the name of the blob
+    :rtype: str
+    """
+    extension = os.path.splitext(name)[1].lower()
+    return f"{BLOB_FOLDER}{digest[:2]}/{digest}{extension}"
+
+
+def get_digest(name):
+    """Digest
+
+    Returns the hash of the blob with the given name.
+
+    :param name: The name of the file
+    :type name: str
+
+    :return: the hash of the blob or None if the file is not a blob
+    :rtype: str or None
+    """
+    match = BLOB_NAME_PATTERN.match(name or '')
+    return None if match is None else match.group(1)
+
+
+def get_preview_name(name):
+    """Preview name
+
+    Returns the name of the preview of a blob, which is shared by all objects with the same
+    file.
+
+    :param name: The name of the file
+    :type name: str
+
+    :return: the name of the preview or None if the file is not a blob
+    :rtype: str or None
+    """
+    digest = get_digest(name)
+    return None if digest is None else f"{PREVIEW_FOLDER}{digest}.jpg"
+
+
+def get_linearized_name(name):
+    """Linearized name
+
+    Returns the name of the linearized copy of a PDF blob, which is shared by all objects
+    with the same file.
+
+    :param name: The name of the file
+    :type name: str
+
+    :return: the name of the linearized copy or None if the file is not a blob
+    :rtype: str or None
+    """
+    digest = get_digest(name)
+    return None if digest is None else f"{LINEARIZED_FOLDER}{digest}.pdf"
+
+
+def get_pages_folder(name):
+    """Pages folder
+
+    Returns the folder of the page images of a PDF blob, which is shared by all objects
+    with the same file.
+
+    :param name: The name of the file
+    :type name: str
+
+    :return: the folder of the page images or None if the file is not a blob
+    :rtype: str or None
+    """
+    digest = get_digest(name)
+    return None if digest is None else f"{PAGES_FOLDER}{digest}/"
+
+
+def get_source_name(name):
+    """Source name
+
+    Returns the name of the PDF blob from which a preview, a linearized copy or a page
+    image was derived.
+
+    :param name: The name of the derived file
+    :type name: str
+
+    :return: the name of the PDF or None if the file is not derived from a blob
+    :rtype: str or None
+    """
+    match = DERIVATIVE_NAME_PATTERN.match(name or '')
+    return None if match is None else get_blob_name(match.group(1), 'source.pdf')
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Content addressed storage
+
+    Stores the files in the media under the hash of their content. A file whose content is
+    already stored is not written again, the name of the existing blob is returned instead.
+    The references to the blobs are counted by the models which use this storage.
+    """
+
+    def _save(self, name, content):
+        """Save
+
+        Saves the content under its hash and registers the blob.
+
+        :param name: The name of the file
+        :type name: str
+        :param content: The content of the file
+        :type content: File
+
+        :return: the name of the blob
+        :rtype: str
+        """
+        name = get_blob_name(hash_file(content), name)
+        if self.exists(name):
+            # The blob is used again, so it is not collected as orphaned file
+            os.utime(self.path(name))
+        else:
+            name = super()._save(name, content)
+        MediaBlob.objects.get_or_create(name=name, defaults={'size': self.size(name)})
+        return name
+
+
+# ContentAddressedStorage: The storage of the uploaded PDFs and images
+blob_storage = ContentAddressedStorage()
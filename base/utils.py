@@ -3,9 +3,13 @@
 This file contains the utility functions used in this module.
 """
 
+from django.db import connections
+from django.db.models import F, Window
+from django.db.models.expressions import RowRange
+from django.db.models.functions import FirstValue, Lag, LastValue, Lead
 from django.utils import timezone
 
-from .models import CourseStructureEntry
+from .models import Course, CourseStructureEntry
 
 
 def create_topic_and_subtopic_list(topics, course):
@@ -123,8 +127,98 @@ def check_owner_permission(request, course, messages):
     :return: true if the owner has no permission and a message should be displayed
     :rtype: bool
     """
-    if get_user(request) not in course.owners.all():
+    if not is_course_owner(request.user, course):
         # back url for no permission page
         messages.error(request, "You don't have permission to do this.", extra_tags="alert-danger")
         return True
     return False
+
+
+def get_owned_course_ids(user):
+    """Owned course ids
+
+    Returns the ids of the courses owned by the user. The ids are loaded with a single
+    query and kept on the user instance, which lives as long as the request, so that
+    further permission checks during the same request are answered from memory.
+
+    :param user: The user whose courses should be retrieved
+    :type user: User
+
+    :return: the ids of the owned courses
+    :rtype: frozenset[int]
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    owned_course_ids = getattr(user, '_owned_course_ids', None)
+    if owned_course_ids is None:
+        # The primary key of the profile is the primary key of the user
+        owned_course_ids = frozenset(Course.owners.through.objects
+                                     .filter(profile_id=user.pk)
+                                     .values_list('course_id', flat=True))
+        user._owned_course_ids = owned_course_ids  # pylint: disable=protected-access
+    return owned_course_ids
+
+
+def is_course_owner(user, course):
+    """Course owner
+
+    Checks if the user is an owner of the course.
+
+    :param user: The user to check
+    :type user: User
+    :param course: The course to check
+    :type course: Course
+
+    :return: true if the user is an owner of the course
+    :rtype: bool
+    """
+    return course.pk in get_owned_course_ids(user)
+
+
+def get_neighbour_ids(queryset, object_id, field='pk'):
+    """Neighbour ids
+
+    Returns the ids of the previous and the next entry of an entry in the ordered query
+    set. The first and the last entry are neighbours of each other. The neighbours are
+    computed by the database with LAG and LEAD window functions over the ordering of
+    the query set, so only a single row is returned no matter how large the query set is.
+
+    :param queryset: The ordered query set
+    :type queryset: QuerySet
+    :param object_id: The id of the entry whose neighbours should be found
+    :type object_id: int
+    :param field: The field containing the ids of the entries
+    :type field: str
+
+    :return: the ids of the previous and the next entry or None if the entry is not
+    contained in the query set
+    :rtype: None or tuple[int, int]
+    """
+    ordering = []
+    for order in queryset.query.order_by or ('pk',):
+        if isinstance(order, str):
+            order = F(order[1:]).desc() if order.startswith('-') else F(order).asc()
+        ordering.append(order)
+
+    neighbours = queryset.annotate(
+        current_id=F(field),
+        previous_id=Window(Lag(field), order_by=ordering),
+        next_id=Window(Lead(field), order_by=ordering),
+        first_id=Window(FirstValue(field), order_by=ordering),
+        last_id=Window(LastValue(field), order_by=ordering,
+                       frame=RowRange(start=None, end=None)),
+    ).values_list('current_id', 'previous_id', 'next_id', 'first_id', 'last_id')
+
+    # Window functions are evaluated after the WHERE clause, so the row of the entry
+    # can only be selected from a sub query
+    sql, params = neighbours.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'SELECT previous_id, next_id, first_id, last_id FROM ({sql}) '
+                       f'WHERE current_id = %s', (*params, object_id))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    previous_id, next_id, first_id, last_id = row
+    # Wrap around at the first and the last entry
+    return (last_id if previous_id is None else previous_id,
+            first_id if next_id is None else next_id)
@@ -0,0 +1,156 @@
+"""Purpose of this file
+
+This file contains the compaction of the history stored by the reversion. The revisions
+are thinned according to the retention policy and the data of old versions is compressed.
+"""
+
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from reversion.models import Revision, Version
+
+from base.compressed_json import compress
+
+# int: The number of rows which are updated or deleted at once
+BATCH_SIZE = 500
+
+# str: The serialization format of the compressed versions
+COMPRESSED_FORMAT = 'zjson'
+
+
+def get_retention(**overrides):
+    """Retention
+
+    Returns the retention policy of the settings updated by the given options. Options
+    with the value None are ignored.
+
+    :param overrides: The options overriding the retention policy of the settings
+    :type overrides: dict[str, Any]
+
+    :return: the retention policy
+    :rtype: dict[str, Any]
+    """
+    retention = dict(settings.REVERSION_RETENTION)
+    retention.update({key: value for key, value in overrides.items() if value is not None})
+    return retention
+
+
+def select_kept_revisions(versions, now, retention):
+    """Select kept revisions
+
+    Returns the revisions of the versions of an object which are kept by the retention
+    policy. The latest versions are always kept, older versions are thinned to the latest
+    version of each day and then to the latest version of each week. Versions older than
+    the weekly period are dropped.
+
+    :param versions: The revision ids and creation dates of the versions of an object
+    ordered from the latest to the oldest version
+    :type versions: Iterable[tuple[int, datetime]]
+    :param now: The current date
+    :type now: datetime
+    :param retention: The retention policy
+    :type retention: dict[str, Any]
+
+    :return: the ids of the kept revisions
+    :rtype: set[int]
+    """
+    daily_limit = now - timedelta(days=retention['KEEP_DAILY_DAYS'])
+    weekly_limit = None
+    if retention['KEEP_WEEKLY_WEEKS'] is not None:
+        weekly_limit = now - timedelta(weeks=retention['KEEP_WEEKLY_WEEKS'])
+
+    kept, days, weeks = set(), set(), set()
+    for index, (revision_id, date_created) in enumerate(versions):
+        day = timezone.localtime(date_created).date()
+        week = day.isocalendar()[:2]
+        if index < retention['KEEP_LAST']:
+            keep = True
+        elif date_created >= daily_limit:
+            keep = day not in days
+        elif weekly_limit is None or date_created >= weekly_limit:
+            keep = week not in weeks
+        else:
+            keep = False
+        if keep:
+            kept.add(revision_id)
+            days.add(day)
+            weeks.add(week)
+    return kept
+
+
+def get_stale_revision_ids(retention, now=None):
+    """Stale revision ids
+
+    Returns the ids of the revisions which are not kept for any of their versions. A
+    revision contains the versions of all objects changed together, e.g. a content, its
+    type specific content and its attachments, so a revision is only deleted as a whole.
+
+    :param retention: The retention policy
+    :type retention: dict[str, Any]
+    :param now: The current date
+    :type now: datetime
+
+    :return: the ids of the stale revisions
+    :rtype: set[int]
+    """
+    now = now or timezone.now()
+    versions = Version.objects \
+        .order_by('content_type_id', 'object_id', '-revision__date_created', '-pk') \
+        .values_list('content_type_id', 'object_id', 'revision_id', 'revision__date_created')
+    kept = set()
+    for _, object_versions in groupby(versions.iterator(), key=lambda version: version[:2]):
+        kept |= select_kept_revisions((version[2:] for version in object_versions), now,
+                                      retention)
+    return set(Revision.objects.values_list('pk', flat=True)) - kept
+
+
+def delete_revisions(revision_ids):
+    """Delete revisions
+
+    Deletes the revisions together with their versions in batches.
+
+    :param revision_ids: The ids of the revisions
+    :type revision_ids: Iterable[int]
+    """
+    revision_ids = sorted(revision_ids)
+    for start in range(0, len(revision_ids), BATCH_SIZE):
+        with transaction.atomic():
+            Revision.objects.filter(pk__in=revision_ids[start:start + BATCH_SIZE]).delete()
+
+
+def compress_versions(retention, now=None):
+    """Compress versions
+
+    Compresses the data of the JSON versions which are older than the compression period
+    of the retention policy. Compressed versions are deserialized by their format, so they
+    can still be compared and reverted.
+
+    :param retention: The retention policy
+    :type retention: dict[str, Any]
+    :param now: The current date
+    :type now: datetime
+
+    :return: the number of compressed versions
+    :rtype: int
+    """
+    if retention['COMPRESS_AFTER_DAYS'] is None:
+        return 0
+    limit = (now or timezone.now()) - timedelta(days=retention['COMPRESS_AFTER_DAYS'])
+    versions = Version.objects.filter(format='json', revision__date_created__lt=limit) \
+        .only('serialized_data', 'format').order_by('pk')
+    count = 0
+    while True:
+        # Compressed versions do not match the filter anymore
+        batch = list(versions[:BATCH_SIZE])
+        if not batch:
+            return count
+        for version in batch:
+            version.serialized_data = compress(version.serialized_data)
+            version.format = COMPRESSED_FORMAT
+        with transaction.atomic():
+            Version.objects.bulk_update(batch, ['serialized_data', 'format'])
+        count += len(batch)
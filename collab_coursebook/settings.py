@@ -50,8 +50,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'base.middleware.MetricsMiddleware',
+    'base.middleware.SlowQueryMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'base.middleware.PrimaryPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +62,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'base.middleware.WriteSerializerMiddleware',
     'reversion.middleware.RevisionMiddleware',
 ]
 
@@ -66,7 +70,9 @@ ROOT_URLCONF = 'collab_coursebook.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # The Django template engine, whose rendering is measured by base.metrics
+        'BACKEND': 'base.metrics.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -89,7 +95,119 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+    },
+    # A read-only handle of the same file, which serves the reads of base.routers
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'file:' + os.path.join(BASE_DIR, 'db.sqlite3') + '?mode=ro',
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['base.routers.PrimaryReplicaRouter']
+
+# The reads are sent to the database ALIAS, except for the users who wrote in the last
+# PIN_SECONDS, which are marked by the cookie COOKIE_NAME by
+# base.middleware.PrimaryPinningMiddleware and read from the primary
+DATABASE_REPLICA = {
+    'ALIAS': 'replica',
+    'PIN_SECONDS': 10,
+    'COOKIE_NAME': 'pin_primary',
+}
+
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+# The development server runs in a single process and uses a local memory cache, the
+# processes of the production server share a file based cache (see settings_production.py)
+# The rendered content cards and their versions need two entries per content
+# The diffs of the history are stored in the database because they never change, the table
+# is created with ``python manage.py createcachetable``
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    'history': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'history_cache',
+        'TIMEOUT': 60 * 60 * 24 * 30,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+# Tuning of the SQLite database, the pragmas are applied to every new connection by
+# base.database: WAL lets the readers continue while a request writes, the busy timeout
+# (in milliseconds) lets a writer wait for the lock instead of failing at once
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# The write requests of the VIEWS (and the requests of the GET_VIEWS, which write on GET as
+# well) are executed one after another by base.middleware.WriteSerializerMiddleware, which
+# holds the LOCK_FILE for at most TIMEOUT seconds and retries a request up to RETRIES times
+# if the database was still locked
+SQLITE_WRITE_SERIALIZER = {
+    'LOCK_FILE': os.path.join(BASE_DIR, 'db.write.lock'),
+    'TIMEOUT': 10,
+    'RETRIES': 3,
+    'VIEWS': [
+        'frontend:course',
+        'frontend:comment-edit',
+        'frontend:comment-delete',
+        'frontend:content',
+        'frontend:content-add',
+        'frontend:content-edit',
+        'frontend:content-delete',
+        'frontend:course-edit',
+        'frontend:course-edit-structure',
+        'frontend:course-delete',
+        'frontend:course-duplicate',
+        'frontend:course-history',
+        'frontend:textfield-history',
+        'frontend:ytvideo-history',
+        'frontend:image-history',
+        'frontend:pdf-history',
+        'frontend:latex-history',
+    ],
+    'GET_VIEWS': [
+        'frontend:rating',
+        'frontend:coursebook-add',
+        'frontend:coursebook-remove',
+    ],
+}
+
+# The sessions are read from the cache and only written to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# The metrics of the requests are exposed at /metrics in the text format of Prometheus to
+# the ALLOWED_IPS and to staff users. Every process writes its metrics to a file in
+# DIRECTORY at most every SECONDS
+METRICS = {
+    'DIRECTORY': os.path.join(BASE_DIR, 'metrics'),
+    'SECONDS': 10,
+    'ALLOWED_IPS': ['127.0.0.1'],
+}
+
+# Queries of the requests slower than THRESHOLD_MS are sampled with the probability
+# SAMPLE_RATE if ENABLED, the latest SIZE samples are shown to superusers in the admin panel
+# at /admin/slow-queries/ with their plan and the STACK_DEPTH innermost frames of the project
+SLOW_QUERIES = {
+    'ENABLED': False,
+    'THRESHOLD_MS': 100,
+    'SAMPLE_RATE': 1.0,
+    'SIZE': 200,
+    'STACK_DEPTH': 8,
 }
 
 # Password validation
@@ -160,6 +278,19 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# The media is served by frontend.views.media after checking the access. The transfer of
+# the files is handed to the web server with the given HEADER: 'X-Sendfile' (Apache with
+# mod_xsendfile) sends the absolute path, 'X-Accel-Redirect' (nginx) sends LOCATION
+# followed by the name of the file. None streams the files by Django (for development)
+MEDIA_SENDFILE = {
+    'HEADER': None,
+    'LOCATION': '/protected-media/',
+}
+
+# Files of the media which are not referenced anymore are deleted by
+# ``python manage.py cleanmedia`` once they were not modified for the given number of hours
+MEDIA_GRACE_HOURS = 24
+
 # Used for Debug Toolbar
 INTERNAL_IPS = [
     '127.0.0.1',
@@ -185,6 +316,33 @@ FOOTER_INFO = {
 
 ALLOW_PUBLIC_COURSE_EDITING_BY_EVERYONE = True
 
+# Retention of the history, which is applied by ``python manage.py compactversions``:
+# the latest versions of every object are kept, older versions are thinned to one version
+# per day and then to one version per week (None keeps them forever)
+REVERSION_RETENTION = {
+    'KEEP_LAST': 20,
+    'KEEP_DAILY_DAYS': 30,
+    'KEEP_WEEKLY_WEEKS': None,
+    # Versions are compressed after the given number of days (None disables compression)
+    'COMPRESS_AFTER_DAYS': 7,
+}
+
+# The compressed versions of the reversion
+SERIALIZATION_MODULES = {
+    'zjson': 'base.compressed_json',
+}
+
+# Chunked uploads of large PDFs and images, which are assembled in the directory ROOT
+# (outside of the served media) and moved to the media once the form is submitted
+CHUNKED_UPLOAD = {
+    'ROOT': os.path.join(BASE_DIR, 'chunked_uploads'),
+    # Bytes per chunk, which must stay below DATA_UPLOAD_MAX_MEMORY_SIZE
+    'CHUNK_SIZE': 1024 * 1024,
+    'MAX_SIZE': 500 * 1024 * 1024,
+    # Unfinished and unused uploads are deleted after the given number of hours
+    'EXPIRATION_HOURS': 24,
+}
+
 # Add reversion models to admin interface:
 ADD_REVERSION_ADMIN=True
 # optional settings:
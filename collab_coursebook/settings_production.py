@@ -53,8 +53,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'base.middleware.MetricsMiddleware',
+    'base.middleware.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'base.middleware.PrimaryPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -62,6 +64,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'base.middleware.WriteSerializerMiddleware',
     'reversion.middleware.RevisionMiddleware',
 ]
 
@@ -69,7 +72,9 @@ ROOT_URLCONF = 'collab_coursebook.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # The Django template engine, whose rendering is measured by base.metrics
+        'BACKEND': 'base.metrics.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -96,9 +101,121 @@ DATABASES = {
         'NAME': secrets.DB_NAME,
         'USER': secrets.DB_USER,
         'PASSWORD': secrets.DB_PASSWORD,
-    }
+    },
+    # A read-only handle of the same file, which serves the reads of base.routers
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'file:' + secrets.DB_NAME + '?mode=ro',
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['base.routers.PrimaryReplicaRouter']
+
+# The reads are sent to the database ALIAS, except for the users who wrote in the last
+# PIN_SECONDS, which are marked by the cookie COOKIE_NAME by
+# base.middleware.PrimaryPinningMiddleware and read from the primary
+DATABASE_REPLICA = {
+    'ALIAS': 'replica',
+    'PIN_SECONDS': 10,
+    'COOKIE_NAME': 'pin_primary',
+}
+
+
+# Tuning of the SQLite database, the pragmas are applied to every new connection by
+# base.database: WAL lets the readers continue while a request writes, the busy timeout
+# (in milliseconds) lets a writer wait for the lock instead of failing at once
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# The write requests of the VIEWS (and the requests of the GET_VIEWS, which write on GET as
+# well) are executed one after another by base.middleware.WriteSerializerMiddleware, which
+# holds the LOCK_FILE for at most TIMEOUT seconds and retries a request up to RETRIES times
+# if the database was still locked
+SQLITE_WRITE_SERIALIZER = {
+    'LOCK_FILE': os.path.join(BASE_DIR, 'db.write.lock'),
+    'TIMEOUT': 10,
+    'RETRIES': 3,
+    'VIEWS': [
+        'frontend:course',
+        'frontend:comment-edit',
+        'frontend:comment-delete',
+        'frontend:content',
+        'frontend:content-add',
+        'frontend:content-edit',
+        'frontend:content-delete',
+        'frontend:course-edit',
+        'frontend:course-edit-structure',
+        'frontend:course-delete',
+        'frontend:course-duplicate',
+        'frontend:course-history',
+        'frontend:textfield-history',
+        'frontend:ytvideo-history',
+        'frontend:image-history',
+        'frontend:pdf-history',
+        'frontend:latex-history',
+    ],
+    'GET_VIEWS': [
+        'frontend:rating',
+        'frontend:coursebook-add',
+        'frontend:coursebook-remove',
+    ],
+}
+
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+# The processes of uWSGI share the cache through the files in LOCATION, a memcached server
+# can be used instead by django.core.cache.backends.memcached.MemcachedCache
+# The diffs of the history are stored in the database because they never change, the table
+# is created with ``python manage.py createcachetable``
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    'history': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'history_cache',
+        'TIMEOUT': 60 * 60 * 24 * 30,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
 }
 
+# The sessions are read from the cache and only written to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# The metrics of the requests are exposed at /metrics in the text format of Prometheus to
+# the ALLOWED_IPS and to staff users. Every process writes its metrics to a file in
+# DIRECTORY at most every SECONDS
+METRICS = {
+    'DIRECTORY': os.path.join(BASE_DIR, 'metrics'),
+    'SECONDS': 10,
+    'ALLOWED_IPS': ['127.0.0.1'],
+}
+
+# Queries of the requests slower than THRESHOLD_MS are sampled with the probability
+# SAMPLE_RATE if ENABLED, the latest SIZE samples are shown to superusers in the admin panel
+# at /admin/slow-queries/ with their plan and the STACK_DEPTH innermost frames of the project
+SLOW_QUERIES = {
+    'ENABLED': False,
+    'THRESHOLD_MS': 100,
+    'SAMPLE_RATE': 1.0,
+    'SIZE': 200,
+    'STACK_DEPTH': 8,
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -156,6 +273,12 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# The files of the media are sent by Apache, see apache-collab-coursebook.conf
+MEDIA_SENDFILE = {
+    'HEADER': 'X-Sendfile',
+    'LOCATION': '/protected-media/',
+}
+
 # Used for Debug Toolbar
 INTERNAL_IPS = [
     '127.0.0.1',
@@ -14,18 +14,26 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+import re
+
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 
 import django_cas_ng.views
 
 import debug_toolbar
 
+from base.admin import slow_queries_view
+
+from frontend.views.media import serve_media
+from frontend.views.metrics import metrics
+
 
 urlpatterns = static(settings.STATIC_URL,
                      document_root=settings.STATIC_ROOT) + [
+    path('admin/slow-queries/', admin.site.admin_view(slow_queries_view), name='slow-queries'),
     path('admin/', admin.site.urls),
     path('i18n/', include('django.conf.urls.i18n')),
     path('accounts/login/', django_cas_ng.views.LoginView.as_view(), name='cas_ng_login'),
@@ -34,6 +42,11 @@ urlpatterns = static(settings.STATIC_URL,
     path('', include('frontend.urls', namespace='frontend')),
     path('i18n/', include('django.conf.urls.i18n')),
     path('__debug__/', include(debug_toolbar.urls)),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path('metrics', metrics, name='metrics'),
+    # The media is served after checking the access, the files are sent by the web server
+    re_path(r'^' + re.escape(settings.MEDIA_URL.lstrip('/')) + r'(?P<path>.+)$',
+            serve_media,
+            name='media'),
+]
 
 
@@ -3,3 +3,5 @@
 Marks this directory as Python package directories. This package contains the content
 type of the collab coursebook.
 """
+
+default_app_config = 'content.apps.ContenttypesConfig'
@@ -10,7 +10,7 @@ from django.contrib import admin
 
 from reversion_compare.admin import CompareVersionAdmin
 
-from content.models import ImageContent, Latex
+from content.models import ImageContent, Latex, LatexCompileReport
 from content.models import PDFContent, TextField
 from content.models import YTVideoContent
 
@@ -35,6 +35,18 @@ class LatexAdmin(CompareVersionAdmin):  # pylint: disable=too-many-ancestors
     fields = ['content', 'textfield', 'source']
 
 
+@admin.register(LatexCompileReport)
+class LatexCompileReportAdmin(admin.ModelAdmin):
+    """LaTeX compile report admin
+
+    Represents the LaTeX compile report model in the admin panel.
+
+    :attr LatexCompileReportAdmin.list_display: The fields shown in the list of the reports
+    :type LatexCompileReportAdmin.list_display: list[str]
+    """
+    list_display = ['latex', 'duration', 'pages', 'creation_date']
+
+
 @admin.register(PDFContent)
 class PDFContentAdmin(CompareVersionAdmin):  # pylint: disable=too-many-ancestors
     """PDF content admin
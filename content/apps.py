@@ -15,3 +15,12 @@ class ContenttypesConfig(AppConfig):
     :type ContenttypesConfig.name: str
     """
     name = 'content'
+
+    def ready(self):
+        """Ready
+
+        Registers the signal receivers which count the references to the blobs and which
+        process the PDFs.
+        """
+        # pylint: disable=import-outside-toplevel, unused-import
+        import content.signals
@@ -7,6 +7,7 @@ from django import forms
 
 from base.models import Content
 from content.attachment.models import ImageAttachment, IMAGE_ATTACHMENT_TYPES
+from content.models import ChunkedUpload
 from content.widgets import ModifiedClearableFileInput
 
 
@@ -51,6 +52,7 @@ ImageAttachmentFormSet = forms.modelformset_factory(
     extra=0,
     widgets={
         'source': forms.Textarea(attrs={'style': 'height: 100px', 'required': 'true'}),
-        'image': ModifiedClearableFileInput(attrs={'required': 'true'})
+        'image': ModifiedClearableFileInput(attrs={'required': 'true',
+                                                   'data-chunked-upload': ChunkedUpload.IMAGE})
     }
 )
@@ -10,6 +10,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from base.models import Content
+from base.storage import blob_storage
 
 from content.models import TextField, Latex
 
@@ -39,7 +40,8 @@ class ImageAttachment(models.Model):
                                 related_name='ImageAttachments',
                                 on_delete=models.CASCADE)
     image = models.ImageField(verbose_name=_("Image"),
-                              upload_to='uploads/contents/%Y/%m/%d/')
+                              upload_to='uploads/contents/%Y/%m/%d/',
+                              storage=blob_storage)
     source = models.TextField(verbose_name=_("Source"))
     license = models.CharField(verbose_name=_("License"),
                                blank=True,
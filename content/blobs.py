@@ -0,0 +1,66 @@
+"""Purpose of this file
+
+This file contains the reference counting of the blobs of the content addressed storage.
+"""
+
+from collections import Counter
+
+from django.db.models import Count
+
+from base.models import Content, MediaBlob
+
+from content.attachment.models import ImageAttachment
+from content.models import ImageContent, Latex, PDFContent
+
+# dict[type, tuple[str]]: The file fields of the models which refer to blobs
+BLOB_FIELDS = {
+    Content: ('preview',),
+    ImageContent: ('image',),
+    Latex: ('pdf',),
+    PDFContent: ('pdf',),
+    ImageAttachment: ('image',),
+}
+
+
+def get_blob_names(instance):
+    """Blob names
+
+    Returns the names of the files to which the file fields of the object refer.
+
+    :param instance: The object
+    :type instance: Model
+
+    :return: the names of the files
+    :rtype: set[str]
+    """
+    names = {getattr(instance, field).name for field in BLOB_FIELDS.get(type(instance), ())}
+    return names - {'', None}
+
+
+def count_references(names=None):
+    """Count references
+
+    Counts the references to the blobs again, e.g. after objects were saved in bulk without
+    sending the signals which count the references.
+
+    :param names: The names of the blobs to count, defaults to all blobs
+    :type names: Iterable[str] or None
+    """
+    blobs = MediaBlob.objects.all()
+    if names is not None:
+        names = set(names)
+        blobs = blobs.filter(name__in=names)
+
+    references = Counter()
+    for model, fields in BLOB_FIELDS.items():
+        for field in fields:
+            queryset = model.objects.all()
+            if names is not None:
+                queryset = queryset.filter(**{f'{field}__in': names})
+            for name, count in queryset.order_by().values_list(field) \
+                    .annotate(count=Count('pk')):
+                references[name] += count
+
+    for blob in blobs.iterator():
+        if blob.references != references[blob.name]:
+            MediaBlob.objects.filter(pk=blob.pk).update(references=references[blob.name])
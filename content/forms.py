@@ -4,8 +4,10 @@ This file contains forms associated with the content types.
 """
 
 from django import forms
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
 
-from content.models import YTVideoContent, ImageContent, PDFContent
+from content.models import ChunkedUpload, YTVideoContent, ImageContent, PDFContent
 from content.models import TextField, Latex
 from content.widgets import ModifiedClearableFileInput
 
@@ -87,7 +89,8 @@ class AddContentFormImage(forms.ModelForm):
         fields = ['image', 'source', 'license']
         widgets = {
             'source': forms.Textarea(attrs={'style': 'height: 100px'}),
-            'image': ModifiedClearableFileInput(attrs={'required': 'true'})
+            'image': ModifiedClearableFileInput(attrs={'required': 'true',
+                                                       'data-chunked-upload': ChunkedUpload.IMAGE})
         }
 
 
@@ -114,7 +117,8 @@ class AddContentFormPdf(forms.ModelForm):
         widgets = {
             'source': forms.Textarea(attrs={'style': 'height: 100px'}),
             'pdf': ModifiedClearableFileInput(attrs={'accept': 'application/pdf',
-                                                     'required': 'true'}),
+                                                     'required': 'true',
+                                                     'data-chunked-upload': ChunkedUpload.PDF}),
         }
 
 
@@ -179,6 +183,42 @@ class AddLatex(forms.ModelForm):
         }
 
 
+class ChunkedUploadForm(forms.ModelForm):
+    """Chunked upload form
+
+    This model represents the form which starts a chunked upload.
+    """
+
+    class Meta:
+        """Meta options
+
+        This class handles all possible meta options that you can give to this model.
+
+        :attr Meta.model: The model to which this form corresponds
+        :type Meta.model: Model
+        :attr Meta.fields: Including fields into the form
+        :type Meta.fields: str or list[str]
+        """
+        model = ChunkedUpload
+        fields = ['kind', 'filename', 'size']
+
+    def clean_size(self):
+        """Clean size
+
+        Validates that the file is not empty and does not exceed the maximum size of the
+        uploads.
+
+        :return: the size of the file
+        :rtype: int
+        """
+        size = self.cleaned_data['size']
+        if size == 0:
+            raise forms.ValidationError(_("The file is empty."))
+        if size > settings.CHUNKED_UPLOAD['MAX_SIZE']:
+            raise forms.ValidationError(_("The file is too large."))
+        return size
+
+
 # dict[str, ModelForm]: Contains all available content types form.
 CONTENT_TYPE_FORMS = {
     YTVideoContent.TYPE: AddContentFormYoutubeVideo,
@@ -0,0 +1,52 @@
+"""Purpose of this file
+
+This file contains the command which renders the contents waiting to be rendered.
+"""
+
+from django.core.management.base import BaseCommand
+
+from base.models import Content
+
+from content.rendering import render_content
+
+
+class Command(BaseCommand):
+    """Render contents command
+
+    Renders the PDF and the preview of the contents whose rendering is pending, e.g. because
+    the server was restarted before the queued rendering was done. The PDFs are compiled
+    with the authors of the contents.
+    """
+    help = "Renders the contents whose rendering is pending."
+
+    def add_arguments(self, parser):
+        """Add arguments
+
+        Adds the option to render the failed contents again.
+
+        :param parser: The parser of the arguments
+        :type parser: CommandParser
+        """
+        parser.add_argument('--failed', action='store_true',
+                            help="Also render the contents whose rendering failed.")
+
+    def handle(self, *args, **options):
+        """Handle
+
+        Renders the contents one after another.
+
+        :param args: The arguments
+        :type args: Any
+        :param options: The options of the command
+        :type options: dict[str, Any]
+        """
+        statuses = [Content.RENDER_PENDING]
+        if options['failed']:
+            statuses.append(Content.RENDER_FAILED)
+        content_ids = list(Content.objects.filter(render_status__in=statuses)
+                           .order_by('pk').values_list('pk', flat=True))
+        for content_id in content_ids:
+            render_content(content_id)
+        failed = Content.objects.filter(pk__in=content_ids,
+                                        render_status=Content.RENDER_FAILED).count()
+        self.stdout.write(f"Rendered {len(content_ids) - failed} contents, {failed} failed.")
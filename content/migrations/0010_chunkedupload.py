@@ -0,0 +1,32 @@
+# Generated by Django 3.0.7 on 2026-10-19 15:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0021_content_render_status'),
+        ('content', '0009_imageattachment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkedUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('pdf', 'PDF'), ('image', 'Image')], max_length=10, verbose_name='Kind')),
+                ('filename', models.CharField(max_length=255, verbose_name='Filename')),
+                ('size', models.PositiveIntegerField(verbose_name='Size')),
+                ('creation_date', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Creation Date')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunked_uploads', to='base.Profile', verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Chunked Upload',
+                'verbose_name_plural': 'Chunked Uploads',
+            },
+        ),
+    ]
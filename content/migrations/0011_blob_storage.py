@@ -0,0 +1,35 @@
+# Generated by Django 3.0.7 on 2026-10-19 02:10
+
+import base.storage
+import content.validator
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0010_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='imageattachment',
+            name='image',
+            field=models.ImageField(storage=base.storage.ContentAddressedStorage(), upload_to='uploads/contents/%Y/%m/%d/', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='imagecontent',
+            name='image',
+            field=models.ImageField(storage=base.storage.ContentAddressedStorage(), upload_to='uploads/contents/%Y/%m/%d/', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='latex',
+            name='pdf',
+            field=models.FileField(blank=True, storage=base.storage.ContentAddressedStorage(), upload_to='uploads/contents/%Y/%m/%d/', validators=[content.validator.Validator.validate_pdf], verbose_name='PDF'),
+        ),
+        migrations.AlterField(
+            model_name='pdfcontent',
+            name='pdf',
+            field=models.FileField(blank=True, storage=base.storage.ContentAddressedStorage(), upload_to='uploads/contents/%Y/%m/%d/', validators=[content.validator.Validator.validate_pdf], verbose_name='PDF'),
+        ),
+    ]
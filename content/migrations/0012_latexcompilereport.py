@@ -0,0 +1,29 @@
+# Generated by Django 3.0.7 on 2026-10-19 02:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0011_blob_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatexCompileReport',
+            fields=[
+                ('latex', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='compile_report', serialize=False, to='content.Latex', verbose_name='Latex Content')),
+                ('duration', models.FloatField(verbose_name='Duration')),
+                ('pages', models.PositiveIntegerField(default=0, verbose_name='Pages')),
+                ('data', models.TextField(verbose_name='Data')),
+                ('log', models.TextField(blank=True, verbose_name='Log')),
+                ('creation_date', models.DateTimeField(auto_now=True, verbose_name='Creation date')),
+            ],
+            options={
+                'verbose_name': 'Latex Compile Report',
+                'verbose_name_plural': 'Latex Compile Reports',
+            },
+        ),
+    ]
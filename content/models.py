@@ -5,17 +5,24 @@ that extends the models.Model class represents a content type and can be
 registered in admin.py.
 """
 
+import json
 import os
+import uuid
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 import reversion
 
 from pdf2image import convert_from_path
 
-from base.models import Content
+from base.metrics import time_program
+from base.models import Content, MediaBlob, Profile
+from base.storage import PAGES_MANIFEST, PREVIEW_FOLDER, blob_storage, get_linearized_name, \
+    get_pages_folder, get_preview_name
 
 from content.mixin import GeneratePreviewMixin
 from content.validator import Validator
@@ -56,6 +63,7 @@ class BasePDFModel(models.Model):
     """
     pdf = models.FileField(verbose_name=_("PDF"),
                            upload_to='uploads/contents/%Y/%m/%d/',
+                           storage=blob_storage,
                            blank=True,
                            validators=(Validator.validate_pdf,))
 
@@ -73,21 +81,80 @@ class BasePDFModel(models.Model):
         """Generate preview
 
         Generates a preview of this model, more precisely the PDF is generated as a preview.
+        The preview of a PDF which is stored as blob is shared by all identical PDFs, so it
+        is only generated once.
 
         :return: the string which represents the concatenated path components.
         :rtype: str
         """
-        # Path of the preview folder
-        preview_folder = 'uploads/previews/'
+        preview_name = get_preview_name(self.pdf.name)
+        shared = preview_name is not None
+        if not shared:
+            base_filename = os.path.splitext(os.path.basename(self.pdf.name))[0] + '.jpg'
+            preview_name = os.path.join(PREVIEW_FOLDER, base_filename)
+        elif blob_storage.exists(preview_name):
+            os.utime(blob_storage.path(preview_name))
+            return preview_name
         # Checks if Folder exists
-        if not os.path.exists(os.path.join(settings.MEDIA_ROOT, preview_folder)):
-            os.makedirs(os.path.join(settings.MEDIA_ROOT, preview_folder))
-        base_filename = os.path.splitext(os.path.basename(self.pdf.name))[0] + '.jpg'
+        if not os.path.exists(os.path.join(settings.MEDIA_ROOT, PREVIEW_FOLDER)):
+            os.makedirs(os.path.join(settings.MEDIA_ROOT, PREVIEW_FOLDER))
         # Get images for every page
-        pages = convert_from_path(self.pdf.path, last_page=2)
-        # Save first page to disk
-        pages[0].save(os.path.join(settings.MEDIA_ROOT, preview_folder, base_filename))
-        return os.path.join(preview_folder, base_filename)
+        with time_program('pdftoppm'):
+            pages = convert_from_path(self.pdf.path, last_page=2)
+        # Save first page to disk, the file is replaced at once because it may be shared
+        path = os.path.join(settings.MEDIA_ROOT, preview_name)
+        pages[0].save(path + '.tmp', format='JPEG')
+        os.replace(path + '.tmp', path)
+        if shared:
+            MediaBlob.objects.get_or_create(name=preview_name,
+                                            defaults={'size': os.path.getsize(path)})
+        return preview_name
+
+    @property
+    def pdf_url(self):
+        """PDF url
+
+        Returns the url of the PDF which is embedded into the pages. The linearized copy of
+        the PDF is preferred once it was created, so that viewers can show the first page
+        before the whole file is loaded.
+
+        :return: the url of the PDF or an empty string if there is no PDF yet
+        :rtype: str
+        """
+        if not self.pdf:
+            return ''
+        linearized_name = get_linearized_name(self.pdf.name)
+        if linearized_name is not None and blob_storage.exists(linearized_name):
+            return blob_storage.url(linearized_name)
+        return self.pdf.url
+
+    @cached_property
+    def pages(self):
+        """Pages
+
+        Returns the rendered images of the pages of the PDF. Every page is described by its
+        number, the urls of its images by width and the height of the largest image.
+
+        :return: the pages or an empty list if the pages were not rendered yet
+        :rtype: list[dict[str, Any]]
+        """
+        folder = get_pages_folder(self.pdf.name)
+        if folder is None:
+            return []
+        try:
+            with blob_storage.open(folder + PAGES_MANIFEST, 'r') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return []
+
+        widths = manifest['widths']
+        pages = []
+        for number, height in enumerate(manifest['heights'], start=1):
+            urls = {width: blob_storage.url(f"{folder}{number}-{width}{manifest['extension']}")
+                    for width in widths}
+            pages.append({'number': number, 'urls': urls, 'url': urls[min(widths)],
+                          'width': max(widths), 'height': height})
+        return pages
 
 
 class BaseSourceModel(models.Model):
@@ -132,7 +199,8 @@ class ImageContent(BaseContentModel, BaseSourceModel):
     DESC = _("Single Image")
 
     image = models.ImageField(verbose_name=_("Image"),
-                              upload_to='uploads/contents/%Y/%m/%d/')
+                              upload_to='uploads/contents/%Y/%m/%d/',
+                              storage=blob_storage)
 
     class Meta:
         """Meta options
@@ -202,6 +270,109 @@ class Latex(BaseContentModel, BasePDFModel):
         return f"{self.content}: {self.pk}"
 
 
+class LatexCompileReport(models.Model):
+    """LaTeX compile report
+
+    This model represents the report of the last compilation of a LaTeX content, so that
+    the author sees what failed without compiling the content again. The lines of the errors
+    and the warnings refer to the LaTeX code of the content.
+
+    :attr LatexCompileReport.latex: The compiled LaTeX content
+    :type LatexCompileReport.latex: OneToOneField - Latex
+    :attr LatexCompileReport.duration: The duration of the compilation in seconds
+    :type LatexCompileReport.duration: FloatField
+    :attr LatexCompileReport.pages: The number of pages of the compiled PDF
+    :type LatexCompileReport.pages: PositiveIntegerField
+    :attr LatexCompileReport.data: The json document of the errors and the warnings
+    :type LatexCompileReport.data: TextField
+    :attr LatexCompileReport.log: The excerpt of the log around the first error
+    :type LatexCompileReport.log: TextField
+    :attr LatexCompileReport.creation_date: The date on which the content was compiled
+    :type LatexCompileReport.creation_date: DateTimeField
+    """
+    latex = models.OneToOneField(Latex, verbose_name=_("Latex Content"),
+                                 related_name='compile_report',
+                                 on_delete=models.CASCADE,
+                                 primary_key=True)
+    duration = models.FloatField(verbose_name=_("Duration"))
+    pages = models.PositiveIntegerField(verbose_name=_("Pages"), default=0)
+    data = models.TextField(verbose_name=_("Data"))
+    log = models.TextField(verbose_name=_("Log"), blank=True)
+    creation_date = models.DateTimeField(verbose_name=_("Creation date"), auto_now=True)
+
+    class Meta:
+        """Meta options
+
+        This class handles all possible meta options that you can give to this model.
+
+        :attr Meta.verbose_name: A human-readable name for the object in singular
+        :type Meta.verbose_name: __proxy__
+        :attr Meta.verbose_name_plural: A human-readable name for the object in plural
+        :type Meta.verbose_name_plural: __proxy__
+        """
+        verbose_name = _("Latex Compile Report")
+        verbose_name_plural = _("Latex Compile Reports")
+
+    @classmethod
+    def store(cls, latex, diagnostics):
+        """Store
+
+        Replaces the report of the LaTeX content by the diagnostics of its compilation. The
+        errors and the warnings of other contents are dropped.
+
+        :param latex: The compiled LaTeX content
+        :type latex: Latex
+        :param diagnostics: The diagnostics of the compilation
+        :type diagnostics: dict[str, Any]
+
+        :return: the stored report
+        :rtype: LatexCompileReport
+        """
+        data = {kind: [message for message in diagnostics[kind]
+                       if message['content'] in (latex.pk, None)]
+                for kind in ('errors', 'warnings')}
+        return cls.objects.update_or_create(latex=latex, defaults={
+            'duration': diagnostics['duration'],
+            'pages': diagnostics['pages'],
+            'data': json.dumps(data),
+            'log': diagnostics['log'],
+        })[0]
+
+    @cached_property
+    def errors(self):
+        """Errors
+
+        Returns the errors of the compilation with their lines in the LaTeX code.
+
+        :return: the errors with their message and their line or None if the error is not in
+        the LaTeX code of the content
+        :rtype: list[dict[str, Any]]
+        """
+        return json.loads(self.data)['errors']
+
+    @cached_property
+    def warnings(self):
+        """Warnings
+
+        Returns the warnings of the compilation with their lines in the LaTeX code.
+
+        :return: the warnings with their message and their line or None if the warning is not
+        in the LaTeX code of the content
+        :rtype: list[dict[str, Any]]
+        """
+        return json.loads(self.data)['warnings']
+
+    def __str__(self):
+        """String representation
+
+        Returns the string representation of this object.
+
+        :return: the string representation of this object
+        :rtype: str
+        """
+        return f"{self.latex} ({self.creation_date})"
+
+
 class PDFContent(BaseContentModel, BasePDFModel, BaseSourceModel):
     """PDF content
 
@@ -340,6 +511,128 @@ class YTVideoContent(BaseContentModel):
         return f"{self.url}"
 
 
+class ChunkedUpload(models.Model):
+    """Chunked upload
+
+    This model represents a large file which is uploaded in chunks. The received chunks are
+    appended to a file in the directory of the upload settings, so that an interrupted
+    upload can be resumed at the size of this file.
+
+    :attr ChunkedUpload.PDF: Describes the kind of a PDF upload
+    :type ChunkedUpload.PDF: str
+    :attr ChunkedUpload.IMAGE: Describes the kind of an image upload
+    :type ChunkedUpload.IMAGE: str
+    :attr ChunkedUpload.KIND_CHOICES: The choices of the kinds of the uploads
+    :type ChunkedUpload.KIND_CHOICES: list[tuple[str, __proxy__]]
+    :attr ChunkedUpload.id: The random id of the upload
+    :type ChunkedUpload.id: UUIDField
+    :attr ChunkedUpload.user: The user who uploads the file
+    :type ChunkedUpload.user: ForeignKey - Profile
+    :attr ChunkedUpload.kind: Describes if a PDF or an image is uploaded
+    :type ChunkedUpload.kind: CharField
+    :attr ChunkedUpload.filename: The name of the uploaded file
+    :type ChunkedUpload.filename: CharField
+    :attr ChunkedUpload.size: The size of the complete file in bytes
+    :type ChunkedUpload.size: PositiveIntegerField
+    :attr ChunkedUpload.creation_date: Describes when the upload was started
+    :type ChunkedUpload.creation_date: DateTimeField
+    """
+    PDF = 'pdf'
+    IMAGE = 'image'
+    KIND_CHOICES = [
+        (PDF, _("PDF")),
+        (IMAGE, _("Image")),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(Profile, verbose_name=_("User"),
+                             related_name='chunked_uploads',
+                             on_delete=models.CASCADE)
+    kind = models.CharField(verbose_name=_("Kind"), max_length=10, choices=KIND_CHOICES)
+    filename = models.CharField(verbose_name=_("Filename"), max_length=255)
+    size = models.PositiveIntegerField(verbose_name=_("Size"))
+    creation_date = models.DateTimeField(verbose_name=_('Creation Date'),
+                                         default=timezone.now)
+
+    class Meta:
+        """Meta options
+
+        This class handles all possible meta options that you can give to this model.
+
+        :attr Meta.verbose_name: A human-readable name for the object in singular
+        :type Meta.verbose_name: __proxy__
+        :attr Meta.verbose_name_plural: A human-readable name for the object in plural
+        :type Meta.verbose_name_plural: __proxy__
+        """
+        verbose_name = _("Chunked Upload")
+        verbose_name_plural = _("Chunked Uploads")
+
+    def __str__(self):
+        """String representation
+
+        Returns the string representation of this object.
+
+        :return: the string representation of this object
+        :rtype: str
+        """
+        return f"{self.filename}: {self.offset}/{self.size}"
+
+    @property
+    def path(self):
+        """Path
+
+        Returns the path of the file to which the chunks are appended.
+
+        :return: the path of the file
+        :rtype: str
+        """
+        return os.path.join(settings.CHUNKED_UPLOAD['ROOT'], f"{self.pk}.part")
+
+    @property
+    def offset(self):
+        """Offset
+
+        Returns the number of bytes which were received so far.
+
+        :return: the offset of the next chunk
+        :rtype: int
+        """
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    @property
+    def complete(self):
+        """Complete
+
+        Returns if all bytes of the file were received.
+
+        :return: true iff the upload is complete
+        :rtype: bool
+        """
+        return self.offset == self.size
+
+    def delete(self, *args, **kwargs):  # pylint: disable=signature-differs
+        """Delete
+
+        Deletes the upload together with its received chunks.
+
+        :param args: The arguments
+        :type args: Any
+        :param kwargs: The keyword arguments
+        :type kwargs: dict[str, Any]
+
+        :return: the number of deleted objects
+        :rtype: tuple[int, dict[str, int]]
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        return super().delete(*args, **kwargs)
+
+
 # dict: Contains all available content types.
 CONTENT_TYPES = {
     YTVideoContent.TYPE: YTVideoContent,
@@ -349,6 +642,10 @@ CONTENT_TYPES = {
     Latex.TYPE: Latex,
 }
 
+# list: Names of the relations from a content to its type specific content
+CONTENT_TYPE_RELATIONS = [model._meta.model_name  # pylint: disable=protected-access
+                          for model in CONTENT_TYPES.values()]
+
 # Register models for reversion if it is not already done in admin,
 # else we can specify configuration
 reversion.register(ImageContent,
@@ -0,0 +1,266 @@
+"""Purpose of this file
+
+This file contains the rendering of the PDF and the preview of contents in the background.
+Compiling LaTeX and converting PDF pages takes seconds, so it is done after the changes of
+a content were committed and without holding the write lock of the database. The PDFs are
+processed in the background as well: they are linearized, so that viewers can show their
+first page early, and their pages are rendered to images for small screens.
+"""
+
+import json
+import logging
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connections, transaction
+
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from PIL import features
+
+from base.metrics import time_program
+from base.models import Content, MediaBlob, Profile
+from base.storage import PAGES_MANIFEST, blob_storage, get_linearized_name, get_pages_folder
+
+from content.models import BasePDFModel, CONTENT_TYPES, Latex
+
+from export.views import generate_pdf_response
+
+LOGGER = logging.getLogger(__name__)
+
+# ThreadPoolExecutor: A single worker, so that only one content is rendered at a time
+EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='content-rendering')
+
+# list[str]: The command which linearizes a PDF, followed by the input and the output file
+LINEARIZE_COMMAND = ['qpdf', '--linearize']
+
+# tuple[int]: The exit codes of qpdf with which the output file was written, 3 means warnings
+LINEARIZE_SUCCESS_CODES = (0, 3)
+
+# tuple[int]: The widths of the rendered page images, for small screens and for zooming
+PAGE_WIDTHS = (480, 1200)
+
+# tuple[str, str]: The format of the page images and their extension, WebP is compact but
+# it is only available if Pillow was built with it
+PAGE_FORMAT = ('WEBP', '.webp') if features.check('webp') else ('JPEG', '.jpg')
+
+
+def needs_rendering(content):
+    """Needs rendering
+
+    Returns if the content has a PDF from which its preview is rendered.
+
+    :param content: The content
+    :type content: Content
+
+    :return: true iff the content needs to be rendered
+    :rtype: bool
+    """
+    return issubclass(CONTENT_TYPES[content.type], BasePDFModel)
+
+
+def render_content(content_id, profile_id=None):
+    """Render content
+
+    Compiles the PDF of a LaTeX content and generates the preview of a content with a PDF.
+    The content is marked as rendered afterwards or as failed if the rendering failed.
+
+    :param content_id: The id of the content
+    :type content_id: int
+    :param profile_id: The id of the profile whose name is used as author of the compiled
+    PDF, defaults to the author of the content
+    :type profile_id: int or None
+    """
+    content = Content.objects.select_related('topic', 'author').get(pk=content_id)
+    type_content = CONTENT_TYPES[content.type].objects.get(pk=content_id)
+    try:
+        if isinstance(type_content, Latex):
+            profile = content.author if profile_id is None \
+                else Profile.objects.get(pk=profile_id)
+            pdf = generate_pdf_response(profile, content)
+            type_content.pdf.save(f"{content.topic}.pdf", ContentFile(pdf), save=False)
+        preview = type_content.generate_preview()
+    except Exception:  # pylint: disable=broad-except
+        LOGGER.exception("Rendering of the content %s failed", content_id)
+        content.render_status = Content.RENDER_FAILED
+        content.save(update_fields=['render_status', 'last_modified'])
+        return
+
+    with transaction.atomic():
+        if isinstance(type_content, Latex):
+            type_content.save(update_fields=['pdf'])
+        content.preview = preview
+        content.render_status = Content.RENDERED
+        content.save(update_fields=['preview', 'render_status', 'last_modified'])
+
+
+def render_content_in_background(content_id, profile_id=None):
+    """Render content in background
+
+    Renders the content in the worker thread and closes the database connections of the
+    thread afterwards.
+
+    :param content_id: The id of the content
+    :type content_id: int
+    :param profile_id: The id of the profile whose name is used as author of the compiled
+    PDF
+    :type profile_id: int or None
+    """
+    close_old_connections()
+    try:
+        render_content(content_id, profile_id)
+    except Exception:  # pylint: disable=broad-except
+        LOGGER.exception("Rendering of the content %s failed", content_id)
+    finally:
+        connections.close_all()
+
+
+def queue_rendering(content_id, profile_id=None):
+    """Queue rendering
+
+    Renders the content in the background after the current transaction was committed. The
+    render status of the content must be set to pending by the caller, so that contents
+    whose rendering was lost, e.g. by a restart, can be rendered again by the command
+    rendercontents.
+
+    :param content_id: The id of the content
+    :type content_id: int
+    :param profile_id: The id of the profile whose name is used as author of the compiled
+    PDF
+    :type profile_id: int or None
+    """
+    transaction.on_commit(
+        lambda: EXECUTOR.submit(render_content_in_background, content_id, profile_id))
+
+
+def linearize_pdf(name):
+    """Linearize PDF
+
+    Writes the linearized copy of a PDF blob, whose first page can be shown before the rest
+    of the file is loaded. The original PDF is kept. The copy is shared by all objects with
+    the same PDF, so it is only written once.
+
+    :param name: The name of the PDF
+    :type name: str
+
+    :return: the name of the linearized copy or None if the PDF could not be linearized
+    :rtype: str or None
+    """
+    linearized_name = get_linearized_name(name)
+    if linearized_name is None or blob_storage.exists(linearized_name):
+        return linearized_name
+    path = blob_storage.path(linearized_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        with time_program('qpdf'):
+            result = subprocess.run(LINEARIZE_COMMAND + [blob_storage.path(name), path + '.tmp'],
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    check=False)
+    except FileNotFoundError:
+        LOGGER.warning("The PDF %s is not linearized because qpdf is not installed", name)
+        return None
+    if result.returncode not in LINEARIZE_SUCCESS_CODES:
+        LOGGER.error("Linearization of the PDF %s failed: %s", name, result.stderr)
+        return None
+    # The copy is replaced at once because it may already be requested
+    os.replace(path + '.tmp', path)
+    MediaBlob.objects.get_or_create(name=linearized_name,
+                                    defaults={'size': os.path.getsize(path)})
+    return linearized_name
+
+
+def render_pages(name):
+    """Render pages
+
+    Renders every page of a PDF blob to images of the page widths, so that the pages can
+    be loaded one by one while the user scrolls. The pages are converted one at a time to
+    keep the memory small. The manifest describing the pages is written last, so the
+    images are only shown once all pages were rendered.
+
+    :param name: The name of the PDF
+    :type name: str
+
+    :return: the number of rendered pages or None if the PDF is not a blob
+    :rtype: int or None
+    """
+    folder = get_pages_folder(name)
+    if folder is None:
+        return None
+    manifest_path = blob_storage.path(folder + PAGES_MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as file:
+            return len(json.load(file)['heights'])
+
+    path = blob_storage.path(name)
+    os.makedirs(blob_storage.path(folder), exist_ok=True)
+    image_format, extension = PAGE_FORMAT
+    large_width = max(PAGE_WIDTHS)
+    heights = []
+    with time_program('pdfinfo'):
+        page_count = pdfinfo_from_path(path)['Pages']
+    for number in range(1, page_count + 1):
+        with time_program('pdftoppm'):
+            page = convert_from_path(path, first_page=number, last_page=number,
+                                     size=(large_width, None))[0].convert('RGB')
+        for width in PAGE_WIDTHS:
+            height = round(page.height * width / page.width)
+            image = page if width == page.width else page.resize((width, height))
+            image.save(blob_storage.path(f"{folder}{number}-{width}{extension}"),
+                       format=image_format)
+        heights.append(round(page.height * large_width / page.width))
+
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump({'extension': extension, 'widths': list(PAGE_WIDTHS), 'heights': heights},
+                  file)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return len(heights)
+
+
+def process_pdf(name):
+    """Process PDF
+
+    Linearizes a PDF blob and renders its pages. A failed step does not prevent the other.
+
+    :param name: The name of the PDF
+    :type name: str
+    """
+    for step in (linearize_pdf, render_pages):
+        try:
+            step(name)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Processing of the PDF %s failed", name)
+
+
+def process_pdf_in_background(name):
+    """Process PDF in background
+
+    Processes the PDF in the worker thread and closes the database connections of the
+    thread afterwards.
+
+    :param name: The name of the PDF
+    :type name: str
+    """
+    close_old_connections()
+    try:
+        process_pdf(name)
+    finally:
+        connections.close_all()
+
+
+def queue_pdf_processing(name):
+    """Queue PDF processing
+
+    Linearizes the PDF and renders its pages in the background after the current
+    transaction was committed, unless this was already done for an identical PDF.
+
+    :param name: The name of the PDF
+    :type name: str
+    """
+    linearized_name = get_linearized_name(name)
+    if linearized_name is None:
+        return
+    if not blob_storage.exists(linearized_name) \
+            or not blob_storage.exists(get_pages_folder(name) + PAGES_MANIFEST):
+        transaction.on_commit(lambda: EXECUTOR.submit(process_pdf_in_background, name))
@@ -0,0 +1,105 @@
+"""Purpose of this file
+
+This file contains the signal receivers which count the references to the blobs of the
+content addressed storage and which process saved PDFs.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from base.models import Content, MediaBlob
+
+from content.attachment.models import ImageAttachment
+from content.blobs import BLOB_FIELDS, get_blob_names
+from content.models import ImageContent, Latex, PDFContent
+from content.rendering import queue_pdf_processing
+
+
+@receiver(pre_save, sender=Content)
+@receiver(pre_save, sender=ImageContent)
+@receiver(pre_save, sender=Latex)
+@receiver(pre_save, sender=PDFContent)
+@receiver(pre_save, sender=ImageAttachment)
+def blobs_replaced(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Blobs replaced
+
+    Remembers the files to which an object which will be saved referred before, in case
+    its files are replaced.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The object that will be saved
+    :type instance: Model
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    names = set()
+    if instance.pk is not None:
+        values = sender.objects.filter(pk=instance.pk) \
+            .values_list(*BLOB_FIELDS[sender]).first()
+        names.update(values or ())
+    instance._previous_blob_names = names - {'', None}  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=Content)
+@receiver(post_save, sender=ImageContent)
+@receiver(post_save, sender=Latex)
+@receiver(post_save, sender=PDFContent)
+@receiver(post_save, sender=ImageAttachment)
+def blobs_saved(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Blobs saved
+
+    Counts the references to the files of an object which was saved.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved object
+    :type instance: Model
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    names = get_blob_names(instance)
+    previous_names = getattr(instance, '_previous_blob_names', set())
+    MediaBlob.add_references(names - previous_names)
+    MediaBlob.remove_references(previous_names - names)
+    instance._previous_blob_names = names  # pylint: disable=protected-access
+
+
+@receiver(post_delete, sender=Content)
+@receiver(post_delete, sender=ImageContent)
+@receiver(post_delete, sender=Latex)
+@receiver(post_delete, sender=PDFContent)
+@receiver(post_delete, sender=ImageAttachment)
+def blobs_deleted(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Blobs deleted
+
+    Removes the references to the files of an object which was deleted. The blobs are kept
+    on disk because older versions of the object may still refer to them.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The deleted object
+    :type instance: Model
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    MediaBlob.remove_references(get_blob_names(instance))
+
+
+@receiver(post_save, sender=Latex)
+@receiver(post_save, sender=PDFContent)
+def pdf_saved(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """PDF saved
+
+    Linearizes the uploaded or compiled PDF of an object which was saved and renders its
+    pages in the background.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved object
+    :type instance: Latex or PDFContent
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    if instance.pdf:
+        queue_pdf_processing(instance.pdf.name)
@@ -0,0 +1,155 @@
+"""Purpose of this file
+
+This file contains the assembly of chunked uploads. Large PDFs and images are uploaded in
+chunks, so that a request only holds a worker for a small part of the file and an
+interrupted upload can be resumed. The assembled file is attached to the content forms by
+the id of its upload.
+"""
+
+import os
+import re
+from contextlib import ExitStack, contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import UploadedFile
+from django.utils import timezone
+
+from content.models import ChunkedUpload
+from content.validator import Validator
+
+# str: Suffix of the form fields containing the id of the upload of a file field
+UPLOAD_ID_SUFFIX = '_upload_id'
+
+# Pattern: The value of the Content-Range header of a chunk
+CONTENT_RANGE_PATTERN = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+# dict[str, Callable]: The validators of the first chunk of the kinds of uploads
+FIRST_CHUNK_VALIDATORS = {
+    ChunkedUpload.PDF: Validator.validate_pdf,
+    ChunkedUpload.IMAGE: Validator.validate_image,
+}
+
+
+class AssembledUploadedFile(UploadedFile):
+    """Assembled uploaded file
+
+    Represents the file of a complete chunked upload. The file is moved instead of copied
+    when it is saved into the media, like the temporary files of large uploads.
+
+    :attr AssembledUploadedFile.upload: The upload of the file
+    :type AssembledUploadedFile.upload: ChunkedUpload
+    """
+
+    def __init__(self, file, upload):
+        """Initializer
+
+        Wraps the opened file of the upload.
+
+        :param file: The opened file of the upload
+        :type file: BufferedReader
+        :param upload: The complete upload
+        :type upload: ChunkedUpload
+        """
+        super().__init__(file, upload.filename, None, upload.size)
+        self.upload = upload
+
+    def temporary_file_path(self):
+        """Temporary file path
+
+        Returns the path of the assembled file.
+
+        :return: the path of the file
+        :rtype: str
+        """
+        return self.upload.path
+
+
+def parse_content_range(header, upload):
+    """Parse content range
+
+    Returns the start and the end of the chunk described by the Content-Range header.
+
+    :param header: The value of the Content-Range header
+    :type header: str
+    :param upload: The upload to which the chunk belongs
+    :type upload: ChunkedUpload
+
+    :return: the start and the exclusive end of the chunk
+    :rtype: tuple[int, int]
+    """
+    match = CONTENT_RANGE_PATTERN.match(header or '')
+    if match is None:
+        raise ValidationError('Invalid content range.')
+    start, last, total = (int(group) for group in match.groups())
+    if total != upload.size or last < start or last >= total:
+        raise ValidationError('Invalid content range.')
+    if last - start + 1 > settings.CHUNKED_UPLOAD['CHUNK_SIZE']:
+        raise ValidationError('Chunk too large.')
+    return start, last + 1
+
+
+def append_chunk(upload, start, data):
+    """Append chunk
+
+    Appends the chunk to the file of the upload. The type of the file is validated with the
+    first chunk, so that other files are rejected before they are uploaded completely.
+
+    :param upload: The upload to which the chunk belongs
+    :type upload: ChunkedUpload
+    :param start: The position of the chunk in the file
+    :type start: int
+    :param data: The data of the chunk
+    :type data: bytes
+    """
+    if start + len(data) > upload.size:
+        raise ValidationError('Chunk exceeds the size of the file.')
+    if start == 0:
+        FIRST_CHUNK_VALIDATORS[upload.kind](ContentFile(data, name=upload.filename))
+    os.makedirs(settings.CHUNKED_UPLOAD['ROOT'], exist_ok=True)
+    with open(upload.path, 'ab') as file:
+        file.write(data)
+
+
+@contextmanager
+def attach_uploads(request):
+    """Attach uploads
+
+    Yields the files of the request together with the files of the complete uploads of the
+    user whose ids are given in the fields with the suffix '_upload_id', e.g. 'pdf_upload_id'
+    for the field 'pdf'. Files which were sent directly take precedence. The files of the
+    uploads are closed when the block is left.
+
+    :param request: The given request
+    :type request: HttpRequest
+
+    :return: the files of the forms
+    :rtype: Iterator[MultiValueDict]
+    """
+    files = request.FILES.copy()
+    with ExitStack() as stack:
+        for key, upload_id in request.POST.items():
+            field = key[:-len(UPLOAD_ID_SUFFIX)]
+            if not key.endswith(UPLOAD_ID_SUFFIX) or not upload_id or field in files:
+                continue
+            try:
+                upload = ChunkedUpload.objects.get(pk=upload_id, user_id=request.user.pk)
+            except (ChunkedUpload.DoesNotExist, ValidationError):
+                continue
+            if upload.complete:
+                file = stack.enter_context(open(upload.path, 'rb'))
+                files[field] = AssembledUploadedFile(file, upload)
+        yield files
+
+
+def delete_expired_uploads():
+    """Delete expired uploads
+
+    Deletes the uploads which were started before the expiration period together with their
+    files. Used uploads are deleted as well, their files were already moved to the media.
+    """
+    limit = timezone.now() - timedelta(hours=settings.CHUNKED_UPLOAD['EXPIRATION_HOURS'])
+    for upload in ChunkedUpload.objects.filter(creation_date__lt=limit):
+        upload.delete()
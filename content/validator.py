@@ -36,6 +36,22 @@ class Validator:  # pylint: disable=too-few-public-methods)
         if ext.lower() not in valid_file_extensions:
             raise ValidationError('Unacceptable file extension.')
 
+    @staticmethod
+    def validate_image(file):
+        """Validate image
+
+        Validates if the type of the given file sniffed from its first bytes is an image.
+
+        :param file: The file that should be checked
+        :type file: file
+
+        :return: a validation error, if the file is not an image
+        :rtype: None or ValidationError
+        """
+        file_type = magic.from_buffer(file.read(1024), mime=True)
+        if not file_type.startswith('image/'):
+            raise ValidationError('Unsupported file type.')
+
     @staticmethod
     def validate_youtube_url(url):
         valid_url = re.match(r"^(http(s)?://)?(www\.|m\.)?youtu(\.?)be(\.com)?/.*", url)
@@ -6,14 +6,44 @@ This file contains utility functions related to exporting and rendering files.
 import os
 import re
 import tempfile
+import time
 
-from subprocess import Popen, PIPE
+from subprocess import DEVNULL, Popen, PIPE
 
 from django.template.loader import get_template
 
+from base.metrics import time_program
 from export.templatetags.cc_export_tags import export_template, tex_escape, ret_path
 
 
+# Pattern: The line of the input at which pdflatex stopped, e.g. "l.66 This is an \Error"
+ERROR_LINE_PATTERN = re.compile(r'^l\.(\d+)')
+
+# Pattern: The beginning of a warning, e.g. "LaTeX Warning:" or "Package hyperref Warning:"
+WARNING_PATTERN = re.compile(r'^(?:(?:La)?TeX|Package \S+|Class \S+) Warning: ')
+
+# Pattern: The prefix of the continued lines of a warning of a package, e.g. "(hyperref)"
+CONTINUATION_PATTERN = re.compile(r'^\(\S+\)\s+')
+
+# Pattern: The line of the input of a warning
+WARNING_LINE_PATTERN = re.compile(r'(?:on input line|at lines?) (\d+)')
+
+# Pattern: The beginning of a warning about a badly filled box
+BOX_PATTERN = re.compile(r'^(?:Over|Under)full \\[hv]box ')
+
+# Pattern: The number of pages of the written PDF
+PAGES_PATTERN = re.compile(r'Output written on .*\((\d+) pages?')
+
+# int: The length at which pdflatex wraps the lines of its log
+LOG_LINE_LENGTH = 79
+
+# int: The number of lines after an error in which the line of the input is searched
+ERROR_CONTEXT_LINES = 10
+
+# int: The number of lines of the log which are kept in a compile report
+LOG_EXCERPT_LINES = 20
+
+
 class Latex:
     """LaTeX Export
 
@@ -25,10 +55,13 @@ class Latex:
     :type Latex.error_prefix: str
     :attr Latex.error_template: he name of the error template if the compilation went wrong
     :type Latex.error_template: str
+    :attr Latex.source_name: The name of the compiled file, whose PDF is texput.pdf
+    :type Latex.source_name: str
     """
     encoding = 'utf-8'
     error_prefix = '!'
     error_template = 'error'
+    source_name = 'texput.tex'
 
     # TODO documentation parameters
     @staticmethod
@@ -52,22 +85,32 @@ class Latex:
         :param external_assets:
         :type external_assets:
 
-        :return: the rendered LaTeX code as PDF, PDF LaTeX output and its the rendered template
-        :rtype: tuple[bytes, tuple[bytes, bytes], str]
+        :return: the rendered LaTeX code as PDF, PDF LaTeX output, its the rendered template
+        and the diagnostics of the compilation of the contents
+        :rtype: tuple[bytes, tuple[bytes, bytes], str, dict[str, Any]]
         """
         template = get_template(template_name)
         rendered_tpl = template.render(context).encode(Latex.encoding)
+        sources = []
         # Prerender content templates
         for content in context['contents']:
-            rendered_tpl += Latex.pre_render(content, context['export_pdf'])
+            pre_rendered = Latex.pre_render(content, context['export_pdf'])
+            if content.type == 'Latex':
+                source = Latex.find_source(rendered_tpl, pre_rendered, content)
+                if source is not None:
+                    sources.append(source)
+            rendered_tpl += pre_rendered
         rendered_tpl += r"\end{document}".encode(Latex.encoding)
 
         with tempfile.TemporaryDirectory() as tempdir:
 
-            process = Popen(['pdflatex'], stdin=PIPE, stdout=PIPE, cwd=tempdir, )
-
+            start = time.perf_counter()
             # Output is a byte tuple of stdout and stderr
-            pdflatex_output = process.communicate(rendered_tpl)
+            pdflatex_output = Latex.compile(rendered_tpl, tempdir)
+
+            # The diagnostics are taken before the log is replaced by the error PDF
+            diagnostics = Latex.diagnose(pdflatex_output[0], sources)
+            diagnostics['duration'] = time.perf_counter() - start
 
             # Filter error messages in log (stdout)
             error_log = Latex.errors(pdflatex_output[0])
@@ -79,15 +122,164 @@ class Latex:
                                                  Latex.error_template, False)
                 rendered_tpl += r"\end{document}".encode(Latex.encoding)
 
-                process = Popen(['pdflatex'], stdin=PIPE, stdout=PIPE, cwd=tempdir, )
-                pdflatex_output = process.communicate(rendered_tpl)
+                pdflatex_output = Latex.compile(rendered_tpl, tempdir)
 
             try:
                 with open(os.path.join(tempdir, 'texput.pdf'), 'rb') as file:
                     pdf = file.read()
             except FileNotFoundError:
                 pdf = None
-        return pdf, pdflatex_output, rendered_tpl
+        return pdf, pdflatex_output, rendered_tpl, diagnostics
+
+    @staticmethod
+    def compile(rendered_tpl, tempdir):
+        """Compile
+
+        Compiles the document to texput.pdf in the given directory. The document is read from
+        a file, so that the log refers to its lines, and pdflatex does not stop at the first
+        error to wait for an input.
+
+        :param rendered_tpl: The rendered document
+        :type rendered_tpl: bytes
+        :param tempdir: The directory of the compilation
+        :type tempdir: str
+
+        :return: the output of pdflatex
+        :rtype: tuple[bytes, bytes]
+        """
+        with open(os.path.join(tempdir, Latex.source_name), 'wb') as file:
+            file.write(rendered_tpl)
+        with time_program('pdflatex'):
+            process = Popen(['pdflatex', '-interaction=nonstopmode', Latex.source_name],
+                            stdin=DEVNULL, stdout=PIPE, cwd=tempdir)
+            return process.communicate()
+
+    @staticmethod
+    def find_source(rendered_tpl, pre_rendered, content):
+        """Find source
+
+        Finds the LaTeX code of the content in the compiled document, so that the lines of the
+        log can be mapped back to the lines of the code.
+
+        :param rendered_tpl: The document before the content
+        :type rendered_tpl: bytes
+        :param pre_rendered: The rendered template of the content
+        :type pre_rendered: bytes
+        :param content: The LaTeX content
+        :type content: Content
+
+        :return: the id of the content, the first line of its code in the document and the
+        number of lines of its code or None if the code was changed while rendering, e.g. by
+        the paths of the image attachments
+        :rtype: tuple[int, int, int] or None
+        """
+        code = content.latex.textfield.encode(Latex.encoding)
+        index = pre_rendered.find(code)
+        if index == -1:
+            return None
+        first_line = rendered_tpl.count(b'\n') + pre_rendered.count(b'\n', 0, index) + 1
+        return content.pk, first_line, code.count(b'\n') + 1
+
+    @staticmethod
+    def map_line(sources, line):
+        """Map line
+
+        Maps a line of the compiled document to the line of the code of the content which
+        contains it.
+
+        :param sources: The contents with the first line and the number of lines of their code
+        :type sources: list[tuple[int, int, int]]
+        :param line: The line of the document
+        :type line: int
+
+        :return: the id of the content and the line of its code or None if the line is not
+        part of the code of a content, e.g. the line of the template
+        :rtype: tuple[int, int] or None
+        """
+        for content_id, first_line, line_count in sources:
+            if first_line <= line < first_line + line_count:
+                return content_id, line - first_line + 1
+        return None
+
+    @staticmethod
+    def diagnose(lob, sources=()):
+        """Diagnose
+
+        Collects the errors and the warnings of the given log with their lines in the code of
+        the contents, the number of pages of the PDF and an excerpt of the log around the
+        first error or the end of the log.
+
+        :param lob: A list of bytes representing the PDF LaTeX compile log
+        :type lob: bytes
+        :param sources: The contents with the first line and the number of lines of their code
+        :type sources: list[tuple[int, int, int]]
+
+        :return: the diagnostics with the keys errors, warnings, pages and log
+        :rtype: dict[str, Any]
+        """
+        lines = lob.decode(Latex.encoding, errors='ignore').splitlines()
+        errors = []
+        warnings = []
+        first_error = None
+        for index, line in enumerate(lines):
+            if line.startswith(Latex.error_prefix):
+                if first_error is None:
+                    first_error = index
+                line_number = None
+                for context in lines[index + 1:index + 1 + ERROR_CONTEXT_LINES]:
+                    match = ERROR_LINE_PATTERN.match(context)
+                    if match:
+                        line_number = int(match.group(1))
+                        break
+                errors.append(Latex.diagnostic(line, line_number, sources))
+            elif WARNING_PATTERN.match(line) or BOX_PATTERN.match(line):
+                # Warnings continue up to the next empty line, long lines are wrapped
+                message = line
+                previous = line
+                for context in lines[index + 1:index + 1 + ERROR_CONTEXT_LINES]:
+                    if not context.strip():
+                        break
+                    if len(previous) >= LOG_LINE_LENGTH:
+                        message += context
+                    else:
+                        message += ' ' + CONTINUATION_PATTERN.sub('', context).strip()
+                    previous = context
+                match = WARNING_LINE_PATTERN.search(message)
+                line_number = int(match.group(1)) if match else None
+                warnings.append(Latex.diagnostic(message, line_number, sources))
+
+        pages = PAGES_PATTERN.search(lob.decode(Latex.encoding, errors='ignore'))
+        if first_error is None:
+            excerpt = lines[-LOG_EXCERPT_LINES:]
+        else:
+            excerpt = lines[max(first_error - 2, 0):first_error - 2 + LOG_EXCERPT_LINES]
+        return {
+            'errors': errors,
+            'warnings': warnings,
+            'pages': int(pages.group(1)) if pages else 0,
+            'log': '\n'.join(excerpt),
+        }
+
+    @staticmethod
+    def diagnostic(message, line_number, sources):
+        """Diagnostic
+
+        Returns an error or a warning of the log with its line in the code of the content.
+
+        :param message: The message of the log
+        :type message: str
+        :param line_number: The line of the document or None if it is unknown
+        :type line_number: int or None
+        :param sources: The contents with the first line and the number of lines of their code
+        :type sources: list[tuple[int, int, int]]
+
+        :return: the message with the id of the content and the line of its code, which are
+        None if the message does not belong to the code of a content
+        :rtype: dict[str, Any]
+        """
+        source = None if line_number is None else Latex.map_line(sources, line_number)
+        content_id, line = source or (None, None)
+        return {'message': message, 'content': content_id, 'line': line}
 
     @staticmethod
     def errors(lob):
@@ -104,18 +296,15 @@ class Latex:
         """
         # Decode bytes to string and split the string by the delimiter '\n'
         lines = lob.decode(Latex.encoding, errors='ignore').splitlines()
-        found = []
+        # The messages are the keys of a dictionary, which drops the duplicates in the order
+        # of their first occurrence
+        found = {}
         for line in lines:
             # LaTeX log errors contains '!'
             index = line.find(Latex.error_prefix)
             if index != -1:
-                tmp = line[index:]
-                # Do not add duplicates
-                if found.__contains__(tmp):
-                    continue
-                tmp = tex_escape(tmp)
-                found.append(tmp)
-        return found
+                found.setdefault(line[index:], None)
+        return [tex_escape(message) for message in found]
 
     @staticmethod
     def pre_render(content, export_flag, template_type=None, no_error=True):
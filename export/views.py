@@ -7,7 +7,8 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from django.utils.translation import gettext_lazy as _
 
-from base.models import Course, Favorite, Content
+from base.models import Course, CourseSnapshot, Favorite, Content
+from content.models import LatexCompileReport
 from export.helper_functions import Latex
 
 
@@ -44,16 +45,17 @@ def generate_coursebook(request, pk, exp_all, template="content/export/base.tex"
 
     # Check if we want to export the whole course or only the coursebook
     if exp_all:
-        for topic in course.topics.all():
-            contents = [content for content in Content.objects.filter(topic=topic)]
-            for content in contents:
-                context['contents'].append(content)
+        # The snapshot contains the contents in the order of the course structure
+        content_ids = CourseSnapshot.get_for_course(course).get_content_ids()
+        contents = Content.objects.in_bulk(content_ids)
+        context['contents'] = [contents[content_id] for content_id in content_ids
+                               if content_id in contents]
     else:
         context['contents'] = [
             favorite.content for favorite in Favorite.objects.filter(user=user.profile, course=course)]
 
     # Perform compilation given context and template
-    (pdf, pdflatex_output, tex_template) = Latex.render(context, template, [])
+    (pdf, pdflatex_output, tex_template, _) = Latex.render(context, template, [])
     return pdf, pdflatex_output, tex_template
 
 
@@ -140,8 +142,9 @@ def generate_pdf(user, content, template="content/export/base.tex", context=None
     :param context: The context of the content
     :type context: dict[str, Any]
 
-    :return: the generated PDF as PDF, PDF LaTeX output and its rendered template
-    :rtype: tuple[bytes, tuple[bytes, bytes], str]
+    :return: the generated PDF as PDF, PDF LaTeX output, its rendered template and the
+    diagnostics of the compilation
+    :rtype: tuple[bytes, tuple[bytes, bytes], str, dict[str, Any]]
     """
     if context is None:
         context = {}
@@ -153,14 +156,15 @@ def generate_pdf(user, content, template="content/export/base.tex", context=None
     context['export_pdf'] = False
 
     # Performs compilation given context and template
-    (pdf, pdflatex_output, tex_template) = Latex.render(context, template, [])
-    return pdf, pdflatex_output, tex_template
+    return Latex.render(context, template, [])
 
 
 def generate_pdf_response(user, content):
     """Generate pdf response
 
-    Generates a PDF file with name tags for students in the queryset.
+    Generates a PDF file with name tags for students in the queryset. The report of the
+    compilation is stored for the LaTeX content, so that its errors can be shown without
+    compiling it again.
 
     :param user: The user of the content
     :type user: User
@@ -172,5 +176,6 @@ def generate_pdf_response(user, content):
     """
 
     # Calls the function for generating the pdf and return the pdf
-    pdf = generate_pdf(user, content)
-    return pdf[0]
+    (pdf, _, _, diagnostics) = generate_pdf(user, content)
+    LatexCompileReport.store(content.latex, diagnostics)
+    return pdf
@@ -3,3 +3,5 @@
 Marks this directory as Python package directories. This package contains
 frontend related operation.
 """
+
+default_app_config = 'frontend.apps.FrontendConfig'
@@ -15,3 +15,11 @@ class FrontendConfig(AppConfig):
     :type ContenttypesConfig.name: str
     """
     name = 'frontend'
+
+    def ready(self):
+        """Ready
+
+        Registers the signal receivers which invalidate the cached fragments.
+        """
+        # pylint: disable=import-outside-toplevel, unused-import
+        import frontend.signals
@@ -0,0 +1,77 @@
+"""Purpose of this file
+
+This file contains the rendering of the content cards, which caches the rendered card of
+every content until the content, its tags, its ratings or its preview change.
+"""
+
+from django.core.cache import cache
+from django.db.models import Avg, Count
+from django.template.loader import render_to_string
+from django.utils.translation import get_language
+
+from base.cache import content_card_namespace, count, get_versions
+from base.models import Content
+
+from content.models import CONTENT_TYPE_RELATIONS
+
+
+# int: Seconds until a rendered card is rendered again, the cards are also invalidated on
+# every change of their content
+CONTENT_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def render_content_card(content, course):
+    """Render content card
+
+    Renders the card of the content.
+
+    :param content: The content annotated with its rating average and count
+    :type content: Content
+    :param course: The course in which the card is displayed
+    :type course: Course
+
+    :return: the rendered card
+    :rtype: str
+    """
+    rate = -1 if content.card_rate is None else int(content.card_rate)
+    return render_to_string('frontend/course/content_card.html',
+                            {'content': content,
+                             'course': course,
+                             'rate': rate,
+                             'rate_count': content.card_rate_count})
+
+
+def render_content_cards(contents, course):
+    """Render content cards
+
+    Returns the rendered cards of the contents in the given order. The cards are read from
+    the cache with a single lookup and only the missing cards are rendered from the
+    contents loaded with a fixed number of queries.
+
+    :param contents: The contents or their ids
+    :type contents: Iterable[Content or int]
+    :param course: The course in which the cards are displayed
+    :type course: Course
+
+    :return: the rendered cards
+    :rtype: list[str]
+    """
+    content_ids = [getattr(content, 'pk', content) for content in contents]
+    namespaces = {content_id: content_card_namespace(content_id) for content_id in content_ids}
+    versions = get_versions(list(namespaces.values()))
+    keys = {content_id: ':'.join([namespace, versions[namespace], str(course.pk), get_language()])
+            for content_id, namespace in namespaces.items()}
+    cards = cache.get_many(keys.values())
+
+    missing = [content_id for content_id in content_ids if keys[content_id] not in cards]
+    count('content-card', hits=len(content_ids) - len(missing), misses=len(missing))
+    if missing:
+        rendered = {}
+        for content in Content.objects.filter(pk__in=missing) \
+                .select_related('topic', *CONTENT_TYPE_RELATIONS) \
+                .annotate(card_rate=Avg('rating__rating'), card_rate_count=Count('rating')) \
+                .prefetch_related('tags'):
+            rendered[keys[content.pk]] = render_content_card(content, course)
+        cache.set_many(rendered, CONTENT_CARD_CACHE_TIMEOUT)
+        cards.update(rendered)
+    return [cards[keys[content_id]] for content_id in content_ids if keys[content_id] in cards]
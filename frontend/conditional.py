@@ -0,0 +1,129 @@
+"""Purpose of this file
+
+This file contains the validators of the course and content pages, which are used to answer
+conditional requests of unchanged pages with 304 before their context is built.
+"""
+
+from hashlib import md5
+
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max, Q, Subquery
+from django.utils.translation import get_language
+from django.views.decorators.http import condition
+
+from base.cache import course_pages_namespace, get_version, get_version_date
+from base.models import Content, Course
+
+
+def get_page_state(request, course_id, content_id=None):
+    """Page state
+
+    Returns the modification dates and counts which determine the page of the course or
+    of the content in the course for the user of the request. Every change of anything
+    shown on the pages of a course bumps the cached version of the pages, only the favorites
+    of the user and the content itself are checked separately. The state is loaded with a
+    single query and a cache lookup, and only once per request. None is returned if the page
+    must not be validated, e.g. because it displays pending messages.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param course_id: The id of the course
+    :type course_id: int
+    :param content_id: The id of the content or None for the page of the course
+    :type content_id: int or None
+
+    :return: the state of the page
+    :rtype: dict[str, Any] or None
+    """
+    if not hasattr(request, 'page_state'):
+        request.page_state = None
+        # Pending messages are shown on the next rendered page
+        if not get_messages(request):
+            favorites = Q(favorite__user_id=request.user.pk)
+            courses = Course.objects.filter(pk=course_id).annotate(
+                favorite_modified=Max('favorite__last_modified', filter=favorites),
+                favorite_count=Count('favorite', filter=favorites))
+            if content_id is not None:
+                courses = courses.annotate(content_modified=Subquery(
+                    Content.objects.filter(pk=content_id).values('last_modified')))
+            request.page_state = courses.values().first()
+            if request.page_state is not None:
+                request.page_state['pages_version'] = \
+                    get_version(course_pages_namespace(course_id))
+    return request.page_state
+
+
+def get_page_etag(request, course_id, content_id=None):
+    """Page ETag
+
+    Returns the ETag of the page of the course or of the content in the course. The ETag
+    also depends on the user, the language and the csrf token contained in the page.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param course_id: The id of the course
+    :type course_id: int
+    :param content_id: The id of the content or None for the page of the course
+    :type content_id: int or None
+
+    :return: the ETag of the page
+    :rtype: str or None
+    """
+    state = get_page_state(request, course_id, content_id)
+    if state is None:
+        return None
+    parts = [state['pages_version'], state['last_modified'], state['favorite_modified'],
+             state['favorite_count'], state.get('content_modified'), request.user.pk,
+             get_language(), request.META.get('CSRF_COOKIE')]
+    return md5(repr(parts).encode()).hexdigest()
+
+
+def get_page_last_modified(request, course_id, content_id=None):
+    """Page last modified
+
+    Returns the date when the page of the course or of the content in the course was last
+    modified.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param course_id: The id of the course
+    :type course_id: int
+    :param content_id: The id of the content or None for the page of the course
+    :type content_id: int or None
+
+    :return: the date of the last modification of the page
+    :rtype: datetime or None
+    """
+    state = get_page_state(request, course_id, content_id)
+    if state is None:
+        return None
+    dates = [get_version_date(state['pages_version']), state['last_modified'],
+             state['favorite_modified'], state.get('content_modified')]
+    return max(date for date in dates if date is not None)
+
+
+def page_condition(course_kwarg, content_kwarg=None):
+    """Page condition
+
+    Decorator which answers conditional GET requests of the page of a course or of a content
+    in a course with 304 if the page was not modified.
+
+    :param course_kwarg: The name of the view argument containing the id of the course
+    :type course_kwarg: str
+    :param content_kwarg: The name of the view argument containing the id of the content
+    :type content_kwarg: str or None
+
+    :return: the decorator of the view
+    :rtype: Callable
+    """
+
+    def get_ids(kwargs):
+        return kwargs[course_kwarg], kwargs.get(content_kwarg)
+
+    def etag(request, *args, **kwargs):  # pylint: disable=unused-argument
+        return get_page_etag(request, *get_ids(kwargs))
+
+    def last_modified(request, *args, **kwargs):  # pylint: disable=unused-argument
+        return get_page_last_modified(request, *get_ids(kwargs))
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
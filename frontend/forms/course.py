@@ -96,25 +96,27 @@ class FilterAndSortForm(forms.Form):
     :attr FilterAndSortForm.SORTING_CHOICE: The sorting choices
     :type FilterAndSortForm.SORTING_CHOICE: list[tuple[str, str]]
     :attr FilterAndSortForm.filter: The field to enter the filter choices
-    :type FilterAndSortForm.filter: CharField
+    :type FilterAndSortForm.filter: ChoiceField
     :attr FilterAndSortForm.sort: The field to enter the sort choices
-    :type FilterAndSortForm.sort: CharField
+    :type FilterAndSortForm.sort: ChoiceField
     """
 
     FILTER_CHOICE = [('None', '------'), ('Text', _("Text")), ('Image', _("Image")),
                      ('Latex', _("LaTeX-Textfield")), ('YouTube-Video', _("YouTube-Video")),
                      ('PDF', 'PDF')]  # + Content.STYLE
     SORTING_CHOICE = [('None', '-----'), ('Date', _("Date")), ('Rating', _("Rating"))]
-    filter = forms.CharField(label=_("Filter by"),
-                             widget=forms.Select(choices=FILTER_CHOICE,
-                                                 attrs={'class': 'form-control',
-                                                        'style': 'width:auto; padding-right: 30px',
-                                                        'onchange': 'this.form.submit();'}))
-    sort = forms.CharField(label=_("Sort by"),
-                           widget=forms.Select(choices=SORTING_CHOICE,
-                                               attrs={'class': 'form-control',
-                                                      'style': 'width:auto; padding-right: 30px',
-                                                      'onchange': 'this.form.submit();'}))
+    filter = forms.ChoiceField(label=_("Filter by"),
+                               choices=FILTER_CHOICE,
+                               widget=forms.Select(attrs={
+                                   'class': 'form-control',
+                                   'style': 'width:auto; padding-right: 30px',
+                                   'onchange': 'this.form.submit();'}))
+    sort = forms.ChoiceField(label=_("Sort by"),
+                             choices=SORTING_CHOICE,
+                             widget=forms.Select(attrs={
+                                 'class': 'form-control',
+                                 'style': 'width:auto; padding-right: 30px',
+                                 'onchange': 'this.form.submit();'}))
 
 
 class TopicChooseForm(forms.Form):
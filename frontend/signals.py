@@ -0,0 +1,53 @@
+"""Purpose of this file
+
+This file contains the signal receivers which invalidate the cached fragments of the frontend
+when the type specific contents or the attachments of the contents change. The receivers of
+the contents themselves are part of /base/signals.py.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from base.signals import invalidate_contents, invalidate_course_pages
+
+from content.attachment.models import ImageAttachment
+from content.models import CONTENT_TYPES
+
+
+def type_content_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Type content changed
+
+    Invalidates a content and the cached pages of its courses when its type specific
+    content, e.g. the preview, was saved or deleted.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved or deleted type specific content
+    :type instance: BaseContentModel
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    invalidate_contents([instance.content_id])
+
+
+for content_type in CONTENT_TYPES.values():
+    post_save.connect(type_content_changed, sender=content_type)
+    post_delete.connect(type_content_changed, sender=content_type)
+
+
+@receiver(post_save, sender=ImageAttachment)
+@receiver(post_delete, sender=ImageAttachment)
+def attachment_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Attachment changed
+
+    Invalidates the cached pages of the courses containing a content whose attachment was
+    saved or deleted.
+
+    :param sender: The model class
+    :type sender: type
+    :param instance: The saved or deleted attachment
+    :type instance: ImageAttachment
+    :param kwargs: The keyword arguments
+    :type kwargs: dict[str, Any]
+    """
+    invalidate_course_pages(topic__contents=instance.content_id)
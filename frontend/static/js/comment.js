@@ -0,0 +1,33 @@
+/**
+ * Loads the next page of comments and appends it to the comment list. The given button
+ * stores the url of the comment endpoint and the cursor of the next page. If there are
+ * no further comments after the loaded page, the button is removed.
+ *
+ * @param button the load more button
+ */
+function loadMoreComments(button) {
+    const url = new URL(button.dataset.url, window.location.href);
+    url.searchParams.set('cursor', button.dataset.cursor);
+    button.disabled = true;
+
+    fetch(url.toString(), {headers: {'X-Requested-With': 'XMLHttpRequest'}})
+        .then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.status);
+            }
+            return response.json();
+        })
+        .then(function (data) {
+            document.getElementById('comment-list').insertAdjacentHTML('beforeend', data.html);
+            if (data.cursor) {
+                button.dataset.cursor = data.cursor;
+                button.disabled = false;
+            } else {
+                button.remove();
+            }
+        })
+        .catch(function () {
+            // Allow to retry
+            button.disabled = false;
+        });
+}
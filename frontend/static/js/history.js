@@ -0,0 +1,48 @@
+/**
+ * Loads the diff of the versions with the given query and replaces the displayed diff. The
+ * url of the page is updated, so that the diff can be reloaded and shared.
+ *
+ * @param query the query containing the ids of the versions to compare
+ */
+function loadHistoryDiff(query) {
+    const url = window.location.pathname + query;
+    fetch(url, {headers: {'X-Requested-With': 'XMLHttpRequest'}})
+        .then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.status);
+            }
+            return response.text();
+        })
+        .then(function (html) {
+            document.getElementById('history-diff').innerHTML = html;
+            window.history.replaceState(null, '', url);
+        })
+        .catch(function (error) {
+            const message = gettext("Error during data transfer to the server - status: %s");
+            showNotification(interpolate(message, [error.message]), "alert-danger");
+        });
+}
+
+/**
+ * Loads the diffs of the selected versions and of the previous and next versions without
+ * rendering the history again.
+ */
+function setupHistoryDiff() {
+    const form = document.getElementById('history-compare-form');
+    if (form !== null) {
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            loadHistoryDiff('?' + new URLSearchParams(new FormData(form)).toString());
+        });
+    }
+
+    document.getElementById('history-diff').addEventListener('click', function (event) {
+        const link = event.target.closest('.history-diff-link');
+        if (link !== null) {
+            event.preventDefault();
+            loadHistoryDiff(link.getAttribute('href'));
+        }
+    });
+}
+
+document.addEventListener('DOMContentLoaded', setupHistoryDiff);
@@ -0,0 +1,48 @@
+/**
+ * Replaces the placeholder of a topic with its rendered contents. The placeholder stores
+ * the url of the contents of the topic including the sort and filter options.
+ *
+ * @param placeholder the placeholder of the contents of the topic
+ */
+function loadTopicContents(placeholder) {
+    fetch(placeholder.dataset.url, {headers: {'X-Requested-With': 'XMLHttpRequest'}})
+        .then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.status);
+            }
+            return response.text();
+        })
+        .then(function (html) {
+            placeholder.outerHTML = html;
+        })
+        .catch(function (error) {
+            const message = gettext("Error during data transfer to the server - status: %s");
+            showNotification(interpolate(message, [error.message]), "alert-danger");
+        });
+}
+
+/**
+ * Loads the contents of the topics as soon as they are scrolled into view. Browsers
+ * without support of intersection observers load all topics immediately.
+ */
+function setupTopicContents() {
+    const placeholders = document.querySelectorAll('.topic-contents');
+    if (!('IntersectionObserver' in window)) {
+        placeholders.forEach(loadTopicContents);
+        return;
+    }
+
+    const observer = new IntersectionObserver(function (entries) {
+        entries.forEach(function (entry) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                loadTopicContents(entry.target);
+            }
+        });
+    }, {rootMargin: '200px'});
+    placeholders.forEach(function (placeholder) {
+        observer.observe(placeholder);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', setupTopicContents);
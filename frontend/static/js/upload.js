@@ -0,0 +1,154 @@
+/**
+ * The number of attempts to send a chunk before the upload is given up.
+ * @type {number}
+ */
+const UPLOAD_ATTEMPTS = 5;
+
+/**
+ * The number of uploads which are not finished yet.
+ * @type {number}
+ */
+let pendingUploads = 0;
+
+/**
+ * Sends a request with the CSRF token and returns the response with its parsed JSON body.
+ *
+ * @param url the url of the request
+ * @param options the options of the fetch
+ * @return {Promise<{response: Response, data: Object}>} the response and its data
+ */
+function sendUploadRequest(url, options) {
+    options.headers = Object.assign({'X-CSRFToken': getCookie('csrftoken')}, options.headers);
+    return fetch(url, options).then(function (response) {
+        return response.json().then(function (data) {
+            return {response: response, data: data};
+        });
+    });
+}
+
+/**
+ * Waits the given number of milliseconds.
+ *
+ * @param milliseconds the time to wait
+ * @return {Promise} the promise which is resolved after the time
+ */
+function waitBeforeRetry(milliseconds) {
+    return new Promise(function (resolve) {
+        setTimeout(resolve, milliseconds);
+    });
+}
+
+/**
+ * Uploads the file in chunks. A chunk which could not be sent is sent again from the
+ * offset reported by the server, so that an interrupted upload continues where it stopped.
+ *
+ * @param url the url of the upload
+ * @param file the file to upload
+ * @param chunkSize the maximal size of a chunk
+ * @param progress the callback which receives the number of uploaded bytes
+ * @return {Promise} the promise which is resolved when the upload is complete
+ */
+async function uploadChunks(url, file, chunkSize, progress) {
+    let offset = 0;
+    let attempts = 0;
+    while (offset < file.size) {
+        const end = Math.min(offset + chunkSize, file.size);
+        let result;
+        try {
+            result = await sendUploadRequest(url, {
+                method: 'PUT',
+                headers: {'Content-Range': `bytes ${offset}-${end - 1}/${file.size}`},
+                body: file.slice(offset, end),
+            });
+        } catch (error) {
+            // The connection was lost, so the offset is requested again after a pause
+            if (++attempts >= UPLOAD_ATTEMPTS) {
+                throw error;
+            }
+            await waitBeforeRetry(1000 * attempts);
+            result = await sendUploadRequest(url, {method: 'GET'});
+        }
+        // A conflict reports the offset at which the upload has to be continued
+        if (!result.response.ok && result.response.status !== 409) {
+            throw new Error((result.data.errors || [result.response.status]).join(' '));
+        }
+        if (result.response.ok) {
+            attempts = 0;
+        }
+        offset = result.data.offset;
+        progress(offset);
+    }
+}
+
+/**
+ * Uploads the selected file of the input in chunks. Once the upload is complete, the file
+ * is removed from the input and the id of the upload is submitted instead.
+ *
+ * @param input the file input
+ */
+function startChunkedUpload(input) {
+    const file = input.files[0];
+    const form = input.form;
+    const data = new FormData();
+    data.append('kind', input.dataset.chunkedUpload);
+    data.append('filename', file.name);
+    data.append('size', file.size);
+
+    let status = input.parentElement.querySelector('.chunked-upload-status');
+    if (status === null) {
+        status = document.createElement('small');
+        status.className = 'chunked-upload-status form-text text-muted';
+        input.parentElement.appendChild(status);
+    }
+    let hidden = form.querySelector(`input[name="${input.name}_upload_id"]`);
+    if (hidden === null) {
+        hidden = document.createElement('input');
+        hidden.type = 'hidden';
+        hidden.name = input.name + '_upload_id';
+        form.appendChild(hidden);
+    }
+    hidden.value = '';
+
+    pendingUploads++;
+    sendUploadRequest(form.dataset.uploadUrl, {method: 'POST', body: data})
+        .then(function (result) {
+            if (!result.response.ok) {
+                throw new Error(Object.values(result.data.errors).join(' '));
+            }
+            const url = form.dataset.uploadUrl + result.data.id + '/';
+            return uploadChunks(url, file, result.data.chunk_size, function (offset) {
+                const percent = Math.floor(100 * offset / file.size);
+                status.innerText = interpolate(gettext("Uploaded: %s"), [percent + " %"]);
+            }).then(function () {
+                hidden.value = result.data.id;
+                // The file was uploaded, so it must not be sent with the form again
+                input.value = '';
+                input.required = false;
+                status.innerText = interpolate(gettext("%s was uploaded."), [file.name]);
+            });
+        })
+        .catch(function (error) {
+            status.innerText = '';
+            showNotification(interpolate(gettext("The upload failed: %s"), [error.message]),
+                "alert-danger");
+        })
+        .finally(function () {
+            pendingUploads--;
+        });
+}
+
+document.addEventListener('change', function (event) {
+    const input = event.target;
+    if (input.dataset !== undefined && input.dataset.chunkedUpload !== undefined
+        && input.form !== null && input.form.dataset.uploadUrl !== undefined
+        && input.files.length > 0) {
+        startChunkedUpload(input);
+    }
+});
+
+document.addEventListener('submit', function (event) {
+    if (pendingUploads > 0) {
+        event.preventDefault();
+        showNotification(gettext("Please wait until the uploads are finished."), "alert-warning");
+    }
+});
@@ -7,13 +7,17 @@ import re
 
 from django import template
 from django.conf import settings
+from django.utils.safestring import mark_safe
 
 from base.models import Favorite
+from base.utils import is_course_owner
 
 from collab_coursebook.settings import ALLOW_PUBLIC_COURSE_EDITING_BY_EVERYONE
 
 from content.models import CONTENT_TYPES
 
+from frontend.cards import render_content_cards
+
 register = template.Library()
 
 
@@ -132,8 +136,26 @@ def check_edit_course_permission(user, course):
     :return: true if the course can be edited
     :rtype: bool
     """
-    return (user.profile in course.owners.all()) or (not course.restrict_changes
-                                                     and ALLOW_PUBLIC_COURSE_EDITING_BY_EVERYONE)
+    return is_course_owner(user, course) or (not course.restrict_changes
+                                             and ALLOW_PUBLIC_COURSE_EDITING_BY_EVERYONE)
+
+
+@register.filter
+def check_course_owner(user, course):
+    """Course owner
+
+    Checks if the user is an owner of the course. The owned courses are loaded
+    once per request, so this filter can be used inside loops.
+
+    :param user: The user to check
+    :type user: User
+    :param course: The course to check
+    :type course: Course
+
+    :return: true if the user is an owner of the course
+    :rtype: bool
+    """
+    return is_course_owner(user, course)
 
 
 @register.filter
@@ -192,6 +214,23 @@ def add_content_button(user, course_id, topic_id):
             'content_data': content_data}
 
 
+@register.filter
+def content_cards(contents, course):
+    """Content cards
+
+    Returns the rendered cards of the contents which are cached until the contents change.
+
+    :param contents: The contents or their ids
+    :type contents: Iterable[Content or int]
+    :param course: The course in which the cards are displayed
+    :type course: Course
+
+    :return: the rendered cards
+    :rtype: list[SafeString]
+    """
+    return [mark_safe(card) for card in render_content_cards(contents, course)]
+
+
 @register.filter
 def get_coursebook(user, course):
     """Get coursebook
@@ -206,7 +245,8 @@ def get_coursebook(user, course):
     :return: the coursebook
     :rtype: list[Content]
     """
-    favorites = Favorite.objects.filter(user=user.profile, course=course)
+    favorites = Favorite.objects.filter(user=user.profile, course=course) \
+        .select_related('content')
     coursebook = [favorite.content for favorite in favorites]
     return coursebook
 
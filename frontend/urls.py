@@ -65,6 +65,9 @@ urlpatterns = [
             path('export/',
                  generate_course_export_response,
                  name='export-course'),
+            path('topic/<int:topic_id>/contents/',
+                 views.course.topic_contents,
+                 name='course-topic-contents'),
         ])),
         path('<int:course_id>/topic/<int:topic_id>/content/', include([
 
@@ -77,6 +80,9 @@ urlpatterns = [
                 path('rate/<int:pk>/',
                      views.rate_content,
                      name='rating'),
+                path('comments/',
+                     views.comment.comment_page,
+                     name='comments'),
                 path('comment/<int:pk>/delete/',
                      views.DeleteComment.as_view(),
                      name='comment-delete'),
@@ -143,5 +149,14 @@ urlpatterns = [
              name='period-courses'),
     ])),
 
+    path('uploads/', include([
+        path('',
+             views.upload.start_upload,
+             name='upload-start'),
+        path('<uuid:pk>/',
+             views.upload.upload_chunk,
+             name='upload-chunk'),
+    ])),
+
     path('jsi18n/', JavaScriptCatalog.as_view(), name='javascript-catalog'),
 ]
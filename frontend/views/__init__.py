@@ -17,8 +17,14 @@ from .comment import EditComment, DeleteComment
 from .history import CourseHistoryCompareView, PdfHistoryCompareView, ImageHistoryCompareView
 from .history import LatexHistoryCompareView, YTVideoHistoryCompareView
 
+from .media import serve_media
+
+from .metrics import metrics
+
 from .page import StartView, DashboardView
 
 from .profile import ProfileView, ProfileEditView
 
 from .search import SearchView
+
+from .upload import start_upload, upload_chunk
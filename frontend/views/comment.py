@@ -5,15 +5,132 @@ This file describes the frontend views related to comments.
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseRedirect
+from django.db.models import Q
+from django.http import HttpResponseRedirect, HttpResponseBadRequest, HttpResponseForbidden, \
+    JsonResponse
+from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.dateparse import parse_datetime
 from django.views.generic import DeleteView, UpdateView
 from django.utils.translation import gettext_lazy as _
 
-from base.models import Comment, Topic
+from base.models import Comment, Content, CourseStructureEntry, Topic
 
 from frontend.forms import CommentForm
 
+# int: The number of comments loaded at once
+COMMENT_PAGE_SIZE = 20
+
+
+def encode_comment_cursor(comment):
+    """Encode comment cursor
+
+    Encodes the position of the given comment in the comment list as cursor.
+
+    :param comment: The last comment of a page
+    :type comment: Comment
+
+    :return: the cursor pointing after the comment
+    :rtype: str
+    """
+    return f'{comment.creation_date.isoformat()}_{comment.pk}'
+
+
+def decode_comment_cursor(cursor):
+    """Decode comment cursor
+
+    Decodes the cursor into the creation date and id of the last comment of
+    the previous page.
+
+    :param cursor: The encoded cursor
+    :type cursor: str
+
+    :return: the creation date and the id of the comment
+    :rtype: tuple[datetime, int]
+
+    :raises ValueError: if the cursor is malformed
+    """
+    creation_date, _separator, comment_id = cursor.rpartition('_')
+    creation_date = parse_datetime(creation_date)
+    if creation_date is None:
+        raise ValueError(f'Invalid comment cursor: {cursor}')
+    return creation_date, int(comment_id)
+
+
+def get_comment_page(content, cursor=None, page_size=COMMENT_PAGE_SIZE):
+    """Comment page
+
+    Returns a page of the comments of the content, newest first. Instead of an offset
+    the page continues after the cursor, so that the database can seek through the
+    index on content and creation date no matter how deep the page is.
+
+    :param content: The content of the comments
+    :type content: Content
+    :param cursor: The creation date and id of the last comment of the previous page
+    :type cursor: None or tuple[datetime, int]
+    :param page_size: The maximum number of comments on the page
+    :type page_size: int
+
+    :return: the comments of the page and the cursor of the next page, which is None
+    if there are no further comments
+    :rtype: tuple[list[Comment], None or str]
+    """
+    comments = Comment.objects.filter(content=content) \
+        .select_related('author__user').order_by('-creation_date', '-id')
+    if cursor is not None:
+        creation_date, comment_id = cursor
+        comments = comments.filter(Q(creation_date__lt=creation_date)
+                                   | Q(creation_date=creation_date, id__lt=comment_id))
+    # Retrieve one more comment to know if there is a next page
+    comments = list(comments[:page_size + 1])
+    if len(comments) > page_size:
+        comments = comments[:page_size]
+        return comments, encode_comment_cursor(comments[-1])
+    return comments, None
+
+
+def comment_page(request, course_id, topic_id, content_id):
+    """Comment page
+
+    Returns the next page of comments after the cursor given in the request as
+    rendered html fragment together with the cursor of the following page. The content must
+    belong to the topic and the topic to the course because the fragment links into them.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param course_id: The id of the course
+    :type course_id: int
+    :param topic_id: The id of the topic
+    :type topic_id: int
+    :param content_id: The id of the content of the comments
+    :type content_id: int
+
+    :return: the json response containing the html fragment and the next cursor
+    :rtype: JsonResponse
+    """
+    content = get_object_or_404(Content.objects.select_related('topic'), pk=content_id,
+                                topic_id=topic_id)
+    get_object_or_404(CourseStructureEntry, course_id=course_id, topic_id=topic_id)
+    # Anonymous users only see the contents which are shown in public courses
+    if not request.user.is_authenticated and not content.public:
+        return HttpResponseForbidden()
+    cursor = request.GET.get('cursor')
+    if cursor is not None:
+        try:
+            cursor = decode_comment_cursor(cursor)
+        except ValueError:
+            return HttpResponseBadRequest()
+    comments, next_cursor = get_comment_page(content, cursor)
+    html = render_to_string('frontend/comment/comment_list.html',
+                            {'comments': comments,
+                             'course_id': course_id,
+                             'topic': content.topic,
+                             'content': content,
+                             'content_id': content.pk},
+                            request=request)
+    return JsonResponse(data={'html': html, 'cursor': next_cursor})
+
 
 class DeleteComment(LoginRequiredMixin, DeleteView):  # pylint: disable=too-many-ancestors
     """Delete comment
@@ -5,25 +5,32 @@ This file describes the frontend views related to content types.
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
 from django.contrib.messages.views import SuccessMessageMixin
 from django.http import HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy, reverse
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import DetailView, CreateView, DeleteView, UpdateView
 
+from base.cache import cache_anonymous_course_page
 from base.models import Content, Comment, Course, Topic, Favorite
-from base.utils import get_user
+from base.utils import get_neighbour_ids, get_user, is_course_owner
 
 from content.attachment.forms import ImageAttachmentFormSet
 from content.attachment.models import ImageAttachment, IMAGE_ATTACHMENT_TYPES
 from content.forms import CONTENT_TYPE_FORMS
-from content.models import CONTENT_TYPES
+from content.models import CONTENT_TYPE_RELATIONS, CONTENT_TYPES, LatexCompileReport
+from content.upload import attach_uploads
 
+from frontend.conditional import page_condition
 from frontend.forms.comment import CommentForm
+from frontend.forms import FilterAndSortForm
 from frontend.forms.content import AddContentForm, EditContentForm, TranslateForm
 from frontend.templatetags.cc_frontend_tags import js_escape
+from frontend.views.comment import get_comment_page
 from frontend.views.history import Reversion
 from frontend.views.validator import Validator
 
@@ -189,66 +196,65 @@ class AddContentView(SuccessMessageMixin, LoginRequiredMixin, CreateView):
         :rtype: HttpResponseRedirect
         """
         # Retrieves content type form
-        if 'type' in self.kwargs:
-            content_type = self.kwargs['type']
-            if content_type in CONTENT_TYPE_FORMS:
-                content_type_form = CONTENT_TYPE_FORMS.get(content_type)(request.POST,
-                                                                         request.FILES)
-            else:
-                return self.handle_error()
-        else:
+        content_type = self.kwargs.get('type')
+        if content_type not in CONTENT_TYPE_FORMS:
             return self.handle_error()
 
-        # Reads input from included forms
-        add_content_form = AddContentForm(request.POST)
-        image_formset = ImageAttachmentFormSet(request.POST, request.FILES)
-
-        # Checks if content forms are valid
-        if add_content_form.is_valid() and content_type_form.is_valid():
-
-            # Saves author etc.
-            content = add_content_form.save(commit=False)
-            content.author = get_user(self.request)
-            topic_id = self.kwargs['topic_id']
-            content.topic = Topic.objects.get(pk=topic_id)
-            content.type = content_type
-            content.save()
-            # Evaluates generic form
-            content_type_data = content_type_form.save(commit=False)
-            content_type_data.content = content
-            content_type_data.save()
-
-            # Checks if attachments are allowed for the given content type
-            if content_type in IMAGE_ATTACHMENT_TYPES:
-                # Validates attachments
-                redirect = Validator.validate_attachment(content,
-                                                         image_formset)
-                if redirect is not None:
-                    return redirect
-
-            # If the content type is LaTeX, compile the LaTeX Code and store in DB
-            if content_type == 'Latex':
-                Validator.validate_latex(get_user(request),
-                                         content,
-                                         content_type_data)
-
-            # Generates preview image in 'uploads/contents/'
-            preview = CONTENT_TYPES.get(content_type).objects.get(pk=content.pk).generate_preview()
-            content.preview.name = preview
-            content.save()
-
-            # Redirects to content
-            course_id = self.kwargs['course_id']
-            topic_id = self.kwargs['topic_id']
-            return HttpResponseRedirect(reverse_lazy(
-                'frontend:content',
-                args=(course_id,
-                      topic_id,
-                      content.id)))
-
-        return self.render_to_response(
-            self.get_context_data(form=add_content_form, content_type_form=content_type_form,
-                                  item_forms=image_formset))
+        # Large files are attached from their chunked uploads
+        with attach_uploads(request) as files:
+            content_type_form = CONTENT_TYPE_FORMS.get(content_type)(request.POST, files)
+
+            # Reads input from included forms
+            add_content_form = AddContentForm(request.POST)
+            image_formset = ImageAttachmentFormSet(request.POST, files)
+
+            # Checks if content forms are valid
+            if add_content_form.is_valid() and content_type_form.is_valid():
+
+                # Saves author etc.
+                content = add_content_form.save(commit=False)
+                content.author = get_user(self.request)
+                topic_id = self.kwargs['topic_id']
+                content.topic = Topic.objects.get(pk=topic_id)
+                content.type = content_type
+                content.save()
+                # Evaluates generic form
+                content_type_data = content_type_form.save(commit=False)
+                content_type_data.content = content
+                content_type_data.save()
+
+                # Checks if attachments are allowed for the given content type
+                if content_type in IMAGE_ATTACHMENT_TYPES:
+                    # Validates attachments
+                    redirect = Validator.validate_attachment(content,
+                                                             image_formset)
+                    if redirect is not None:
+                        return redirect
+
+                # If the content type is LaTeX, compile the LaTeX Code and store in DB
+                if content_type == 'Latex':
+                    Validator.validate_latex(get_user(request),
+                                             content,
+                                             content_type_data)
+
+                # Generates preview image in 'uploads/contents/'
+                preview = CONTENT_TYPES.get(content_type) \
+                    .objects.get(pk=content.pk).generate_preview()
+                content.preview.name = preview
+                content.save()
+
+                # Redirects to content
+                course_id = self.kwargs['course_id']
+                topic_id = self.kwargs['topic_id']
+                return HttpResponseRedirect(reverse_lazy(
+                    'frontend:content',
+                    args=(course_id,
+                          topic_id,
+                          content.id)))
+
+            return self.render_to_response(
+                self.get_context_data(form=add_content_form, content_type_form=content_type_form,
+                                      item_forms=image_formset))
 
 
 class EditContentView(LoginRequiredMixin, UpdateView):
@@ -361,6 +367,9 @@ class EditContentView(LoginRequiredMixin, UpdateView):
         context['is_latex_content'] = content_type == 'Latex'
         if content_type == 'Latex':
             context['latex_tooltip'] = LATEX_EXAMPLE
+            # The report of the last compilation, the content is not compiled again
+            context['compile_report'] = \
+                LatexCompileReport.objects.filter(latex_id=self.get_object().pk).first()
 
         if content_type in IMAGE_ATTACHMENT_TYPES and 'item_forms' not in context:
 
@@ -399,61 +408,65 @@ class EditContentView(LoginRequiredMixin, UpdateView):
 
             # Bind/init form with existing data
             content_object = CONTENT_TYPES[self.object.type].objects.get(pk=self.get_object().pk)
-
-            # Careful: Order is important for file fields (instance first, afterwards form data,
-            # if using kwargs dict as single argument instead, instance information
-            # will not be parsed in time)
-            content_type_form = CONTENT_TYPE_FORMS.get(self.object.type)(instance=content_object,
-                                                                         data=self.request.POST,
-                                                                         files=self.request.FILES)
-
-            # Reversion comment
-            Reversion.update_comment(request)
-            image_formset = ImageAttachmentFormSet(
-                data=request.POST,
-                files=request.FILES)
-
-            # Check form validity and update both forms/associated models
-            if form.is_valid() and content_type_form.is_valid():
-                content = form.save()
-                content_type = content.type
-                content_type_data = content_type_form.save()
-
-                # Checks if attachments are allowed for the given content type
-                if content_type in IMAGE_ATTACHMENT_TYPES:
-
-                    # Removes images from database
-                    clean_attachment(content, image_formset)
-
-                    # Validates attachments
-                    redirect = Validator.validate_attachment(content,
-                                                             image_formset)
-                    if redirect is not None:
-                        return redirect
-
-                # If the content type is LaTeX, compile the LaTeX Code and store in DB
-                if content_type == 'Latex':
-                    Validator.validate_latex(get_user(request),
-                                             content,
-                                             content_type_data)
-
-                # Generates preview image in 'uploads/contents/'
-                preview = CONTENT_TYPES.get(content_type) \
-                    .objects.get(pk=content.pk).generate_preview()
-                content.preview.name = preview
-                content.save()
-
-                messages.add_message(self.request, messages.SUCCESS, _("Content updated"))
-                return HttpResponseRedirect(self.get_success_url())
-
-            # Don't save and render error messages for both forms
-            return self.render_to_response(
-                self.get_context_data(form=form, content_type_form=content_type_form, item_forms=image_formset))
+            # Large files are attached from their chunked uploads
+            with attach_uploads(request) as files:
+                # Careful: Order is important for file fields (instance first, afterwards form data,
+                # if using kwargs dict as single argument instead, instance information
+                # will not be parsed in time)
+                content_type_form = CONTENT_TYPE_FORMS.get(self.object.type)(
+                    instance=content_object, data=self.request.POST, files=files)
+
+                # Reversion comment
+                Reversion.update_comment(request)
+                image_formset = ImageAttachmentFormSet(
+                    data=request.POST,
+                    files=files)
+
+                # Check form validity and update both forms/associated models
+                if form.is_valid() and content_type_form.is_valid():
+                    content = form.save()
+                    content_type = content.type
+                    content_type_data = content_type_form.save()
+
+                    # Checks if attachments are allowed for the given content type
+                    if content_type in IMAGE_ATTACHMENT_TYPES:
+
+                        # Removes images from database
+                        clean_attachment(content, image_formset)
+
+                        # Validates attachments
+                        redirect = Validator.validate_attachment(content,
+                                                                 image_formset)
+                        if redirect is not None:
+                            return redirect
+
+                    # If the content type is LaTeX, compile the LaTeX Code and store in DB
+                    if content_type == 'Latex':
+                        Validator.validate_latex(get_user(request),
+                                                 content,
+                                                 content_type_data)
+
+                    # Generates preview image in 'uploads/contents/'
+                    preview = CONTENT_TYPES.get(content_type) \
+                        .objects.get(pk=content.pk).generate_preview()
+                    content.preview.name = preview
+                    content.save()
+
+                    messages.add_message(self.request, messages.SUCCESS, _("Content updated"))
+                    return HttpResponseRedirect(self.get_success_url())
+
+                # Don't save and render error messages for both forms
+                return self.render_to_response(
+                    self.get_context_data(form=form, content_type_form=content_type_form,
+                                          item_forms=image_formset))
 
         # Redirect to error page (should not happen for valid content types)
         return self.handle_error()
 
 
+@method_decorator(cache_anonymous_course_page('course_id', FilterAndSortForm,
+                                              {'sort': 's', 'filter': 'f'}), name='dispatch')
+@method_decorator(page_condition('course_id', 'pk'), name='get')
 class ContentView(DetailView):
     """Content view
 
@@ -470,6 +483,56 @@ class ContentView(DetailView):
     template_name = "frontend/content/detail.html"
 
     context_object_name = 'content'
+    object = None
+
+    def get_queryset(self):
+        """Query set
+
+        Returns the query set of the contents which joins the type specific content row,
+        the topic and the author and prefetches the tags and attachments, so that the
+        templates do not have to load them lazily.
+
+        :return: the query set of the contents
+        :rtype: QuerySet[Content]
+        """
+        return super().get_queryset() \
+            .select_related('topic__category', 'author__user', *CONTENT_TYPE_RELATIONS) \
+            .prefetch_related('tags', 'ImageAttachments')
+
+    def get_object(self, queryset=None):
+        """Object
+
+        Returns the content of this view. The content is only retrieved once per request.
+
+        :param queryset: The query set to retrieve the object from
+        :type queryset: QuerySet[Content]
+
+        :return: the content of this view
+        :rtype: Content
+        """
+        if self.object is None or queryset is not None:
+            self.object = super().get_object(queryset)
+        return self.object
+
+    def get(self, request, *args, **kwargs):
+        """Get request
+
+        Displays the content. Anonymous users are redirected to the login if the content
+        is not shown in public courses.
+
+        :param request: The given request
+        :type request: HttpRequest
+        :param args: The arguments
+        :type: Any
+        :param kwargs: The keyword arguments
+        :type kwargs: dict[str, Any]
+
+        :return: the rendered content page or the redirection to the login
+        :rtype: HttpResponse
+        """
+        if not request.user.is_authenticated and not self.get_object().public:
+            return redirect_to_login(request.get_full_path())
+        return super().get(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):  # pylint: disable=unused-argument
         """Post request
@@ -544,8 +607,9 @@ class ContentView(DetailView):
         context['search_result'] = self.request.GET.get('q')
         content = self.get_object()
         context['user'] = self.request.user
-        context['count'] = content.get_rate_count()
-        context['rate'] = round(content.get_rate(), 2)
+        rate, count = content.get_rate_summary()
+        context['count'] = count
+        context['rate'] = round(rate, 2)
 
         # Course id for back to course button
         course_id = self.kwargs['course_id']
@@ -553,9 +617,10 @@ class ContentView(DetailView):
         course = Course.objects.get(pk=course_id)
         context['course'] = course
 
-        topic = Topic.objects.get(pk=self.kwargs['topic_id'])
+        # The topic was already retrieved together with the content
+        topic = content.topic
         context['topic'] = topic
-        context['isCurrentUserOwner'] = self.request.user.profile in course.owners.all()
+        context['isCurrentUserOwner'] = is_course_owner(self.request.user, course)
 
         """
         if '.md' in content.file.name:
@@ -572,8 +637,8 @@ class ContentView(DetailView):
 
         context['comment_form'] = CommentForm()
 
-        context['comments'] = Comment.objects.filter(content=self.get_object()
-                                                     ).order_by('-creation_date')
+        # Only the first page of comments, further pages are loaded on demand
+        context['comments'], context['comment_cursor'] = get_comment_page(content)
         context['translate_form'] = TranslateForm()
 
         if self.request.GET.get('coursebook'):
@@ -583,10 +648,11 @@ class ContentView(DetailView):
                                 + self.request.GET.get('f')
 
         if self.request.user.is_authenticated:
-            context['user_rate'] = content.get_user_rate(self.request.user.profile)
-
-        context['favorite'] = Favorite.objects.filter(course=course, user=get_user(self.request),
-                                                      content=content).count() > 0
+            context['user_rate'] = content.get_user_rate(self.request.user)
+            # The primary key of the profile is the primary key of the user
+            context['favorite'] = Favorite.objects.filter(course=course,
+                                                          user_id=self.request.user.pk,
+                                                          content=content).exists()
 
         return context
 
@@ -631,7 +697,7 @@ class AttachedImageView(DetailView):
         content = Content.objects.get(pk=self.kwargs['content_id'])
         context['content'] = content
 
-        context['isCurrentUserOwner'] = self.request.user.profile in course.owners.all()
+        context['isCurrentUserOwner'] = is_course_owner(self.request.user, course)
         context['translate_form'] = TranslateForm()
 
         return context
@@ -719,6 +785,7 @@ class DeleteContentView(LoginRequiredMixin, DeleteView):
         return super().delete(self, request, *args, **kwargs)
 
 
+@method_decorator(page_condition('course_id', 'pk'), name='get')
 class ContentReadingModeView(LoginRequiredMixin, DetailView):
     """Content reading mode view
 
@@ -732,6 +799,18 @@ class ContentReadingModeView(LoginRequiredMixin, DetailView):
     model = Content
     template_name = "frontend/content/reading_mode.html"
 
+    def get_queryset(self):
+        """Query set
+
+        Returns the query set of the contents which joins the type specific content row,
+        the topic and the author.
+
+        :return: the query set of the contents
+        :rtype: QuerySet[Content]
+        """
+        return super().get_queryset() \
+            .select_related('topic__category', 'author__user', *CONTENT_TYPE_RELATIONS)
+
     def get_context_data(self, **kwargs):
         """Context data
 
@@ -745,32 +824,27 @@ class ContentReadingModeView(LoginRequiredMixin, DetailView):
         """
         context = super().get_context_data(**kwargs)
         context['course_id'] = self.kwargs['course_id']
-        context['topic_id'] = topic_id = self.kwargs['topic_id']
-        content = self.get_object()
+        context['topic_id'] = self.kwargs['topic_id']
+        # The PDFs are shown by their rendered pages
+        context['reading_mode'] = True
+        content = self.object
 
-        topic = Topic.objects.get(pk=topic_id)
+        # Only the neighbours of the content are retrieved from the database
         if self.request.GET.get('coursebook'):
-            course = get_object_or_404(Course, {"pk": self.kwargs['course_id']})
-            contents = [
-                f.content for f in Favorite.objects.filter(
-                    course=course,
-                    user=self.request.user.profile)]  # models
-            # .get_coursebook_flat(get_user(self.request), course)
+            # The primary key of the profile is the primary key of the user
+            favorites = Favorite.objects.filter(course_id=self.kwargs['course_id'],
+                                                user_id=self.request.user.pk).order_by('pk')
+            neighbour_ids = get_neighbour_ids(favorites, content.id, field='content_id')
         else:
-            contents = topic.get_contents(self.request.GET.get('s'), self.request.GET.get('f'))
+            contents = content.topic.get_contents(self.request.GET.get('s'),
+                                                  self.request.GET.get('f'))
+            neighbour_ids = get_neighbour_ids(contents, content.id)
 
-        list_of_content_ids = [content.id for content in contents]
+        # Stay on the content if it is not part of the list
+        if neighbour_ids is None:
+            neighbour_ids = (content.id, content.id)
+        context['previous_id'], context['next_id'] = neighbour_ids
 
-        index_of_content = list_of_content_ids.index(content.id)
-        if index_of_content > 0:
-            context['previous_id'] = list_of_content_ids[index_of_content - 1]
-        else:
-            context['previous_id'] = list_of_content_ids[-1]
-
-        if index_of_content == len(list_of_content_ids) - 1:
-            context['next_id'] = list_of_content_ids[0]
-        else:
-            context['next_id'] = list_of_content_ids[index_of_content + 1]
         if self.request.GET.get('coursebook'):
             context['ending'] = '?coursebook=True'
         elif self.request.GET.get('s'):
@@ -4,6 +4,7 @@ This file describes the frontend views related to course.
 """
 
 import json
+from urllib.parse import urlencode
 
 from django.contrib.auth import get_user
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -12,20 +13,28 @@ from django.contrib import messages
 from django.core.exceptions import ValidationError
 from django.http import HttpResponseRedirect, JsonResponse, HttpResponse, HttpResponseBadRequest
 from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy, reverse
+from django.utils.decorators import method_decorator
 from django.views.generic import DetailView
 from django.views.generic.edit import FormMixin, CreateView, DeleteView, UpdateView
-from django.utils.translation import gettext_lazy as _
+from django.utils.translation import get_language, gettext_lazy as _
 
-from base.models import Course, CourseStructureEntry, Topic
-from base.utils import check_owner_permission
+from base.cache import cache_anonymous_course_page, cached, topic_contents_namespace
+from base.models import Course, CourseSnapshot, CourseStructureEntry, Topic
+from base.utils import check_owner_permission, is_course_owner
 
+from frontend.conditional import page_condition
 from frontend.forms import AddCourseForm, EditCourseForm, FilterAndSortForm
 from frontend.forms.course import TopicChooseForm, CreateTopicForm
 
 from frontend.views.history import Reversion
 from frontend.views.json import JsonHandler
 
+# int: Seconds until a rendered topic is rendered again, the topics are also invalidated
+# on every change of their contents
+TOPIC_CONTENTS_CACHE_TIMEOUT = 60 * 10
+
 
 class DuplicateCourseView(SuccessMessageMixin, LoginRequiredMixin, CreateView):
     """Duplicate course view
@@ -242,7 +251,7 @@ class EditCourseStructureView(DetailView, FormMixin):
         """
         context = super().get_context_data(**kwargs)
         # Json object representing the topics of this course structure
-        json_obj = JsonHandler.topics_structure_to_json(self.object)
+        json_obj = CourseSnapshot.get_for_course(self.object).get_structure_json()
         context['structure'] = json.dumps(json_obj)
         context['topics'] = TopicChooseForm
         return context
@@ -280,6 +289,53 @@ class EditCourseStructureView(DetailView, FormMixin):
         return self.form_invalid(form_create_topic)
 
 
+@cache_anonymous_course_page('pk', FilterAndSortForm)
+def topic_contents(request, pk, topic_id):
+    """Topic contents
+
+    Returns the rendered contents of a topic of the course, sorted and filtered by the
+    options of the filter and sort form given in the request. The rendered contents are
+    cached until one of the contents is changed.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param pk: The id of the course
+    :type pk: int
+    :param topic_id: The id of the topic
+    :type topic_id: int
+
+    :return: the html fragment with the contents of the topic
+    :rtype: HttpResponse
+    """
+    entry = get_object_or_404(CourseStructureEntry.objects.select_related('course'),
+                              course_id=pk, topic_id=topic_id)
+    form = FilterAndSortForm(data={'sort': request.GET.get('sort', 'None'),
+                                   'filter': request.GET.get('filter', 'None')})
+    if not form.is_valid():
+        return HttpResponseBadRequest()
+    sorted_by = form.cleaned_data['sort']
+    filtered_by = form.cleaned_data['filter']
+    # Anonymous users only see the contents which are shown in public courses
+    public = not request.user.is_authenticated
+
+    def render():
+        contents = Topic(pk=topic_id).get_contents(sorted_by, filtered_by)
+        if public:
+            contents = contents.filter(public=True)
+        # The cards are rendered from the cache, so only the order of the contents is needed
+        contents = contents.values_list('pk', flat=True)
+        return render_to_string('frontend/course/topic_contents.html',
+                                {'course': entry.course, 'topic_contents': contents},
+                                request=request)
+
+    html = cached(topic_contents_namespace(topic_id),
+                  (pk, sorted_by, filtered_by, public, get_language()), render,
+                  TOPIC_CONTENTS_CACHE_TIMEOUT)
+    return HttpResponse(html)
+
+
+@method_decorator(cache_anonymous_course_page('pk', FilterAndSortForm), name='dispatch')
+@method_decorator(page_condition('pk'), name='get')
 class CourseView(DetailView, FormMixin):
     """Course list view
 
@@ -320,6 +376,28 @@ class CourseView(DetailView, FormMixin):
         """
         return reverse_lazy('frontend:dashboard')
 
+    def get(self, request, *args, **kwargs):
+        """Get
+
+        Reads the sort and filter options from the query of the request and displays the
+        course.
+
+        :param request: The given request
+        :type request: HttpRequest
+        :param args: The arguments
+        :type args: Any
+        :param kwargs: The keyword arguments
+        :type kwargs: dict[str, Any]
+
+        :return: the rendered course page
+        :rtype: HttpResponse
+        """
+        form = FilterAndSortForm(data=request.GET)
+        if form.is_valid():
+            self.sorted_by = form.cleaned_data['sort']
+            self.filtered_by = form.cleaned_data['filter']
+        return super().get(request, *args, **kwargs)
+
     def post_favourite(self, request):
         """Post favourite
 
@@ -424,29 +502,10 @@ class CourseView(DetailView, FormMixin):
         context = super().get_context_data(**kwargs)
         data = {'filter': self.filtered_by, 'sort': self.sorted_by}
         context['filter_sort'] = FilterAndSortForm(data=data)
-        structure_entries = CourseStructureEntry. \
-            objects.filter(course=context["course"]).order_by('index')
-
-        topics_recursive = []
-        current_topic = None
-        for entry in structure_entries:
-            index_split = entry.index.split('/')
-            # Topic
-            if len(index_split) == 1:
-                current_topic = {'topic': entry.topic, 'subtopics': [],
-                                 'topic_contents': entry.topic.get_contents(self.sorted_by,
-                                                                            self.filtered_by)}
-                topics_recursive.append(current_topic)
-            # Subtopic
-            # Only handle up to one subtopic level
-            else:
-                current_topic["subtopics"].append({'topic': entry.topic,
-                                                   'topic_contents':
-                                                       entry.topic.
-                                                  get_contents(self.sorted_by, self.filtered_by)})
-
-        context["structure"] = topics_recursive
-        context['isCurrentUserOwner'] = self.request.user.profile in context['course'].owners.all()
+        # Only the structure is rendered, the contents of the topics are loaded lazily
+        context["structure"] = CourseSnapshot.get_for_course(context["course"]).structure
+        context['filter_sort_query'] = urlencode(data)
+        context['isCurrentUserOwner'] = is_course_owner(self.request.user, context['course'])
 
         if self.sorted_by is not None:
             context['sorting'] = self.sorted_by
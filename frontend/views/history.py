@@ -7,26 +7,32 @@ to compare the differences between different versions of the same model.
 import re
 
 from builtins import staticmethod
+from collections import defaultdict
 
 from django.contrib.contenttypes.models import ContentType
 from django.core import serializers
-from django.core.files.base import ContentFile
+from django.core.cache import caches
+from django.core.paginator import Paginator
 from django.db import transaction
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
 from django.urls import reverse, reverse_lazy
 from django.utils.safestring import SafeString
-from django.utils.translation import gettext_lazy as _
+from django.utils.translation import get_language, gettext_lazy as _
 
 import reversion
 from reversion.models import Version
 
+from reversion_compare.forms import SelectDiffForm
 from reversion_compare.views import HistoryCompareDetailView
 
-from base.models import Course, Content, Topic
+from base.cache import count
+from base.models import Course, Content
 from content.attachment.models import ImageAttachment
+from content.blobs import BLOB_FIELDS, count_references, get_blob_names
 
-from content.models import ImageContent, TextField, YTVideoContent, PDFContent, Latex, CONTENT_TYPES
-from export.views import generate_pdf_response
+from content.models import ImageContent, TextField, YTVideoContent, PDFContent, Latex
+from content.rendering import needs_rendering, queue_rendering
 
 
 class Reversion:
@@ -77,17 +83,44 @@ class Reversion:
             index += 1
         return diff
 
+    @staticmethod
+    def summarize_field_diff(field_diff):
+        """Summarize field diff
+
+        Replaces the field of a diff entry with the attributes which are displayed, so that
+        the entry can be stored in a cache.
+
+        :param field_diff: The diff entry of a field
+        :type field_diff: dict[str, Any]
+
+        :return: the diff entry with the summarized field
+        :rtype: dict[str, Any]
+        """
+        field = field_diff['field']
+        summary = {'verbose_name': str(getattr(field, 'verbose_name', '') or ''),
+                   'related_name': getattr(field, 'related_name', None),
+                   'help_text': str(getattr(field, 'help_text', '') or '')}
+        return {**field_diff, 'field': summary, 'diff': SafeString(field_diff['diff'])}
+
 
 class BaseHistoryCompareView(HistoryCompareDetailView):
     """Base history compare view
 
       This detail view represents the base history compare view. It defines the default
-      template and needed information for all other compare views.
+      template and needed information for all other compare views. The versions are listed
+      in pages and the diff of a selected pair of versions can be requested by ajax, which
+      only renders the diff.
 
       :attr BaseHistoryCompareView.template_name: The path to the html template
       :type BaseHistoryCompareView.template_name: str
+      :attr BaseHistoryCompareView.diff_template_name: The path to the html template of the diff
+      :type BaseHistoryCompareView.diff_template_name: str
+      :attr BaseHistoryCompareView.paginate_by: The number of versions per page
+      :type BaseHistoryCompareView.paginate_by: int
       """
     template_name = "frontend/history/history.html"
+    diff_template_name = "frontend/history/history_compare_view.html"
+    paginate_by = 50
 
     class Meta:  # pylint: disable=too-few-public-methods
         """Meta options
@@ -114,10 +147,73 @@ class BaseHistoryCompareView(HistoryCompareDetailView):
         self.back_url = back_url
         self.history_url = history_url
 
+    def get_page_context(self):
+        """Page context
+
+        Returns the context of the requested page of versions together with their revisions
+        and users. The two latest versions of the page are preselected for the comparison.
+
+        :return: the context of the page
+        :rtype: dict[str, Any]
+        """
+        versions = self._order_version_queryset(
+            Version.objects.get_for_object(self.object).select_related('revision__user'))
+        page = Paginator(versions, self.paginate_by).get_page(self.request.GET.get('page'))
+        action_list = [{'version': version, 'revision': version.revision} for version in page]
+        if len(action_list) > 1:
+            action_list[0]['first'] = True
+            action_list[1]['second'] = True
+        return {'action_list': action_list, 'comparable': len(action_list) > 1,
+                'compare_view': True, 'page_obj': page, 'paginator': page.paginator}
+
+    def get_compare_context(self):
+        """Compare context
+
+        Returns the context of the diff between the versions selected in the request and
+        the links to the diffs of the previous and next versions.
+
+        :return: the context of the diff
+        :rtype: dict[str, Any]
+        """
+        form = SelectDiffForm(self.request.GET)
+        if not form.is_valid():
+            raise Http404("Wrong version IDs.")
+        version_id1, version_id2 = sorted((form.cleaned_data['version_id1'],
+                                           form.cleaned_data['version_id2']))
+
+        versions = Version.objects.get_for_object(self.object)
+        version1 = get_object_or_404(versions, pk=version_id1)
+        version2 = get_object_or_404(versions, pk=version_id2)
+        compare_data, has_unfollowed_fields = self.compare(self.object, version1, version2)
+        context = {'compare_data': compare_data, 'has_unfollowed_fields': has_unfollowed_fields,
+                   'version1': version1, 'version2': version2}
+
+        next_version = versions.filter(pk__gt=version_id2).last()
+        if next_version:
+            context['next_url'] = f'?version_id1={version2.pk:d}&version_id2={next_version.pk:d}'
+        prev_version = versions.filter(pk__lt=version_id1).first()
+        if prev_version:
+            context['prev_url'] = f'?version_id1={prev_version.pk:d}&version_id2={version1.pk:d}'
+        return context
+
+    def get_template_names(self):
+        """Template names
+
+        Returns the template of the diff for ajax requests and the template of the history
+        otherwise.
+
+        :return: the names of the templates
+        :rtype: list[str]
+        """
+        if self.request.is_ajax():
+            return [self.diff_template_name]
+        return super().get_template_names()
+
     def get_context_data(self, **kwargs):
         """Context data
 
-        Returns the context data of the history.
+        Returns the context data of the history. The page of versions is only loaded for the
+        history, the diff is only computed if versions were selected.
 
         :param kwargs: The keyword arguments
         :type kwargs: dict[str, Any]
@@ -125,7 +221,12 @@ class BaseHistoryCompareView(HistoryCompareDetailView):
         :return: the context data of the history
         :rtype: dict[str, Any]
         """
-        context = super().get_context_data()
+        # The context of HistoryCompareDetailView is replaced because it lists all versions
+        context = super(HistoryCompareDetailView, self).get_context_data(**kwargs)
+        if not self.request.is_ajax():
+            context.update(self.get_page_context())
+        if 'version_id1' in self.request.GET:
+            context.update(self.get_compare_context())
         context['back_url'] = self.get_url(self.back_url)  # pylint: disable=assignment-from-no-return
         context['history_url'] = self.get_url(self.history_url)  # pylint: disable=assignment-from-no-return
         return context
@@ -145,10 +246,59 @@ class BaseHistoryCompareView(HistoryCompareDetailView):
     def compare(self, obj, version1, version2):
         """Compare two versions of an object
 
+        Returns the diff of the object between version1 and version2. The versions of an
+        object never change, so the diff is computed only once per pair of versions and then
+        read from the persistent history cache.
+
+        :param obj: The object to compare
+        :type obj: Model
+        :param version1: The first version to compare
+        :type version1: Version
+        :param version2: The second version to compare
+        :type version2: Version
+
+        :return: A diff of every changed field values
+        :rtype: list(dict(str, any)), bool
+        """
+        label = obj._meta.label_lower  # pylint: disable=protected-access
+        # The verbose names of the fields are translated
+        key = f'history-diff:{label}:{obj.pk}:{version1.pk}:{version2.pk}:{get_language()}'
+        result = caches['history'].get(key)
+        if result is not None:
+            count('history-diff', hits=1)
+        else:
+            count('history-diff', misses=1)
+            diff, has_unfollowed_fields = self.create_diff(obj, version1, version2)
+            result = [Reversion.summarize_field_diff(field) for field in diff], \
+                has_unfollowed_fields
+            caches['history'].set(key, result)
+        return result
+
+    def create_diff(self, obj, version1, version2):
+        """Create diff
+
+        Computes the diff of the object between version1 and version2. Views with objects
+        that consist of several models should override this method.
+
+        :param obj: The object to compare
+        :type obj: Model
+        :param version1: The first version to compare
+        :type version1: Version
+        :param version2: The second version to compare
+        :type version2: Version
+
+        :return: A diff of every changed field values
+        :rtype: list(dict(str, any)), bool
+        """
+        return self.compare_object(obj, version1, version2)
+
+    def compare_object(self, obj, version1, version2):
+        """Compare two versions of a single object
+
         Create a generic html diff from the obj between version1 and version2
 
         :param obj: The object to compare
-        :type obj: BaseContentModel
+        :type obj: Model
         :param version1: The first version to compare
         :type version1: Version
         :param version2: The second version to compare
@@ -201,10 +351,11 @@ class BaseContentHistoryCompareView(BaseHistoryCompareView):
         content_id = self.get_object().pk
         return reverse(f'frontend:{value}', args=(course_id, topic_id, content_id,))
 
-    def compare(self, obj, version1, version2):
-        """Compare two versions of an object
+    def create_diff(self, obj, version1, version2):
+        """Create diff
 
-        Create a generic html diff from the obj between version1 and version2
+        Computes the diff of the content, the type specific content and the image
+        attachments between version1 and version2.
 
         :param obj: The object to compare
         :type obj: BaseContentModel
@@ -221,8 +372,8 @@ class BaseContentHistoryCompareView(BaseHistoryCompareView):
         obj_version1 = versions.get(revision=version1.revision)
         obj_version2 = versions.get(revision=version2.revision)
 
-        diff, has_unfollowed_fields = super().compare(content, obj_version1, obj_version2)
-        diff2, has_unfollowed_fields2 = super().compare(obj, version1, version2)
+        diff, has_unfollowed_fields = self.compare_object(content, obj_version1, obj_version2)
+        diff2, has_unfollowed_fields2 = self.compare_object(obj, version1, version2)
 
         diff += diff2
         has_unfollowed_fields = has_unfollowed_fields or has_unfollowed_fields2
@@ -234,9 +385,9 @@ class BaseContentHistoryCompareView(BaseHistoryCompareView):
         versions2 = version2.revision.version_set.filter(content_type=content_type).order_by('object_id')[::1]
         index = 1
         for attachment_version1, attachment_version2 in zip(versions1, versions2):
-            diff2, has_unfollowed_fields2 = super().compare(ImageAttachment(),
-                                                            attachment_version1,
-                                                            attachment_version2)
+            diff2, has_unfollowed_fields2 = self.compare_object(ImageAttachment(),
+                                                                attachment_version1,
+                                                                attachment_version2)
             for field in diff2:
                 field['attachment'] = index
             index += 1
@@ -272,45 +423,77 @@ class BaseContentHistoryCompareView(BaseHistoryCompareView):
         pk = self.kwargs['pk']  # pylint: disable=invalid-name
         ver_pk = request.POST.get('ver_pk')
         with transaction.atomic(), reversion.create_revision():
-            versions = Version.objects.get(pk=ver_pk).revision.version_set.all()
-
-            # revert added attachments
-            content = Content.objects.get(pk=pk)
-            content_type = ContentType.objects.get(model='imageattachment')
-            for attachment in content.ImageAttachments.all():
-                if not versions.filter(content_type=content_type, object_id=attachment.pk).exists():
-                    attachment.delete()
-
-            for version in versions:
-                date_time = version.revision.date_created.strftime("%d. %b. %Y, %H:%M")
-                reversion.set_comment(_("Reverted to Version: %s") % date_time)
-
-                for deserialized_obj in serializers.deserialize('json', version.serialized_data):
-                    if isinstance(deserialized_obj.object, Content):
-                        # Revert deletes author and topic, so set it manually
-                        content = Content.objects.get(pk=pk)
-                        deserialized_obj.object.author_id = content.author_id
-                        deserialized_obj.object.topic_id = content.topic_id
-                        deserialized_obj.object.type = content.type
-                    elif isinstance(deserialized_obj.object, Latex):
-                        deserialized_obj.object.save()
-                        topic = Topic.objects.get(pk=topic_id)
-                        pdf = generate_pdf_response(request.user.profile,
-                                                    deserialized_obj.object.content)
-                        deserialized_obj.object.pdf.save(f"{topic}" + ".pdf", ContentFile(pdf))
-                    elif isinstance(deserialized_obj.object, ImageAttachment):
-                        deserialized_obj.object.content_id = pk
-                    deserialized_obj.save()
+            revision = Version.objects.select_related('revision').get(pk=ver_pk).revision
+            date_time = revision.date_created.strftime("%d. %b. %Y, %H:%M")
+            reversion.set_comment(_("Reverted to Version: %s") % date_time)
 
             content = Content.objects.get(pk=pk)
-            content.preview = CONTENT_TYPES.get(content.type) \
-                .objects.get(pk=content.pk).generate_preview()
+            self.revert_revision(content, revision)
+            # The PDF and the preview are rendered after the commit to keep the lock short
+            if needs_rendering(content):
+                content.render_status = Content.RENDER_PENDING
+                queue_rendering(content.pk, request.user.profile.pk)
             content.save()
 
         return HttpResponseRedirect(reverse_lazy(
             'frontend:content',
             args=(self.kwargs['course_id'], topic_id, pk,)))
 
+    @staticmethod
+    def revert_revision(content, revision):
+        """Revert revision
+
+        Restores the versioned fields of the content and saves the type specific content and
+        the image attachments of the revision in bulk. Attachments which were added after the
+        revision are deleted. The content itself is saved by the caller. The references to
+        the files are counted again because bulk saves do not send signals.
+
+        :param content: The content to revert
+        :type content: Content
+        :param revision: The revision to revert to
+        :type revision: Revision
+        """
+        instances = defaultdict(list)
+        fields = {}
+        for version in revision.version_set.select_related('content_type'):
+            model = version.content_type.model_class()
+            field_dict = version.field_dict
+            if model is Content:
+                # Only the versioned fields are restored, so author, topic and type are kept
+                content.tags.set(field_dict.pop('tags', []))
+                for name, value in field_dict.items():
+                    setattr(content, name, value)
+                continue
+            if model is ImageAttachment:
+                field_dict['content_id'] = content.pk
+            instance = model(**field_dict)
+            instance.pk = int(version.object_id)
+            instances[model].append(instance)
+            fields[model] = [name for name in field_dict if name != model._meta.pk.attname]
+
+        # Revert added attachments
+        content.ImageAttachments \
+            .exclude(pk__in=[attachment.pk for attachment in instances.get(ImageAttachment, [])]) \
+            .delete()
+
+        blob_names = set()
+        for model, objects in instances.items():
+            existing = set(model.objects.filter(pk__in=[obj.pk for obj in objects])
+                           .values_list('pk', flat=True))
+            if model in BLOB_FIELDS:
+                for names in model.objects.filter(pk__in=existing) \
+                        .values_list(*BLOB_FIELDS[model]):
+                    blob_names.update(names)
+                for obj in objects:
+                    blob_names.update(get_blob_names(obj))
+            model.objects.bulk_update([obj for obj in objects if obj.pk in existing],
+                                      fields[model])
+            model.objects.bulk_create([obj for obj in objects if obj.pk not in existing])
+            # Bulk saves do not send the signals which add the objects to the revision
+            for obj in objects:
+                reversion.add_to_revision(obj)
+        count_references(blob_names)
+
 
 class BaseCourseHistoryCompareView(BaseHistoryCompareView):
     """Base course history compare view
@@ -366,7 +549,9 @@ class BaseCourseHistoryCompareView(BaseHistoryCompareView):
             date_time = version.revision.date_created.strftime("%d. %b. %Y, %H:%M")
             reversion.set_comment(_("Reverted to Version: %s") % date_time)
 
-            for deserialized_obj in serializers.deserialize('json', version.serialized_data):
+            # Compacted versions are stored in a compressed format
+            for deserialized_obj in serializers.deserialize(version.format,
+                                                            version.serialized_data):
                 if isinstance(deserialized_obj.object, Course):
                     # Revert deletes category and period, so set it manually
                     course = Course.objects.get(pk=pk)
@@ -5,7 +5,7 @@ This file describes the json handling on resources needed for frontend views.
 
 from django.core.exceptions import ValidationError
 
-from base.models import CourseStructureEntry, Topic
+from base.models import CourseSnapshot, CourseStructureEntry, Topic
 
 
 class JsonHandler:
@@ -97,6 +97,8 @@ class JsonHandler:
                                                   sub_index=sub_index + 1)
         # Clean topic fragments
         JsonHandler.clean_structure_topic(course=course, index=index + 1)
+        # Updates of the entries do not send signals
+        CourseSnapshot.invalidate([course_id])
         return True
 
     @staticmethod
@@ -0,0 +1,199 @@
+"""Purpose of this file
+
+This file describes the frontend view which serves the protected media. The access is
+checked by Django, the transfer of the file is handed to the web server if the setting
+MEDIA_SENDFILE names a header, e.g. X-Sendfile of Apache or X-Accel-Redirect of nginx.
+"""
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import SuspiciousFileOperation
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, \
+    StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+from base.models import Category, Content, Course, Profile
+from base.storage import get_source_name
+from content.blobs import BLOB_FIELDS
+
+# Pattern: The value of a Range header requesting a single range of bytes
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# int: The number of bytes which are read at once when a range is streamed
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+def is_public_media(name):
+    """Is public media
+
+    Returns if the file may be served to anonymous users. These are the title images and
+    the profile pictures and the files of contents which are shown in public courses,
+    including the files derived from their PDFs.
+
+    :param name: The name of the file
+    :type name: str
+
+    :return: true iff the file is public
+    :rtype: bool
+    """
+    # A file derived from a PDF is public if the PDF is public
+    name = get_source_name(name) or name
+    if Course.objects.filter(image=name).exists() \
+            or Category.objects.filter(image=name).exists() \
+            or Profile.objects.filter(pic=name).exists():
+        return True
+
+    lookups = Q()
+    for model, fields in BLOB_FIELDS.items():
+        prefix = '' if model is Content \
+            else model._meta.get_field('content').related_query_name() + '__'
+        for field in fields:
+            lookups |= Q(**{prefix + field: name})
+    return Content.objects.filter(lookups, public=True).exists()
+
+
+def parse_range(header, size):
+    """Parse range
+
+    Returns the range of bytes requested by the Range header. Multiple ranges are not
+    supported, in this case the whole file is served.
+
+    :param header: The value of the Range header
+    :type header: str or None
+    :param size: The size of the file
+    :type size: int
+
+    :return: the start and the exclusive end of the range or None for the whole file
+    :rtype: tuple[int, int] or None
+    """
+    match = RANGE_PATTERN.match(header or '')
+    if match is None or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # A suffix range requests the last bytes of the file
+        return max(size - int(last), 0), size
+    start = int(first)
+    end = size if not last else min(int(last) + 1, size)
+    if start >= size or start >= end:
+        raise ValueError('Range not satisfiable.')
+    return start, end
+
+
+def read_range(file, start, end):
+    """Read range
+
+    Yields the bytes of the file between start and end in chunks and closes the file.
+
+    :param file: The opened file
+    :type file: BinaryIO
+    :param start: The start of the range
+    :type start: int
+    :param end: The exclusive end of the range
+    :type end: int
+
+    :return: the chunks of the range
+    :rtype: Iterator[bytes]
+    """
+    with file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def stream_file(request, path, stat):
+    """Stream file
+
+    Returns the response which streams the file by Django, including the requested range.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param path: The path of the file
+    :type path: str
+    :param stat: The status of the file
+    :type stat: os.stat_result
+
+    :return: the response containing the file or its range
+    :rtype: HttpResponse
+    """
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                              stat.st_mtime, stat.st_size):
+        return HttpResponseNotModified()
+    try:
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'))
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(read_range(open(path, 'rb'), start, end), status=206)
+        response['Content-Length'] = end - start
+        response['Content-Range'] = f'bytes {start}-{end - 1}/{stat.st_size}'
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Serve media
+
+    Serves a file of the media after checking the access. Anonymous users may only access
+    public files and are redirected to the login otherwise. The file is transferred by the
+    web server if a sendfile header is configured, which also answers Range requests.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param path: The name of the file in the media
+    :type path: str
+
+    :return: the response containing the file
+    :rtype: HttpResponse
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, ValueError, OSError) as error:
+        raise Http404 from error
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    # Logged in users may access all contents, so the file is only looked up for anonymous users
+    public = not request.user.is_authenticated
+    if public and not is_public_media(path):
+        return redirect_to_login(request.get_full_path())
+
+    header = settings.MEDIA_SENDFILE['HEADER']
+    if header is None:
+        response = stream_file(request, full_path, stat)
+    else:
+        response = HttpResponse()
+        if header == 'X-Accel-Redirect':
+            response[header] = quote(settings.MEDIA_SENDFILE['LOCATION'] + path)
+        else:
+            response[header] = full_path
+    response['Content-Type'] = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    response['Accept-Ranges'] = 'bytes'
+    if public:
+        patch_cache_control(response, public=True)
+    else:
+        patch_cache_control(response, private=True)
+    return response
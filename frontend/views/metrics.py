@@ -0,0 +1,30 @@
+"""Purpose of this file
+
+This file describes the frontend view which exposes the metrics of the requests to
+Prometheus.
+"""
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_safe
+
+from base.metrics import render_metrics
+
+
+@require_safe
+def metrics(request):
+    """Metrics
+
+    Returns the metrics of all processes of the server in the text format of Prometheus.
+    The metrics are only shown to the addresses of the setting METRICS and to staff users.
+
+    :param request: The given request
+    :type request: HttpRequest
+
+    :return: the metrics
+    :rtype: HttpResponse
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS['ALLOWED_IPS'] \
+            and not request.user.is_staff:
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
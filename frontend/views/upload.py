@@ -0,0 +1,81 @@
+"""Purpose of this file
+
+This file describes the frontend views of the chunked uploads of large PDFs and images.
+"""
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods, require_POST
+
+from content.forms import ChunkedUploadForm
+from content.models import ChunkedUpload
+from content.upload import append_chunk, delete_expired_uploads, parse_content_range
+
+
+@login_required
+@require_POST
+def start_upload(request):
+    """Start upload
+
+    Starts a chunked upload of the file described by the request.
+
+    :param request: The given request
+    :type request: HttpRequest
+
+    :return: the id of the upload and the size of its chunks
+    :rtype: JsonResponse
+    """
+    form = ChunkedUploadForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    delete_expired_uploads()
+    upload = form.save(commit=False)
+    upload.user_id = request.user.pk
+    upload.save()
+    return JsonResponse({'id': str(upload.pk),
+                         'offset': 0,
+                         'chunk_size': settings.CHUNKED_UPLOAD['CHUNK_SIZE']}, status=201)
+
+
+@login_required
+@require_http_methods(['GET', 'PUT'])
+def upload_chunk(request, pk):  # pylint: disable=invalid-name
+    """Upload chunk
+
+    Appends the chunk of the request with a Content-Range header to the upload. A chunk
+    which does not start at the current offset of the upload is rejected with the status
+    409, so that the client can resume the upload at the returned offset. A GET request
+    returns the current offset.
+
+    :param request: The given request
+    :type request: HttpRequest
+    :param pk: The id of the upload
+    :type pk: UUID
+
+    :return: the offset of the upload and if it is complete
+    :rtype: JsonResponse
+    """
+    upload = get_object_or_404(ChunkedUpload, pk=pk, user_id=request.user.pk)
+    offset = upload.offset
+    if request.method == 'PUT':
+        try:
+            start, end = parse_content_range(request.META.get('HTTP_CONTENT_RANGE'), upload)
+        except ValidationError as error:
+            return JsonResponse({'errors': error.messages, 'offset': offset}, status=400)
+        if start != offset:
+            return JsonResponse({'offset': offset}, status=409)
+
+        data = request.body
+        if len(data) != end - start:
+            return JsonResponse({'errors': ['Incomplete chunk.'], 'offset': offset}, status=400)
+        try:
+            append_chunk(upload, start, data)
+        except ValidationError as error:
+            # A rejected upload stays empty and is deleted once it expired
+            return JsonResponse({'errors': error.messages, 'offset': offset}, status=400)
+        offset = end
+    return JsonResponse({'offset': offset, 'complete': offset == upload.size})
@@ -0,0 +1,115 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/models/snapshot.py.
+"""
+
+from test import utils
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+
+from base.models import CourseSnapshot, CourseStructureEntry, Rating, Tag
+from frontend.views.json import JsonHandler
+
+
+class CourseSnapshotTestCase(TestCase):
+    """Course snapshot test case
+
+    Defines the test cases for the model CourseSnapshot.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a course containing a topic with a subtopic.
+        """
+        self.user = User.objects.create(username='user')
+        self.topic = utils.create_topic()
+        self.subtopic = utils.create_topic(title="Subtopic", category=self.topic.category)
+        self.course = utils.create_course(category=self.topic.category, topics=[self.topic])
+        CourseStructureEntry.objects.create(course=self.course, index='1/1',
+                                            topic=self.subtopic)
+        self.content = utils.create_content('Textfield', self.subtopic, self.user,
+                                            description='Content')
+
+    def test_structure(self):
+        """Structure test case
+
+        Tests that the snapshot contains the ordered topics with their contents.
+        """
+        structure = CourseSnapshot.get_for_course(self.course).structure
+        self.assertEqual(len(structure), 1)
+        self.assertEqual(structure[0]['id'], self.topic.id)
+        self.assertEqual(structure[0]['content_count'], 0)
+        subtopic = structure[0]['subtopics'][0]
+        self.assertEqual(subtopic['value'], str(self.subtopic))
+        self.assertEqual(subtopic['content_count'], 1)
+        self.assertEqual(subtopic['contents'][0], {
+            'id': self.content.id, 'type': 'Textfield', 'description': 'Content',
+            'language': 'de', 'public': False,
+        })
+
+    def test_single_query(self):
+        """Single query test case
+
+        Tests that a built snapshot is read with a single query.
+        """
+        CourseSnapshot.build(self.course)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(CourseSnapshot.get_for_course(self.course).structure), 1)
+
+    def test_invalidation(self):
+        """Invalidation test case
+
+        Tests that the snapshot is rebuilt after the course or its contents were changed
+        and that it is kept when a content is rated or tagged.
+        """
+        CourseSnapshot.build(self.course)
+        Rating.objects.create(content=self.content, user=self.user.profile, rating=2)
+        self.content.tags.add(Tag.objects.create(title='Tag'))
+        self.assertTrue(CourseSnapshot.objects.filter(course=self.course).exists())
+
+        self.content.save()
+        self.assertFalse(CourseSnapshot.objects.filter(course=self.course).exists())
+
+        CourseSnapshot.build(self.course)
+        self.subtopic.title = 'Renamed'
+        self.subtopic.save()
+        structure = CourseSnapshot.get_for_course(self.course).structure
+        self.assertEqual(structure[0]['subtopics'][0]['title'], 'Renamed')
+
+        JsonHandler.json_to_topics_structure(self.course, [{'id': self.subtopic.id}])
+        structure = CourseSnapshot.get_for_course(self.course).structure
+        self.assertEqual([topic['id'] for topic in structure], [self.subtopic.id])
+
+    def test_structure_json(self):
+        """Structure json test case
+
+        Tests that the structure json matches the json of the course structure.
+        """
+        snapshot = CourseSnapshot.get_for_course(self.course)
+        self.assertEqual(snapshot.get_structure_json(),
+                         JsonHandler.topics_structure_to_json(self.course))
+        self.assertEqual(snapshot.get_content_ids(), [self.content.id])
+
+
+class CourseSnapshotCommitTestCase(TransactionTestCase):
+    """Course snapshot commit test case
+
+    Defines the test cases for the invalidation of the snapshots within a transaction.
+    """
+
+    def test_invalidate_on_commit(self):
+        """Invalidate on commit test case
+
+        Tests that a snapshot built before the commit of the invalidating transaction is
+        deleted after the commit.
+        """
+        course = utils.create_course()
+        CourseSnapshot.build(course)
+        with transaction.atomic():
+            CourseSnapshot.invalidate([course.pk])
+            # Another request rebuilds the snapshot from the previous data
+            CourseSnapshot.build(course)
+        self.assertFalse(CourseSnapshot.objects.filter(course=course).exists())
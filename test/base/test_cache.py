@@ -0,0 +1,111 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/cache.py.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase
+
+from base.cache import bump_version, cached, count, flush_statistics, get_statistics, \
+    get_version, get_version_date, invalidate_version, reset_statistics
+
+
+class CacheTestCase(SimpleTestCase):
+    """Cache test case
+
+    Defines the test cases for the namespaced cache and its statistics.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Clears the cache and the statistics.
+        """
+        cache.clear()
+        reset_statistics()
+        self.computed = 0
+
+    def compute(self):
+        """Compute
+
+        Counts the computations of a cached value.
+
+        :return: the number of computations
+        :rtype: int
+        """
+        self.computed += 1
+        return self.computed
+
+    def test_cached(self):
+        """Cached test case
+
+        Tests that the values are computed once per version of the namespace.
+        """
+        self.assertEqual(cached('topic-contents:1', (1, 'de'), self.compute), 1)
+        self.assertEqual(cached('topic-contents:1', (1, 'de'), self.compute), 1)
+        self.assertEqual(cached('topic-contents:1', (2, 'de'), self.compute), 2)
+        self.assertEqual(cached('topic-contents:2', (1, 'de'), self.compute), 3)
+        bump_version('topic-contents:1')
+        self.assertEqual(cached('topic-contents:1', (1, 'de'), self.compute), 4)
+
+    def test_statistics(self):
+        """Statistics test case
+
+        Tests that the hits and misses are counted by the kinds of the namespaces.
+        """
+        cached('topic-contents:1', (1,), self.compute)
+        cached('topic-contents:1', (1,), self.compute)
+        cached('topic-contents:2', (1,), self.compute)
+        count('content-card', hits=5, misses=2)
+        self.assertEqual(get_statistics(), {})
+
+        flush_statistics()
+        flush_statistics()
+        self.assertEqual(get_statistics(), {'content-card': {'hits': 5, 'misses': 2},
+                                            'topic-contents': {'hits': 1, 'misses': 2}})
+        count('content-card', hits=1)
+        flush_statistics()
+        self.assertEqual(get_statistics()['content-card'], {'hits': 6, 'misses': 2})
+
+        reset_statistics()
+        self.assertEqual(get_statistics(), {})
+
+
+    def test_version_date(self):
+        """Version date test case
+
+        Tests that the date when a namespace was invalidated is read from its version.
+        """
+        before = datetime.now(timezone.utc)
+        bump_version('course-pages:1')
+        date = get_version_date(get_version('course-pages:1'))
+        self.assertLessEqual(before - timedelta(milliseconds=1), date)
+        self.assertLessEqual(date, datetime.now(timezone.utc))
+        self.assertIsNone(get_version_date('0123456789abcdef'))
+
+
+class InvalidateVersionTestCase(TransactionTestCase):
+    """Invalidate version test case
+
+    Defines the test cases for the invalidation of a namespace within a transaction.
+    """
+
+    def test_invalidate_version(self):
+        """Invalidate version test case
+
+        Tests that the entries cached from the previous data while the transaction is open
+        are dropped after the commit.
+        """
+        cache.clear()
+        previous = get_version('topic-contents:1')
+        with transaction.atomic():
+            invalidate_version('topic-contents:1')
+            pending = get_version('topic-contents:1')
+            self.assertNotEqual(pending, previous)
+            # Another request caches the previous data under the new version
+            self.assertEqual(cached('topic-contents:1', (1,), lambda: 'stale'), 'stale')
+        self.assertNotIn(get_version('topic-contents:1'), (previous, pending))
+        self.assertEqual(cached('topic-contents:1', (1,), lambda: 'fresh'), 'fresh')
@@ -0,0 +1,61 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/database.py.
+"""
+
+import os
+import tempfile
+
+from django.db import OperationalError, connection
+from django.test import TestCase
+
+from base.database import is_locked_error, write_lock
+
+
+class DatabaseTestCase(TestCase):
+    """Database test case
+
+    Defines the test cases for the configuration of the connections and the write lock.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up a temporary lock file.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.lock_file = os.path.join(directory.name, 'db.write.lock')
+
+    def test_pragmas(self):
+        """Pragmas test case
+
+        Tests that the pragmas of the settings are applied to the connection.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            # NORMAL
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_locked_error(self):
+        """Locked error test case
+
+        Tests that only the errors of a locked database are recognized.
+        """
+        self.assertTrue(is_locked_error(OperationalError('database is locked')))
+        self.assertFalse(is_locked_error(OperationalError('no such table: base_course')))
+        self.assertFalse(is_locked_error(ValueError('locked')))
+
+    def test_write_lock(self):
+        """Write lock test case
+
+        Tests that the write lock is held exclusively and released after the block.
+        """
+        with write_lock(self.lock_file, timeout=1) as acquired:
+            self.assertTrue(acquired)
+            with write_lock(self.lock_file, timeout=0) as other:
+                self.assertFalse(other)
+        with write_lock(self.lock_file, timeout=0) as acquired:
+            self.assertTrue(acquired)
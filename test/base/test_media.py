@@ -0,0 +1,126 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/media.py.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from test import utils
+
+from django.conf import settings
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+import reversion
+
+from base.media import find_orphaned_files, walk_media
+from base.models import Category, MediaBlob
+from content.models import PDFContent
+
+# str: The temporary media directory
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_GRACE_HOURS=24,
+                   CHUNKED_UPLOAD={**settings.CHUNKED_UPLOAD,
+                                   'ROOT': os.path.join(MEDIA_ROOT, 'chunks')})
+class CleanMediaTestCase(TestCase):
+    """Clean media test case
+
+    Defines the test cases for the collection of the orphaned files of the media.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the media with referenced, orphaned and recent files.
+        """
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        user = User.objects.create(username='user')
+        category = Category.objects.create(title="Category", image='uploads/category.png')
+        content = utils.create_content(PDFContent.TYPE, utils.create_topic(category=category),
+                                       user)
+        with reversion.create_revision():
+            pdf = PDFContent.objects.create(content=content, pdf='uploads/old.pdf', source='src')
+        pdf.pdf = 'uploads/new.pdf'
+        pdf.save()
+        MediaBlob.objects.create(name='uploads/orphan.pdf', size=6)
+
+        self.old_files = ['uploads/category.png', 'uploads/old.pdf', 'uploads/new.pdf',
+                          'uploads/orphan.pdf', 'uploads/previews/orphan.jpg', 'chunks/x.part']
+        for name in self.old_files + ['uploads/recent.pdf']:
+            self.write_file(name, old=name in self.old_files)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down class
+
+        Deletes the media after running the tests.
+        """
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    @staticmethod
+    def write_file(name, old):
+        """Write file
+
+        Writes a file of the media which was modified two days ago if it is old.
+
+        :param name: The name of the file
+        :type name: str
+        :param old: If the file is older than the grace period
+        :type old: bool
+        """
+        path = os.path.join(MEDIA_ROOT, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(b'orphan')
+        if old:
+            modified = time.time() - 48 * 60 * 60
+            os.utime(path, (modified, modified))
+
+    def test_walk_media(self):
+        """Walk media test case
+
+        Tests that all files below the media are walked except the excluded directories.
+        """
+        names = {name for name, _ in walk_media(MEDIA_ROOT,
+                                                {os.path.join(MEDIA_ROOT, 'chunks')})}
+        self.assertEqual(names, set(self.old_files[:-1]) | {'uploads/recent.pdf'})
+
+    def test_find_orphaned_files(self):
+        """Find orphaned files test case
+
+        Tests that only unreferenced files older than the grace period are found, files
+        referenced by the history are kept.
+        """
+        self.assertEqual(sorted(find_orphaned_files()),
+                         [('uploads/orphan.pdf', 6), ('uploads/previews/orphan.jpg', 6)])
+        self.assertEqual(len(list(find_orphaned_files(grace_hours=0))), 3)
+
+    def test_dry_run(self):
+        """Dry run test case
+
+        Tests that the dry run only reports the reclaimable files.
+        """
+        out = StringIO()
+        call_command('cleanmedia', '--dry-run', stdout=out)
+        self.assertIn("2 files would be deleted", out.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(MEDIA_ROOT, 'uploads/orphan.pdf')))
+
+    def test_clean(self):
+        """Clean test case
+
+        Tests that the orphaned files are deleted together with their blobs.
+        """
+        out = StringIO()
+        call_command('cleanmedia', stdout=out)
+        self.assertIn("Deleted 2 files", out.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(MEDIA_ROOT, 'uploads/orphan.pdf')))
+        self.assertTrue(os.path.exists(os.path.join(MEDIA_ROOT, 'uploads/old.pdf')))
+        self.assertTrue(os.path.exists(os.path.join(MEDIA_ROOT, 'uploads/recent.pdf')))
+        self.assertFalse(MediaBlob.objects.exists())
@@ -0,0 +1,92 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/metrics.py.
+"""
+
+import json
+import os
+import tempfile
+
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, override_settings
+
+from base.metrics import PROGRAM_DURATION, TEMPLATE_DURATION, Histogram, collect, \
+    finish_request, render_metrics, start_request, time_program, write_snapshot
+
+
+class MetricsTestCase(SimpleTestCase):
+    """Metrics test case
+
+    Defines the test cases for the histograms and their exposition.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up a temporary directory of the snapshots.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        override = override_settings(METRICS={'DIRECTORY': self.directory, 'SECONDS': 10,
+                                              'ALLOWED_IPS': []})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_histogram(self):
+        """Histogram test case
+
+        Tests that the values are counted in the buckets of their upper bounds.
+        """
+        histogram = Histogram('test', "Test.", ('view',), (1, 5))
+        for value in (0.5, 1, 3, 7):
+            histogram.observe(('a',), value)
+        self.assertEqual(histogram.snapshot(), [[['a'], [2, 1, 1, 11.5]]])
+
+    def test_collect(self):
+        """Collect test case
+
+        Tests that the snapshots of the other processes are added to the own observations.
+        """
+        PROGRAM_DURATION.observe(('test-program',), 2)
+        write_snapshot()
+        with open(os.path.join(self.directory, f'{os.getpid()}.json')) as file:
+            snapshot = json.load(file)
+        # A snapshot of another process and a file which is being written
+        with open(os.path.join(self.directory, '1.json'), 'w') as file:
+            json.dump(snapshot, file)
+        with open(os.path.join(self.directory, '2.json.1.tmp'), 'w') as file:
+            json.dump(snapshot, file)
+
+        PROGRAM_DURATION.observe(('test-program',), 2)
+        own = {tuple(labels): values for labels, values in PROGRAM_DURATION.snapshot()}
+        other = {tuple(labels): values for labels, values in snapshot[PROGRAM_DURATION.name]}
+        collected = collect()[PROGRAM_DURATION.name][('test-program',)]
+        self.assertEqual(collected[-1], own[('test-program',)][-1]
+                         + other[('test-program',)][-1])
+
+        text = render_metrics()
+        self.assertIn('# TYPE collab_program_duration_seconds histogram', text)
+        self.assertIn('collab_program_duration_seconds_bucket{program="test-program",le="+Inf"}',
+                      text)
+
+    def test_program(self):
+        """Program test case
+
+        Tests that the wall time of a program is observed.
+        """
+        with time_program('test-timed'):
+            pass
+        self.assertIn(['test-timed'], [labels for labels, _ in PROGRAM_DURATION.snapshot()])
+
+    def test_template(self):
+        """Template test case
+
+        Tests that the rendering of the templates is added to the metrics of the request.
+        """
+        metrics = start_request()
+        render_to_string('content/view/pages.html', {'pages': []})
+        self.assertGreater(metrics.template_time, 0)
+        self.assertFalse(metrics.rendering)
+        finish_request('test-template', 'GET', 200, 0.1)
+        self.assertIn(['test-template'], [labels for labels, _ in TEMPLATE_DURATION.snapshot()])
@@ -0,0 +1,153 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/middleware.py.
+"""
+
+import os
+import tempfile
+
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from base.middleware import PrimaryPinningMiddleware, WriteSerializerMiddleware
+from base.routers import is_pinned
+
+
+class WriteSerializerMiddlewareTestCase(TestCase):
+    """Write serializer middleware test case
+
+    Defines the test cases for the serialization and the retries of the write requests.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the middleware with a view which fails while the database is locked.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings = {'LOCK_FILE': os.path.join(directory.name, 'db.write.lock'),
+                         'TIMEOUT': 1, 'RETRIES': 2, 'VIEWS': ['frontend:content-edit'],
+                         'GET_VIEWS': ['frontend:rating']}
+        self.calls = 0
+        self.locked_calls = 0
+        self.middleware = WriteSerializerMiddleware(self.get_response)
+        self.factory = RequestFactory()
+
+    def get_response(self, request):
+        """Get response
+
+        Responds like a view which fails because of a locked database for the first calls.
+
+        :param request: The given request
+        :type request: HttpRequest
+
+        :return: the response
+        :rtype: HttpResponse
+        """
+        self.calls += 1
+        if self.calls <= self.locked_calls:
+            self.middleware.process_exception(request, OperationalError('database is locked'))
+            return HttpResponse(status=500)
+        return HttpResponse()
+
+    def test_retry(self):
+        """Retry test case
+
+        Tests that a write request is retried until the database is not locked anymore.
+        """
+        self.locked_calls = 2
+        with override_settings(SQLITE_WRITE_SERIALIZER=self.settings):
+            response = self.middleware(self.factory.post('/courses/1/topic/1/content/1/edit/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls, 3)
+
+    def test_retries_exceeded(self):
+        """Retries exceeded test case
+
+        Tests that the error is returned once the retries are exceeded.
+        """
+        self.locked_calls = 5
+        with override_settings(SQLITE_WRITE_SERIALIZER=self.settings):
+            response = self.middleware(self.factory.post('/courses/1/topic/1/content/1/edit/'))
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(self.calls, 3)
+
+    def test_not_serialized(self):
+        """Not serialized test case
+
+        Tests that reading requests and other views are not retried.
+        """
+        self.locked_calls = 5
+        with override_settings(SQLITE_WRITE_SERIALIZER=self.settings):
+            self.middleware(self.factory.get('/courses/1/topic/1/content/1/edit/'))
+            self.middleware(self.factory.post('/courses/1/edit/'))
+            self.assertEqual(self.calls, 2)
+            self.middleware(self.factory.get('/courses/1/topic/1/content/1/rate/5/'))
+            self.assertEqual(self.calls, 5)
+
+
+class PrimaryPinningMiddlewareTestCase(TestCase):
+    """Primary pinning middleware test case
+
+    Defines the test cases for the pinning of the reads of writing users.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the middleware with a view which records the pinning.
+        """
+        self.status = 200
+        self.pinned = None
+        self.middleware = PrimaryPinningMiddleware(self.get_response)
+        self.factory = RequestFactory()
+
+    def get_response(self, request):  # pylint: disable=unused-argument
+        """Get response
+
+        Responds with the status of the test case and records if the reads are pinned.
+
+        :param request: The given request
+        :type request: HttpRequest
+
+        :return: the response
+        :rtype: HttpResponse
+        """
+        self.pinned = is_pinned()
+        return HttpResponse(status=self.status)
+
+    def test_write(self):
+        """Write test case
+
+        Tests that writing requests are pinned and mark the user.
+        """
+        response = self.middleware(self.factory.post('/courses/1/edit/'))
+        self.assertTrue(self.pinned)
+        self.assertEqual(response.cookies['pin_primary']['max-age'], 10)
+        self.assertFalse(is_pinned())
+
+        response = self.middleware(self.factory.get('/courses/1/topic/1/content/1/rate/5/'))
+        self.assertTrue(self.pinned)
+        self.assertIn('pin_primary', response.cookies)
+
+        self.status = 400
+        response = self.middleware(self.factory.post('/courses/1/edit/'))
+        self.assertTrue(self.pinned)
+        self.assertNotIn('pin_primary', response.cookies)
+
+    def test_read(self):
+        """Read test case
+
+        Tests that reading requests are only pinned after the user wrote.
+        """
+        response = self.middleware(self.factory.get('/courses/1/'))
+        self.assertFalse(self.pinned)
+        self.assertNotIn('pin_primary', response.cookies)
+
+        request = self.factory.get('/courses/1/')
+        request.COOKIES['pin_primary'] = '1'
+        response = self.middleware(request)
+        self.assertTrue(self.pinned)
+        self.assertNotIn('pin_primary', response.cookies)
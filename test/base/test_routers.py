@@ -0,0 +1,73 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/routers.py.
+"""
+
+from unittest import mock
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.test import SimpleTestCase, TestCase
+
+from base.routers import PrimaryReplicaRouter, get_replica, is_pinned, pin_primary
+
+
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+    """Primary replica router test case
+
+    Defines the test cases for the routing of the reads and the writes.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the router with the replica.
+        """
+        patcher = mock.patch('base.routers.get_replica', return_value='replica')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = PrimaryReplicaRouter()
+
+    def test_read(self):
+        """Read test case
+
+        Tests that the reads are sent to the replica unless they are pinned to the primary.
+        """
+        self.assertEqual(self.router.db_for_read(User), 'replica')
+        with pin_primary():
+            with pin_primary():
+                self.assertEqual(self.router.db_for_read(User), 'default')
+            self.assertTrue(is_pinned())
+        self.assertFalse(is_pinned())
+        with pin_primary(False):
+            self.assertEqual(self.router.db_for_read(User), 'replica')
+
+    def test_write(self):
+        """Write test case
+
+        Tests that the writes and the migrations only use the primary.
+        """
+        self.assertEqual(self.router.db_for_write(User), 'default')
+        self.assertTrue(self.router.allow_migrate('default', 'base'))
+        self.assertFalse(self.router.allow_migrate('replica', 'base'))
+
+
+class PrimaryReplicaRouterTransactionTestCase(TestCase):
+    """Primary replica router transaction test case
+
+    Defines the test cases for the reads in the transactions of the primary.
+    """
+
+    def test_mirror(self):
+        """Mirror test case
+
+        Tests that the replica is not used while it mirrors the primary.
+        """
+        self.assertIsNone(get_replica())
+
+    def test_transaction(self):
+        """Transaction test case
+
+        Tests that the reads in a transaction of the primary see the transaction.
+        """
+        with mock.patch('base.routers.get_replica', return_value='replica'):
+            self.assertEqual(PrimaryReplicaRouter().db_for_read(User), 'default')
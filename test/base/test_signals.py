@@ -0,0 +1,68 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/signals.py.
+"""
+from test import utils
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.cache import cache
+from django.test import TestCase
+
+from base.cache import content_card_namespace, course_pages_namespace, get_version, \
+    topic_contents_namespace
+from base.models import Rating
+
+
+class ContentSignalsTestCase(TestCase):
+    """Content signals test case
+
+    Defines the test cases for the receivers which invalidate the cached fragments of the
+    contents.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a course containing a topic with a text field.
+        """
+        cache.clear()
+        self.user = User.objects.create(username='user')
+        self.topic = utils.create_topic()
+        self.course = utils.create_course(category=self.topic.category, topics=[self.topic])
+        self.content = utils.create_text_field(self.topic, self.user)
+
+    def get_versions(self):
+        """Get versions
+
+        Returns the versions of the card of the content, of the contents of its topic and of
+        the pages of its course.
+
+        :return: the versions
+        :rtype: list[str]
+        """
+        return [get_version(content_card_namespace(self.content.pk)),
+                get_version(topic_contents_namespace(self.topic.pk)),
+                get_version(course_pages_namespace(self.course.pk))]
+
+    def test_rating(self):
+        """Rating test case
+
+        Tests that a rating invalidates the card, the topic and the course of its content,
+        which are looked up in a single query. The course itself is not written.
+        """
+        versions = self.get_versions()
+        # The rating and the topics and courses of the content
+        with self.assertNumQueries(2):
+            Rating.objects.create(content=self.content, user=self.user.profile, rating=5)
+        for old, new in zip(versions, self.get_versions()):
+            self.assertNotEqual(old, new)
+
+    def test_moved(self):
+        """Moved test case
+
+        Tests that moving a content invalidates the contents of its previous topic.
+        """
+        version = get_version(topic_contents_namespace(self.topic.pk))
+        self.content.topic = utils.create_topic(title="Other", category=self.topic.category)
+        self.content.save()
+        self.assertNotEqual(get_version(topic_contents_namespace(self.topic.pk)), version)
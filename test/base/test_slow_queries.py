@@ -0,0 +1,87 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/slow_queries.py.
+"""
+
+from test import utils
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from base.slow_queries import get_samples, group_samples, normalize_sql
+
+# dict[str, Any]: The settings which capture every query
+CAPTURE_ALL = {'ENABLED': True, 'THRESHOLD_MS': 0, 'SAMPLE_RATE': 1.0, 'SIZE': 3,
+               'STACK_DEPTH': 8}
+
+
+@override_settings(SLOW_QUERIES=CAPTURE_ALL)
+class SlowQueriesTestCase(TestCase):
+    """Slow queries test case
+
+    Defines the test cases for the capture of the slow queries and their admin page.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up a superuser and clears the samples.
+        """
+        cache.clear()
+        self.user = User.objects.create(username='admin', is_staff=True, is_superuser=True)
+        utils.create_category()
+
+    def test_normalize(self):
+        """Normalize test case
+
+        Tests that literals and lists of parameters are replaced by placeholders.
+        """
+        self.assertEqual(normalize_sql("SELECT * FROM t WHERE a = 'x''y' AND b IN (%s, %s,\n"
+                                       "%s) AND c > 10 AND t0.d = 1.5"),
+                         "SELECT * FROM t WHERE a = %s AND b IN (...) AND c > %s AND "
+                         "t0.d = %s")
+
+    def test_capture(self):
+        """Capture test case
+
+        Tests that the queries of a request are sampled with their view, call site and plan
+        in a ring buffer.
+        """
+        self.client.force_login(self.user)
+        self.client.get('/courses/')
+        samples = get_samples()
+        self.assertEqual(len(samples), 3)
+        self.assertTrue(all(sample['view'] == 'frontend:courses' for sample in samples))
+        selects = [sample for sample in samples if sample['sql'].startswith('SELECT')]
+        self.assertTrue(any(sample['plan'] for sample in selects))
+        self.assertTrue(all(sample['stack'] for sample in samples))
+        self.assertEqual(sum(group['count'] for group in group_samples(samples)), 3)
+
+    @override_settings(SLOW_QUERIES={**CAPTURE_ALL, 'ENABLED': False})
+    def test_disabled(self):
+        """Disabled test case
+
+        Tests that no queries are captured unless the capture is enabled.
+        """
+        self.client.force_login(self.user)
+        self.client.get('/courses/')
+        self.assertEqual(get_samples(), [])
+
+    def test_admin(self):
+        """Admin test case
+
+        Tests that the samples are shown to superusers only and can be deleted.
+        """
+        self.client.force_login(self.user)
+        self.client.get('/courses/')
+        with override_settings(SLOW_QUERIES={**CAPTURE_ALL, 'ENABLED': False}):
+            response = self.client.get('/admin/slow-queries/')
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'frontend:courses')
+            self.client.post('/admin/slow-queries/')
+            self.assertEqual(get_samples(), [])
+
+            self.user.is_superuser = False
+            self.user.save()
+            self.assertEqual(self.client.get('/admin/slow-queries/').status_code, 403)
@@ -0,0 +1,79 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/storage.py.
+"""
+
+import os
+import shutil
+
+from test import utils
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from base.models import MediaBlob
+from base.storage import BLOB_FOLDER, blob_storage, get_digest, get_linearized_name, \
+    get_pages_folder, get_preview_name, get_source_name
+
+
+@override_settings(MEDIA_ROOT=utils.MEDIA_ROOT)
+class ContentAddressedStorageTestCase(TestCase):
+    """Content addressed storage test case
+
+    Defines the test cases for the content addressed storage.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down class
+
+        Deletes the stored files after running the tests.
+        """
+        shutil.rmtree(utils.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_save(self):
+        """Save test case
+
+        Tests that a file is stored under the hash of its content and registered as blob.
+        """
+        name = blob_storage.save('uploads/contents/slides.PDF', ContentFile(b'%PDF-1.4 A'))
+        digest = get_digest(name)
+        self.assertEqual(name, f'{BLOB_FOLDER}{digest[:2]}/{digest}.pdf')
+        self.assertEqual(MediaBlob.objects.get(name=name).size, 10)
+        self.assertEqual(MediaBlob.objects.get(name=name).references, 0)
+
+    def test_deduplicate(self):
+        """Deduplicate test case
+
+        Tests that identical files are stored once and different files are stored apart.
+        """
+        first = blob_storage.save('uploads/contents/a.pdf', ContentFile(b'%PDF-1.4 B'))
+        second = blob_storage.save('uploads/other/b.pdf', ContentFile(b'%PDF-1.4 B'))
+        third = blob_storage.save('uploads/contents/a.pdf', ContentFile(b'%PDF-1.4 C'))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+        self.assertEqual(len(os.listdir(os.path.dirname(blob_storage.path(first)))), 1)
+        self.assertEqual(MediaBlob.objects.count(), 2)
+
+    def test_preview_name(self):
+        """Preview name test case
+
+        Tests that only blobs have a shared preview.
+        """
+        name = blob_storage.save('slides.pdf', ContentFile(b'%PDF-1.4 D'))
+        self.assertEqual(get_preview_name(name), f'uploads/previews/{get_digest(name)}.jpg')
+        self.assertIsNone(get_preview_name('uploads/contents/2020/01/01/slides.pdf'))
+        self.assertIsNone(get_preview_name(''))
+
+    def test_source_name(self):
+        """Source name test case
+
+        Tests that the files derived from a PDF blob are mapped to the PDF.
+        """
+        name = blob_storage.save('slides.pdf', ContentFile(b'%PDF-1.4 E'))
+        for derivative in (get_preview_name(name), get_linearized_name(name),
+                           get_pages_folder(name) + '1-480.webp'):
+            self.assertEqual(get_source_name(derivative), name)
+        self.assertIsNone(get_source_name(name))
+        self.assertIsNone(get_source_name('uploads/previews/slides.jpg'))
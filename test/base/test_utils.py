@@ -0,0 +1,121 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/utils.py.
+"""
+
+from test import utils
+
+from django.contrib.auth.models import AnonymousUser, User  # pylint: disable=imported-auth-user
+from django.test import TestCase
+
+from base.models import Favorite, Rating
+from base.utils import get_neighbour_ids, get_owned_course_ids, is_course_owner
+
+
+class CourseOwnerTestCase(TestCase):
+    """Course owner test case
+
+    Defines the test cases for the functions get_owned_course_ids and is_course_owner.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database.
+        """
+        self.user = User.objects.create(username='owner')
+        self.owned_course = utils.create_course(title='Owned', owner=self.user)
+        self.other_course = utils.create_course(title='Other',
+                                                category=self.owned_course.category)
+
+    def test_owned_course_ids(self):
+        """Owned course ids test case
+
+        Tests that only the courses owned by the user are returned.
+        """
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(get_owned_course_ids(user), {self.owned_course.pk})
+
+    def test_single_query(self):
+        """Single query test case
+
+        Tests that the owned courses are only loaded once for the same user instance.
+        """
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(is_course_owner(user, self.owned_course))
+            self.assertFalse(is_course_owner(user, self.other_course))
+            self.assertTrue(is_course_owner(user, self.owned_course))
+
+    def test_anonymous_user(self):
+        """Anonymous user test case
+
+        Tests that an anonymous user does not own any course and no query is executed.
+        """
+        with self.assertNumQueries(0):
+            self.assertFalse(is_course_owner(AnonymousUser(), self.owned_course))
+
+
+class NeighbourIdsTestCase(TestCase):
+    """Neighbour ids test case
+
+    Defines the test cases for the function get_neighbour_ids.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database.
+        """
+        self.user = User.objects.create(username='author')
+        self.topic = utils.create_topic()
+        self.course = utils.create_course(category=self.topic.category)
+        self.contents = [utils.create_content('Textfield', self.topic, self.user,
+                                              description=f'Content {i}')
+                         for i in range(3)]
+
+    def test_default_ordering(self):
+        """Default ordering test case
+
+        Tests that the neighbours wrap around at the first and the last content.
+        """
+        first, second, third = (content.id for content in self.contents)
+        contents = self.topic.get_contents(None, None)
+        self.assertEqual(get_neighbour_ids(contents, first), (third, second))
+        self.assertEqual(get_neighbour_ids(contents, second), (first, third))
+        self.assertEqual(get_neighbour_ids(contents, third), (second, first))
+
+    def test_rating_ordering(self):
+        """Rating ordering test case
+
+        Tests that the neighbours follow the ordering by the average rating.
+        """
+        first, second, third = self.contents
+        Rating.objects.create(user=self.user.profile, content=third, rating=5)
+        Rating.objects.create(user=self.user.profile, content=first, rating=3)
+        contents = self.topic.get_contents('Rating', None)
+        self.assertEqual(get_neighbour_ids(contents, first.id), (third.id, second.id))
+        self.assertEqual(get_neighbour_ids(contents, third.id), (second.id, first.id))
+
+    def test_field(self):
+        """Field test case
+
+        Tests that the neighbours are read from the given field.
+        """
+        first, second, third = self.contents
+        for content in (third, first):
+            Favorite.objects.create(user=self.user.profile, course=self.course,
+                                    content=content)
+        favorites = Favorite.objects.filter(course=self.course).order_by('pk')
+        self.assertEqual(get_neighbour_ids(favorites, first.id, field='content_id'),
+                         (third.id, third.id))
+        self.assertIsNone(get_neighbour_ids(favorites, second.id, field='content_id'))
+
+    def test_single_query(self):
+        """Single query test case
+
+        Tests that the neighbours are computed with a single query.
+        """
+        contents = self.topic.get_contents('Date', None)
+        with self.assertNumQueries(1):
+            get_neighbour_ids(contents, self.contents[0].id)
@@ -0,0 +1,126 @@
+"""Purpose of this file
+
+This file contains the test cases for /base/versions.py.
+"""
+
+from datetime import datetime, timedelta
+from io import StringIO
+from test import utils
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+import reversion
+from reversion.models import Revision, Version
+
+from base.versions import select_kept_revisions
+import content.models as model
+
+RETENTION = {'KEEP_LAST': 2, 'KEEP_DAILY_DAYS': 3, 'KEEP_WEEKLY_WEEKS': 4,
+             'COMPRESS_AFTER_DAYS': 1}
+
+
+class SelectKeptRevisionsTestCase(TestCase):
+    """Select kept revisions test case
+
+    Defines the test cases for the retention policy of the versions of an object.
+    """
+
+    def test_policy(self):
+        """Policy test case
+
+        Tests that the latest versions, the latest version of each day and then the latest
+        version of each week are kept.
+        """
+        now = timezone.make_aware(datetime(2021, 3, 10, 12))
+        hours = [0, 1, 2, 24, 25, 24 * 10, 24 * 11, 24 * 40]
+        versions = [(index, now - timedelta(hours=hour)) for index, hour in enumerate(hours)]
+        # The latest two versions, the 9th of March and the week of the 28th of February
+        self.assertEqual(select_kept_revisions(versions, now, RETENTION), {0, 1, 3, 5})
+
+    def test_keep_weekly_forever(self):
+        """Keep weekly forever test case
+
+        Tests that old versions are kept weekly if the weekly period is not limited.
+        """
+        now = timezone.now()
+        versions = [(1, now), (2, now - timedelta(days=400))]
+        retention = {**RETENTION, 'KEEP_LAST': 1, 'KEEP_WEEKLY_WEEKS': None}
+        self.assertEqual(select_kept_revisions(versions, now, retention), {1, 2})
+
+
+class CompactVersionsTestCase(TestCase):
+    """Compact versions test case
+
+    Defines the test cases for the command compactversions.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a text field with ten versions, one per week.
+        """
+        self.user = User.objects.create(username='user')
+        self.topic = utils.create_topic()
+        with reversion.create_revision():
+            content = utils.create_content(model.TextField.TYPE, self.topic, self.user)
+            self.text = model.TextField.objects.create(content=content, textfield='Text 0',
+                                                       source='src')
+        for index in range(1, 10):
+            with reversion.create_revision():
+                self.text.textfield = f'Text {index}'
+                self.text.save()
+        now = timezone.now()
+        for weeks, revision in enumerate(Revision.objects.order_by('-pk')):
+            revision.date_created = now - timedelta(weeks=weeks)
+            revision.save()
+
+    def test_compaction(self):
+        """Compaction test case
+
+        Tests that the revisions are thinned as whole and the old versions are compressed.
+        """
+        call_command('compactversions', keep_last=2, keep_daily_days=3, keep_weekly_weeks=4,
+                     compress_after_days=1, stdout=StringIO())
+        versions = Version.objects.get_for_object(self.text)
+        # The two latest versions and one per week for the weeks 2 and 3
+        self.assertEqual(versions.count(), 4)
+        # The content of a revision is deleted together with the text field
+        self.assertEqual(Version.objects.get_for_object(self.text.content).count(), 4)
+        self.assertEqual(versions.filter(format='zjson').count(), 3)
+        self.assertEqual(versions.last().field_dict['textfield'], 'Text 6')
+
+    def test_dry_run(self):
+        """Dry run test case
+
+        Tests that nothing is changed by a dry run.
+        """
+        output = StringIO()
+        call_command('compactversions', keep_last=2, keep_daily_days=3, keep_weekly_weeks=4,
+                     dry_run=True, stdout=output)
+        self.assertIn('6 revisions', output.getvalue())
+        self.assertEqual(Version.objects.get_for_object(self.text).count(), 10)
+
+    def test_compare_compressed(self):
+        """Compare compressed test case
+
+        Tests that compressed versions can be compared and reverted.
+        """
+        call_command('compactversions', compress_after_days=1, stdout=StringIO())
+        self.client.force_login(self.user)
+        path = reverse('frontend:textfield-history', kwargs={
+            'course_id': 1, 'topic_id': self.topic.pk, 'pk': self.text.pk
+        })
+        versions = Version.objects.get_for_object(self.text)
+        version1, version2 = versions[2], versions[1]
+        self.assertEqual(version1.format, 'zjson')
+        response = self.client.get(path, {'version_id1': version1.pk,
+                                          'version_id2': version2.pk})
+        self.assertContains(response, '<ins>+ Text 8</ins>')
+
+        self.client.post(path, {'ver_pk': version1.pk})
+        self.text.refresh_from_db()
+        self.assertEqual(self.text.textfield, 'Text 7')
@@ -0,0 +1,135 @@
+"""Purpose of this file
+
+This file contains the test cases for /content/blobs.py and /content/signals.py.
+"""
+
+import shutil
+from unittest import mock
+
+from test import utils
+
+from PIL import Image
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from base.models import MediaBlob
+from base.storage import get_preview_name
+from content.blobs import count_references
+
+import content.models as model
+
+
+@override_settings(MEDIA_ROOT=utils.MEDIA_ROOT)
+class BlobReferencesTestCase(TestCase):
+    """Blob references test case
+
+    Defines the test cases for the reference counting of the blobs.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a topic for the contents.
+        """
+        self.user = User.objects.create(username='user')
+        self.topic = utils.create_topic()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down class
+
+        Deletes the stored files after running the tests.
+        """
+        shutil.rmtree(utils.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def create_pdf(self, data=b'%PDF-1.4 Slides'):
+        """Create PDF
+
+        Creates a PDF content with the given data.
+
+        :param data: The data of the PDF
+        :type data: bytes
+
+        :return: the created PDF content
+        :rtype: PDFContent
+        """
+        content = utils.create_content(model.PDFContent.TYPE, self.topic, self.user)
+        pdf = model.PDFContent(content=content, source='src')
+        pdf.pdf.save('slides.pdf', ContentFile(data))
+        return pdf
+
+    def references(self, name):
+        """References
+
+        Returns the number of references to the blob with the given name.
+
+        :param name: The name of the blob
+        :type name: str
+
+        :return: the number of references
+        :rtype: int
+        """
+        return MediaBlob.objects.get(name=name).references
+
+    def test_identical_uploads(self):
+        """Identical uploads test case
+
+        Tests that identical uploads refer to the same blob, which is referenced by both.
+        """
+        first = self.create_pdf()
+        second = self.create_pdf()
+        self.assertEqual(first.pdf.name, second.pdf.name)
+        self.assertEqual(self.references(first.pdf.name), 2)
+
+        second.content.delete()
+        self.assertEqual(self.references(first.pdf.name), 1)
+
+    def test_replace(self):
+        """Replace test case
+
+        Tests that the reference to a replaced file is removed.
+        """
+        pdf = self.create_pdf()
+        old_name = pdf.pdf.name
+        pdf.pdf.save('new.pdf', ContentFile(b'%PDF-1.4 New'))
+        self.assertEqual(self.references(old_name), 0)
+        self.assertEqual(self.references(pdf.pdf.name), 1)
+        pdf.save()
+        self.assertEqual(self.references(pdf.pdf.name), 1)
+
+    def test_count_references(self):
+        """Count references test case
+
+        Tests that the references of objects saved in bulk are counted again.
+        """
+        pdf = self.create_pdf()
+        model.PDFContent.objects.bulk_create([
+            model.PDFContent(content=utils.create_content(model.PDFContent.TYPE, self.topic,
+                                                          self.user),
+                             pdf=pdf.pdf.name, source='src')
+        ])
+        self.assertEqual(self.references(pdf.pdf.name), 1)
+        count_references()
+        self.assertEqual(self.references(pdf.pdf.name), 2)
+
+    @mock.patch('content.models.convert_from_path')
+    def test_shared_preview(self, convert_from_path):
+        """Shared preview test case
+
+        Tests that the preview of identical PDFs is only generated once.
+        """
+        convert_from_path.return_value = [Image.new('RGB', (10, 10))]
+        first = self.create_pdf()
+        second = self.create_pdf()
+        preview = first.generate_preview()
+        self.assertEqual(preview, get_preview_name(first.pdf.name))
+        self.assertEqual(second.generate_preview(), preview)
+        convert_from_path.assert_called_once()
+
+        for pdf in (first, second):
+            pdf.content.preview = preview
+            pdf.content.save()
+        self.assertEqual(self.references(preview), 2)
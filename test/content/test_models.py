@@ -8,7 +8,8 @@ import os
 from test.test_cases import MediaTestCase
 import test.utils as utils
 
-from django.test import override_settings
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.test import TestCase, override_settings
 
 from base.models import Content
 
@@ -41,3 +42,44 @@ class LatexTestCase(MediaTestCase):  # pylint: disable=too-few-public-methods)
 
         self.assertEqual('uploads/previews/Topic_Category.jpg', content.preview.name)
         self.assertTrue(bool(content.preview))
+
+
+class LatexCompileReportTestCase(TestCase):
+    """LaTeX compile report test case
+
+    Defines the test cases for the model LatexCompileReport.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up a LaTeX content which was not compiled yet.
+        """
+        content = utils.create_content(model.Latex.TYPE, utils.create_topic(),
+                                       User.objects.create())
+        self.latex = model.Latex.objects.create(textfield='\\Error', content=content)
+
+    def test_store(self):
+        """Store test case
+
+        Tests that the function store replaces the report of the content and keeps only the
+        messages of the content and of the template.
+        """
+        diagnostics = {
+            'duration': 1.5,
+            'pages': 0,
+            'errors': [{'message': '! Undefined control sequence.', 'content': self.latex.pk,
+                        'line': 1},
+                       {'message': '! Emergency stop.', 'content': None, 'line': None}],
+            'warnings': [{'message': 'LaTeX Warning: other content', 'content': 42, 'line': 3}],
+            'log': 'l.80 \\Error',
+        }
+        model.LatexCompileReport.store(self.latex, diagnostics)
+        diagnostics['duration'] = 2.0
+        model.LatexCompileReport.store(self.latex, diagnostics)
+
+        report = model.LatexCompileReport.objects.get()
+        self.assertEqual(report.duration, 2.0)
+        self.assertEqual([error['line'] for error in report.errors], [1, None])
+        self.assertEqual(report.warnings, [])
+        self.assertEqual(report.log, 'l.80 \\Error')
@@ -0,0 +1,187 @@
+"""Purpose of this file
+
+This file contains the test cases for /content/rendering.py.
+"""
+
+import os
+import shutil
+import subprocess
+from io import StringIO
+from unittest import mock
+
+from test import utils
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from base.models import Content
+from PIL import Image
+
+from base.storage import blob_storage, get_linearized_name
+from content.rendering import PAGE_WIDTHS, linearize_pdf, render_content, render_pages
+
+import content.models as model
+
+
+@override_settings(MEDIA_ROOT=utils.MEDIA_ROOT)
+class RenderContentTestCase(TestCase):
+    """Render content test case
+
+    Defines the test cases for the rendering of the PDF and the preview of a content.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a LaTeX content waiting to be rendered.
+        """
+        self.content = utils.create_content(model.Latex.TYPE, utils.create_topic(),
+                                            User.objects.create(username='user'),
+                                            render_status=Content.RENDER_PENDING)
+        self.latex = model.Latex.objects.create(content=self.content, textfield='Text',
+                                                source='src')
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down class
+
+        Deletes the generated files after running the tests.
+        """
+        shutil.rmtree(utils.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    @mock.patch.object(model.Latex, 'generate_preview', return_value='uploads/previews/x.jpg')
+    @mock.patch('content.rendering.generate_pdf_response', return_value=b'%PDF-1.4')
+    def test_render(self, generate_pdf_response, generate_preview):
+        """Render test case
+
+        Tests that the PDF and the preview are stored and the content is marked as rendered.
+        """
+        render_content(self.content.pk)
+        generate_pdf_response.assert_called_once_with(self.content.author, self.content)
+        generate_preview.assert_called_once_with()
+        self.content.refresh_from_db()
+        self.latex.refresh_from_db()
+        self.assertEqual(self.content.render_status, Content.RENDERED)
+        self.assertEqual(self.content.preview.name, 'uploads/previews/x.jpg')
+        self.assertTrue(self.latex.pdf.name.endswith('.pdf'))
+
+    @mock.patch('content.rendering.generate_pdf_response', side_effect=RuntimeError)
+    def test_render_failed(self, generate_pdf_response):  # pylint: disable=unused-argument
+        """Render failed test case
+
+        Tests that a content is marked as failed if the rendering failed.
+        """
+        with self.assertLogs('content.rendering'):
+            render_content(self.content.pk)
+        self.content.refresh_from_db()
+        self.assertEqual(self.content.render_status, Content.RENDER_FAILED)
+
+    @mock.patch('content.management.commands.rendercontents.render_content')
+    def test_command(self, patched_render_content):
+        """Command test case
+
+        Tests that the command renders the pending contents.
+        """
+        output = StringIO()
+        call_command('rendercontents', stdout=output)
+        patched_render_content.assert_called_once_with(self.content.pk)
+        self.assertIn('Rendered 1 contents', output.getvalue())
+
+
+def write_linearized_pdf(command, **kwargs):  # pylint: disable=unused-argument
+    """Write linearized PDF
+
+    Writes the output file of the linearization command instead of running qpdf.
+
+    :param command: The command with the input and the output file
+    :type command: list[str]
+    :param kwargs: The keyword arguments of the run
+    :type kwargs: dict[str, Any]
+
+    :return: the completed process
+    :rtype: CompletedProcess
+    """
+    with open(command[-1], 'wb') as file:
+        file.write(b'%PDF-1.4 linearized')
+    return subprocess.CompletedProcess(command, 0, b'', b'')
+
+
+@override_settings(MEDIA_ROOT=utils.MEDIA_ROOT)
+class ProcessPdfTestCase(TestCase):
+    """Process PDF test case
+
+    Defines the test cases for the linearized copies and the rendered pages of the PDFs.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a PDF content which was not processed yet.
+        """
+        for folder in ('uploads/linearized', 'uploads/pages'):
+            shutil.rmtree(os.path.join(utils.MEDIA_ROOT, folder), ignore_errors=True)
+        content = utils.create_content(model.PDFContent.TYPE, utils.create_topic(),
+                                       User.objects.create(username='user'))
+        self.pdf = model.PDFContent(content=content, source='src')
+        self.pdf.pdf.save('slides.pdf', ContentFile(b'%PDF-1.4 Linearize'))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down class
+
+        Deletes the generated files after running the tests.
+        """
+        shutil.rmtree(utils.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    @mock.patch('content.rendering.subprocess.run', side_effect=write_linearized_pdf)
+    def test_linearize(self, run):
+        """Linearize test case
+
+        Tests that the linearized copy is written once and embedded instead of the original.
+        """
+        self.assertEqual(self.pdf.pdf_url, self.pdf.pdf.url)
+        name = linearize_pdf(self.pdf.pdf.name)
+        self.assertEqual(name, get_linearized_name(self.pdf.pdf.name))
+        self.assertTrue(os.path.exists(self.pdf.pdf.path))
+        self.assertEqual(self.pdf.pdf_url, blob_storage.url(name))
+        self.assertEqual(linearize_pdf(self.pdf.pdf.name), name)
+        run.assert_called_once()
+
+    @mock.patch('content.rendering.subprocess.run', side_effect=FileNotFoundError)
+    def test_qpdf_missing(self, run):  # pylint: disable=unused-argument
+        """Qpdf missing test case
+
+        Tests that the original PDF is embedded if qpdf is not installed.
+        """
+        with self.assertLogs('content.rendering', 'WARNING'):
+            self.assertIsNone(linearize_pdf(self.pdf.pdf.name))
+        self.assertEqual(self.pdf.pdf_url, self.pdf.pdf.url)
+
+    @mock.patch('content.rendering.pdfinfo_from_path', return_value={'Pages': 2})
+    @mock.patch('content.rendering.convert_from_path')
+    def test_render_pages(self, convert_from_path, pdfinfo_from_path):
+        """Render pages test case
+
+        Tests that every page is rendered in all widths and described by the manifest.
+        """
+        convert_from_path.return_value = [Image.new('RGB', (max(PAGE_WIDTHS), 1800))]
+        self.assertEqual(self.pdf.pages, [])
+        self.assertEqual(render_pages(self.pdf.pdf.name), 2)
+        pdfinfo_from_path.assert_called_once_with(self.pdf.pdf.path)
+        self.assertEqual(convert_from_path.call_count, 2)
+
+        pages = model.PDFContent.objects.get(pk=self.pdf.pk).pages
+        self.assertEqual([page['number'] for page in pages], [1, 2])
+        self.assertEqual(pages[0]['height'], 1800)
+        self.assertEqual(sorted(pages[0]['urls']), sorted(PAGE_WIDTHS))
+        small_name = pages[1]['url'][len(blob_storage.base_url):]
+        self.assertEqual(Image.open(blob_storage.path(small_name)).size,
+                         (min(PAGE_WIDTHS), round(1800 * min(PAGE_WIDTHS) / max(PAGE_WIDTHS))))
+
+        # The pages of an identical PDF are not rendered again
+        self.assertEqual(render_pages(self.pdf.pdf.name), 2)
+        self.assertEqual(convert_from_path.call_count, 2)
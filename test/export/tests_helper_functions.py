@@ -4,10 +4,11 @@ This file contains the test cases for /export/helper_functions.py.
 """
 
 import os
+from unittest import mock
 
 from test import utils
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 import content.models as model
 
@@ -76,3 +77,66 @@ class LaTeXTestCase(TestCase):
         pre_render = helper.Latex.pre_render(content, False)
         self.assertIn(latex_content.textfield, pre_render.decode(helper.Latex.encoding))
         self.assertNotIn(content.description, pre_render.decode(helper.Latex.encoding))
+
+
+class DiagnoseTestCase(SimpleTestCase):
+    """Diagnose test case
+
+    Defines the test cases for the diagnostics of the class Latex.
+    """
+
+    def test_errors(self):
+        """Diagnose test case - errors
+
+        Tests that the function diagnose maps the lines of the errors to the lines of the code
+        of the content and keeps the log from the first error.
+        """
+        path = os.path.dirname(__file__) + '/resources/log'
+        with open(path, mode='rb') as file:
+            log = file.read()
+        diagnostics = helper.Latex.diagnose(log, [(5, 60, 8)])
+        self.assertEqual(diagnostics['pages'], 1)
+        self.assertEqual(len(diagnostics['errors']), 3)
+        self.assertEqual(diagnostics['errors'][0],
+                         {'message': '! Undefined control sequence.', 'content': 5, 'line': 7})
+        # The end of the document is not part of the code of the content
+        self.assertEqual(diagnostics['errors'][2]['line'], None)
+        self.assertTrue(diagnostics['log'].splitlines()[2].startswith('!'))
+
+    def test_warnings(self):
+        """Diagnose test case - warnings
+
+        Tests that the function diagnose joins the continued lines of the warnings and finds
+        their lines.
+        """
+        log = b"""LaTeX Warning: Reference `fig' on page 1 undefined on input line 12.
+
+Package hyperref Warning: Token not allowed in a PDF string (Unicode):
+(hyperref)                removing `math shift' on input line 14.
+
+Overfull \\hbox (15.0pt too wide) in paragraph at lines 30--31
+[]\\T1/cmr/m/n/10 text
+
+Output written on texput.pdf (2 pages, 1024 bytes).
+"""
+        diagnostics = helper.Latex.diagnose(log, [(1, 10, 10)])
+        warnings = diagnostics['warnings']
+        self.assertEqual([warning['line'] for warning in warnings], [3, 5, None])
+        self.assertEqual(warnings[1]['message'],
+                         'Package hyperref Warning: Token not allowed in a PDF string (Unicode): '
+                         "removing `math shift' on input line 14.")
+        self.assertEqual(diagnostics['errors'], [])
+        self.assertEqual(diagnostics['pages'], 2)
+
+    def test_find_source(self):
+        """Find source test case
+
+        Tests that the function find_source returns the first line of the code of the content
+        in the document.
+        """
+        content = mock.Mock(pk=3)
+        content.latex.textfield = 'a\nb'
+        source = helper.Latex.find_source(b'x\ny\n', b'% code\na\nb\n', content)
+        self.assertEqual(source, (3, 4, 2))
+        self.assertEqual(helper.Latex.map_line([source], 5), (3, 2))
+        self.assertIsNone(helper.Latex.find_source(b'', b'c', content))
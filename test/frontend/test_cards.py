@@ -0,0 +1,68 @@
+"""Purpose of this file
+
+This file contains the test cases for /frontend/cards.py.
+"""
+
+from test import utils
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.cache import cache
+from django.test import TestCase
+
+from base.models import Rating, Tag
+from frontend.cards import render_content_cards
+
+
+class ContentCardsTestCase(TestCase):
+    """Content cards test case
+
+    Defines the test cases for the rendering of the content cards.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a topic containing text fields.
+        """
+        cache.clear()
+        self.user = User.objects.create(username='user')
+        topic = utils.create_topic()
+        self.course = utils.create_course(category=topic.category)
+        self.contents = [utils.create_content('Textfield', topic, self.user,
+                                              description=f'Content {i}')
+                         for i in range(20)]
+
+    def test_order(self):
+        """Order test case
+
+        Tests that the cards are returned in the order of the given contents.
+        """
+        contents = list(reversed(self.contents))
+        cards = render_content_cards(contents, self.course)
+        self.assertEqual(len(cards), len(contents))
+        for card, content in zip(cards, contents):
+            self.assertIn(content.description, card)
+
+    def test_cache(self):
+        """Cache test case
+
+        Tests that the missing cards are rendered with a fixed number of queries and that
+        cached cards do not need any query.
+        """
+        with self.assertNumQueries(2):
+            render_content_cards(self.contents, self.course)
+        with self.assertNumQueries(0):
+            render_content_cards([content.pk for content in self.contents], self.course)
+
+    def test_invalidation(self):
+        """Invalidation test case
+
+        Tests that only the cards of changed contents are rendered again.
+        """
+        first, second = self.contents[:2]
+        render_content_cards([first, second], self.course)
+        first.tags.add(Tag.objects.create(title='Fresh tag'))
+        Rating.objects.create(content=second, user=self.user.profile, rating=3)
+        cards = render_content_cards([first, second], self.course)
+        self.assertIn('Fresh tag', cards[0])
+        self.assertIn('fa-star', cards[1])
@@ -0,0 +1,119 @@
+"""Purpose of this file
+
+This file contains the test cases for /frontend/conditional.py.
+"""
+
+from test import utils
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from base.models import Comment, Favorite, Rating
+
+
+class PageConditionTestCase(TestCase):
+    """Page condition test case
+
+    Defines the test cases for the conditional requests of the course and content pages.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a course containing a topic with a text field and
+        logs in the user.
+        """
+        cache.clear()
+        self.user = User.objects.create(username='user')
+        topic = utils.create_topic()
+        self.course = utils.create_course(category=topic.category, topics=[topic])
+        self.content = utils.create_text_field(topic, self.user)
+        self.client.force_login(self.user)
+        kwargs = {'course_id': self.course.pk, 'topic_id': topic.pk, 'pk': self.content.pk}
+        self.paths = [reverse('frontend:course', kwargs={'pk': self.course.pk}),
+                      reverse('frontend:content', kwargs=kwargs),
+                      reverse('frontend:content-reading-mode', kwargs=kwargs)]
+        # The csrf cookie is set by the first page and is part of the ETags
+        self.client.get(self.paths[0])
+
+    def assert_not_modified(self, modified):
+        """Assert not modified
+
+        Asserts that the pages are only answered with 304 if they were not modified.
+
+        :param modified: If the pages are expected to be modified
+        :type modified: bool
+        """
+        for path in self.paths:
+            with self.subTest(path=path):
+                response = self.client.get(path, HTTP_IF_NONE_MATCH=self.etags[path])
+                self.assertEqual(response.status_code, 200 if modified else 304)
+
+    def load_etags(self):
+        """Load ETags
+
+        Loads the pages and stores their ETags.
+        """
+        self.etags = {path: self.client.get(path)['ETag'] for path in self.paths}
+
+    def test_not_modified(self):
+        """Not modified test case
+
+        Tests that unchanged pages are answered with 304 by the ETag and by the date of the
+        last modification.
+        """
+        self.load_etags()
+        self.assert_not_modified(False)
+        for path in self.paths:
+            response = self.client.get(path)
+            modified = self.client.get(path, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEqual(modified.status_code, 304)
+
+    def test_content_changed(self):
+        """Content changed test case
+
+        Tests that the pages are modified after a change of the content.
+        """
+        self.load_etags()
+        self.content.description = 'Changed'
+        self.content.save()
+        self.assert_not_modified(True)
+
+    def test_rating_and_comment(self):
+        """Rating and comment test case
+
+        Tests that the pages are modified after a rating or a comment was added or deleted.
+        """
+        self.load_etags()
+        rating = Rating.objects.create(content=self.content, user=self.user.profile, rating=3)
+        self.assert_not_modified(True)
+        self.load_etags()
+        rating.delete()
+        self.assert_not_modified(True)
+        self.load_etags()
+        Comment.objects.create(content=self.content, author=self.user.profile, text='Text')
+        self.assert_not_modified(True)
+
+    def test_favorites(self):
+        """Favorites test case
+
+        Tests that the pages are modified after a favorite of the user was added or deleted.
+        """
+        self.load_etags()
+        favorite = Favorite.objects.create(user=self.user.profile, course=self.course,
+                                           content=self.content)
+        self.assert_not_modified(True)
+        self.load_etags()
+        favorite.delete()
+        self.assert_not_modified(True)
+
+    def test_other_user(self):
+        """Other user test case
+
+        Tests that the pages of another user are not validated by the ETags of the user.
+        """
+        self.load_etags()
+        self.client.force_login(User.objects.create(username='other'))
+        self.assert_not_modified(True)
@@ -0,0 +1,95 @@
+"""Purpose of this file
+
+This file contains the test cases for /frontend/views/comment.py.
+"""
+
+from datetime import timedelta
+from test import utils
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from base.models import Comment
+
+from frontend.views.comment import decode_comment_cursor, get_comment_page
+
+
+class CommentPageTestCase(TestCase):
+    """Comment page test case
+
+    Defines the test cases for the cursor paginated comments.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a content containing five comments.
+        """
+        self.user = User.objects.create(username='user')
+        self.topic = utils.create_topic()
+        self.course = utils.create_course(category=self.topic.category, topics=[self.topic])
+        self.content = utils.create_content('Textfield', self.topic, self.user)
+        now = timezone.now()
+        for i in range(5):
+            comment = Comment.objects.create(content=self.content, author=self.user.profile,
+                                             text=f'Comment {i}')
+            # Two comments share the same creation date
+            Comment.objects.filter(pk=comment.pk) \
+                .update(creation_date=now + timedelta(minutes=min(i, 3)))
+        self.path = reverse('frontend:comments', kwargs={
+            'course_id': self.course.pk, 'topic_id': self.topic.pk, 'content_id': self.content.pk
+        })
+        self.client.force_login(self.user)
+
+    def test_pages(self):
+        """Pages test case
+
+        Tests that following the cursors returns every comment exactly once, newest first.
+        """
+        texts = []
+        comments, cursor = get_comment_page(self.content, page_size=2)
+        texts += [comment.text for comment in comments]
+        while cursor is not None:
+            comments, cursor = get_comment_page(self.content, decode_comment_cursor(cursor),
+                                                page_size=2)
+            texts += [comment.text for comment in comments]
+        self.assertEqual(texts, ['Comment 4', 'Comment 3', 'Comment 2',
+                                 'Comment 1', 'Comment 0'])
+
+    def test_endpoint(self):
+        """Endpoint test case
+
+        Tests that the endpoint returns the rendered comments and the next cursor.
+        """
+        _comments, cursor = get_comment_page(self.content, page_size=3)
+        response = self.client.get(self.path, {'cursor': cursor})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn('Comment 1', data['html'])
+        self.assertIn('Comment 0', data['html'])
+        self.assertNotIn('Comment 2', data['html'])
+        self.assertIsNone(data['cursor'])
+
+    def test_invalid_cursor(self):
+        """Invalid cursor test case
+
+        Tests that the endpoint rejects malformed cursors.
+        """
+        response = self.client.get(self.path, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_course(self):
+        """Other course test case
+
+        Tests that the comments are only available in the course and the topic of the content.
+        """
+        other_course = utils.create_course(title='Other', category=self.topic.category)
+        other_topic = utils.create_topic(title="Other", category=self.topic.category)
+        for course, topic in [(other_course, self.topic), (self.course, other_topic)]:
+            path = reverse('frontend:comments', kwargs={
+                'course_id': course.pk, 'topic_id': topic.pk, 'content_id': self.content.pk
+            })
+            with self.subTest(course=course.title, topic=topic.title):
+                self.assertEqual(self.client.get(path).status_code, 404)
@@ -3,13 +3,16 @@
 This file contains the test cases for /frontend/forms/content.py.
 """
 
+import hashlib
 from test import utils
 from test.test_cases import MediaTestCase
 
-from django.test import TestCase
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
-from base.models import Content, Course
+from base.models import Comment, Content, Course, Favorite, Rating, Tag
+from base.storage import get_blob_name
 import content.forms as form
 import content.models as model
 from content.attachment.forms import ImageAttachmentFormSet
@@ -283,8 +286,10 @@ class EditContentViewTestCase(MediaTestCase):
         self.assertEqual(textfield.textfield, 'Lorem ipsum')
         self.assertEqual(content.ImageAttachments.count(), 1)
         self.assertEqual(ImageAttachment.objects.count(), 1)
+        # The image is stored under the hash of its content
         image = ImageAttachment.objects.first().image
-        self.assertIn('test42', image.name)
+        digest = hashlib.sha256(utils.generate_image_file(42).read()).hexdigest()
+        self.assertEqual(image.name, get_blob_name(digest, 'test42.png'))
 
     def test_context(self):
         """Get context data test case
@@ -302,3 +307,129 @@ class EditContentViewTestCase(MediaTestCase):
         self.assertEqual(type(context['content_type_form']), form.AddLatex)
         self.assertTrue(context['attachment_allowed'])
         self.assertTrue('item_forms' in context)
+        self.assertEqual(context['compile_report'], model.LatexCompileReport.objects.get(pk=1))
+
+
+@override_settings(MEDIA_ROOT=utils.MEDIA_ROOT)
+class ContentViewTestCase(TestCase):
+    """Content view test case
+
+    Defines the test cases for the content view.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a text field content.
+        """
+        self.user = User.objects.create(username='user')
+        topic = utils.create_topic()
+        self.course = utils.create_course(category=topic.category, owner=self.user)
+        self.content = utils.create_text_field(topic, self.user)
+        self.path = reverse('frontend:content', kwargs={
+            'course_id': self.course.pk, 'topic_id': topic.pk, 'pk': self.content.pk
+        })
+        self.client.force_login(self.user)
+
+    def add_related_objects(self, count):
+        """Add related objects
+
+        Adds the given number of tags, attachments, ratings and comments to the content.
+
+        :param count: The number of the objects to add
+        :type count: int
+        """
+        utils.generate_attachment(self.content, count)
+        for _ in range(count):
+            i = User.objects.count()
+            author = User.objects.create(username=f'author{i}').profile
+            self.content.tags.add(Tag.objects.create(title=f'Tag {i}'))
+            Rating.objects.create(content=self.content, user=author, rating=i % 5 + 1)
+            Comment.objects.create(content=self.content, author=author, text=f'Comment {i}')
+
+    def test_context(self):
+        """Get context data test case
+
+        Tests the function get_context_data that the rating context is set properly.
+        """
+        Rating.objects.create(content=self.content, user=self.user.profile, rating=4)
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        context = response.context_data
+        self.assertEqual(context['rate'], 4)
+        self.assertEqual(context['count'], 1)
+        self.assertEqual(context['user_rate'], 4)
+        self.assertFalse(context['favorite'])
+        self.assertTrue(context['isCurrentUserOwner'])
+
+    def test_constant_queries(self):
+        """Query count test case
+
+        Tests that the number of queries to render the content page does not depend on the
+        number of tags, attachments and comments of the content.
+        """
+        self.add_related_objects(1)
+        with self.assertNumQueries(12):
+            self.client.get(self.path)
+        self.add_related_objects(5)
+        with self.assertNumQueries(12):
+            self.client.get(self.path)
+
+
+@override_settings(MEDIA_ROOT=utils.MEDIA_ROOT)
+class ContentReadingModeViewTestCase(TestCase):
+    """Content reading mode view test case
+
+    Defines the test cases for the content reading mode view.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with three text field contents.
+        """
+        self.user = User.objects.create(username='user')
+        self.topic = utils.create_topic()
+        self.course = utils.create_course(category=self.topic.category)
+        self.contents = [utils.create_text_field(self.topic, self.user, description=f'Content {i}')
+                         for i in range(3)]
+        self.client.force_login(self.user)
+
+    def get_path(self, content):
+        """Get path
+
+        Returns the path of the reading mode of the given content.
+
+        :param content: The content
+        :type content: Content
+
+        :return: the path of the reading mode
+        :rtype: str
+        """
+        return reverse('frontend:content-reading-mode', kwargs={
+            'course_id': self.course.pk, 'topic_id': self.topic.pk, 'pk': content.pk
+        })
+
+    def test_neighbours(self):
+        """Neighbours test case
+
+        Tests that the previous and the next content wrap around in the topic.
+        """
+        first, second, third = self.contents
+        context = self.client.get(self.get_path(first)).context_data
+        self.assertEqual((context['previous_id'], context['next_id']), (third.pk, second.pk))
+        context = self.client.get(self.get_path(third)).context_data
+        self.assertEqual((context['previous_id'], context['next_id']), (second.pk, first.pk))
+
+    def test_coursebook_neighbours(self):
+        """Coursebook neighbours test case
+
+        Tests that the previous and the next content follow the favorites of the user.
+        """
+        first, _, third = self.contents
+        for content in (third, first):
+            Favorite.objects.create(user=self.user.profile, course=self.course,
+                                    content=content)
+        response = self.client.get(self.get_path(third), {'coursebook': 'True'})
+        context = response.context_data
+        self.assertEqual((context['previous_id'], context['next_id']), (first.pk, first.pk))
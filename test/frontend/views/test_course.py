@@ -3,11 +3,16 @@
 This file contains the test cases for /frontend/views/course.py.
 """
 import json
+from unittest import mock
 
+from test import utils
 from test.test_cases import BaseCourseViewTestCase
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.cache import cache
+from django.test import TestCase
 from django.urls import reverse
 
-from base.models import CourseStructureEntry, Topic
+from base.models import CourseStructureEntry, Rating, Topic
 from frontend.forms.course import CreateTopicForm
 
 
@@ -159,3 +164,195 @@ class FavoriteTestCase(BaseCourseViewTestCase):
 
         self.client.post(path, data)
         self.assertEqual(self.user.profile.stared_courses.all().count(), 0)
+
+
+class TopicContentsTestCase(TestCase):
+    """Topic contents test case
+
+    Defines the test cases for the lazily loaded contents of the topics of a course.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a course containing a topic with a text field.
+        """
+        cache.clear()
+        self.user = User.objects.create(username='user')
+        self.topic = utils.create_topic()
+        self.course = utils.create_course(category=self.topic.category, topics=[self.topic])
+        self.content = self.add_content('First content')
+        self.client.force_login(self.user)
+        self.path = reverse('frontend:course-topic-contents', kwargs={
+            'pk': self.course.pk, 'topic_id': self.topic.pk
+        })
+
+    def add_content(self, description):
+        """Add content
+
+        Adds a text field with the given description to the topic.
+
+        :param description: The description of the content
+        :type description: str
+
+        :return: the added content
+        :rtype: Content
+        """
+        return utils.create_text_field(self.topic, self.user, description=description)
+
+    def test_course_view(self):
+        """Course view test case
+
+        Tests that the course page only contains the placeholders of the topics.
+        """
+        response = self.client.get(reverse('frontend:course', kwargs={'pk': self.course.pk}))
+        self.assertContains(response, self.path)
+        self.assertNotContains(response, 'First content')
+
+    def test_contents(self):
+        """Contents test case
+
+        Tests that the contents of the topic are rendered.
+        """
+        response = self.client.get(self.path)
+        self.assertContains(response, 'First content')
+
+    def test_cache(self):
+        """Cache test case
+
+        Tests that the contents are cached and invalidated after a change of the contents.
+        """
+        self.client.get(self.path)
+        # The user and the structure entry of the topic, the session is read from the cache
+        with self.assertNumQueries(2):
+            self.client.get(self.path)
+        self.add_content('Second content')
+        self.assertContains(self.client.get(self.path), 'Second content')
+        Rating.objects.create(content=self.content, user=self.user.profile, rating=5)
+        self.assertContains(self.client.get(self.path), 'fa-star')
+
+    def test_sort_and_filter(self):
+        """Sort and filter test case
+
+        Tests that the contents are sorted and filtered by the given options.
+        """
+        second = self.add_content('Second content')
+        Rating.objects.create(content=second, user=self.user.profile, rating=5)
+        response = self.client.get(self.path, {'sort': 'Rating', 'filter': 'Text'})
+        html = response.content.decode()
+        self.assertLess(html.index('Second content'), html.index('First content'))
+        response = self.client.get(self.path, {'filter': 'Image'})
+        self.assertNotContains(response, 'First content')
+
+    def test_invalid_options(self):
+        """Invalid options test case
+
+        Tests that unknown sort and filter options are rejected.
+        """
+        response = self.client.get(self.path, {'sort': 'description'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_topic_not_in_course(self):
+        """Topic not in course test case
+
+        Tests that the contents of a topic are only available for courses containing it.
+        """
+        other = utils.create_course(title='Other', category=self.course.category)
+        path = reverse('frontend:course-topic-contents', kwargs={
+            'pk': other.pk, 'topic_id': self.topic.pk
+        })
+        self.assertEqual(self.client.get(path).status_code, 404)
+
+
+class AnonymousCoursePageTestCase(TestCase):
+    """Anonymous course page test case
+
+    Defines the test cases for the cached pages of courses shown to anonymous users.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a course containing a topic with a public content.
+        """
+        cache.clear()
+        self.user = User.objects.create(username='user')
+        self.topic = utils.create_topic()
+        self.course = utils.create_course(category=self.topic.category, topics=[self.topic])
+        self.content = utils.create_text_field(self.topic, self.user, public=True,
+                                               description='Public content')
+        self.path = reverse('frontend:course', kwargs={'pk': self.course.pk})
+        self.content_path = reverse('frontend:content', kwargs={
+            'course_id': self.course.pk, 'topic_id': self.topic.pk, 'pk': self.content.pk
+        })
+
+    def test_cache(self):
+        """Cache test case
+
+        Tests that the course page of anonymous users is cached until the course changes.
+        """
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.path).status_code, 200)
+
+        Topic.objects.filter(pk=self.topic.pk).update(title='Renamed')
+        self.assertNotContains(self.client.get(self.path), 'Renamed')
+        self.topic.title = 'Renamed'
+        self.topic.save()
+        self.assertContains(self.client.get(self.path), 'Renamed')
+
+    def test_query(self):
+        """Query test case
+
+        Tests that the pages are cached by the validated sort and filter options and that the
+        pages with other queries are not cached.
+        """
+        self.client.get(self.path + '?sort=Date&filter=None')
+        with self.assertNumQueries(0):
+            self.client.get(self.path + '?filter=None&sort=Date')
+        with mock.patch('base.cache.store_page') as store_page:
+            self.assertEqual(self.client.get(self.path + '?x=1').status_code, 200)
+            self.client.get(self.path + '?sort=Unknown&filter=None')
+            self.client.get(self.path + '?sort=Rating&filter=Text&x=1')
+        store_page.assert_not_called()
+
+    def test_logged_in(self):
+        """Logged in test case
+
+        Tests that the pages of logged in users are private.
+        """
+        self.client.force_login(self.user)
+        response = self.client.get(self.path)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_content_page(self):
+        """Content page test case
+
+        Tests that anonymous users only see public contents and that the page is invalidated
+        after a change of the content.
+        """
+        self.assertContains(self.client.get(self.content_path), 'Text')
+        self.content.textfield.textfield = 'Changed text'
+        self.content.textfield.save()
+        self.assertContains(self.client.get(self.content_path), 'Changed text')
+
+        self.content.public = False
+        self.content.save()
+        self.assertEqual(self.client.get(self.content_path).status_code, 302)
+
+    def test_public_contents(self):
+        """Public contents test case
+
+        Tests that the topics of anonymous users only contain public contents.
+        """
+        utils.create_text_field(self.topic, self.user, description='Private content')
+        path = reverse('frontend:course-topic-contents', kwargs={
+            'pk': self.course.pk, 'topic_id': self.topic.pk
+        })
+        response = self.client.get(path)
+        self.assertContains(response, 'Public content')
+        self.assertNotContains(response, 'Private content')
+        self.client.force_login(self.user)
+        self.assertContains(self.client.get(path), 'Private content')
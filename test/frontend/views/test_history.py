@@ -3,6 +3,8 @@
 This file contains the test cases for /frontend/views/history.py.
 """
 
+from unittest import mock
+
 from test import utils
 from test.test_cases import MediaTestCase, BaseCourseViewTestCase
 
@@ -12,9 +14,14 @@ from reversion import set_comment, is_registered
 from reversion.models import Version
 
 
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.core.cache import caches
+from django.test import TestCase
 from django.urls import reverse
 
 from base.models import Content, Course
+from content.attachment.models import ImageAttachment
+from frontend.views.history import TextfieldHistoryCompareView
 
 import content.models as model
 
@@ -39,6 +46,162 @@ class BaseHistoryCompareViewTestCase(MediaTestCase):
         self.assertTrue(is_registered(model.YTVideoContent))
 
 
+class HistoryCompareTestCase(TestCase):
+    """History compare test case
+
+    Defines the test cases for the pages and the cached diffs of the history compare views.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a text field with two versions.
+        """
+        caches['history'].clear()
+        user = User.objects.create(username='user')
+        topic = utils.create_topic()
+        with reversion.create_revision():
+            content = utils.create_content(model.TextField.TYPE, topic, user)
+            self.text = model.TextField.objects.create(content=content, textfield='Hello!',
+                                                       source='src')
+        with reversion.create_revision():
+            self.text.textfield = 'Changed'
+            self.text.save()
+            set_comment('change text')
+        self.client.force_login(user)
+        self.path = reverse('frontend:textfield-history', kwargs={
+            'course_id': 1, 'topic_id': topic.pk, 'pk': self.text.pk
+        })
+        version2, version1 = Version.objects.get_for_object(self.text)
+        self.data = {'version_id1': version1.pk, 'version_id2': version2.pk}
+
+    def test_cache(self):
+        """Cache test case
+
+        Tests that the diff of a pair of versions is only computed once.
+        """
+        create_diff = TextfieldHistoryCompareView.create_diff
+        with mock.patch.object(TextfieldHistoryCompareView, 'create_diff', autospec=True,
+                               side_effect=create_diff) as patched:
+            for _ in range(2):
+                response = self.client.get(self.path, self.data)
+                self.assertContains(response, '<ins>+ Changed</ins>')
+                self.assertContains(response, 'Text')
+        self.assertEqual(patched.call_count, 1)
+
+    def test_pagination(self):
+        """Pagination test case
+
+        Tests that the versions are listed in pages.
+        """
+        for index in range(TextfieldHistoryCompareView.paginate_by):
+            with reversion.create_revision():
+                self.text.textfield = f'Text {index}'
+                self.text.save()
+        response = self.client.get(self.path)
+        self.assertEqual(len(response.context['action_list']),
+                         TextfieldHistoryCompareView.paginate_by)
+        self.assertEqual(response.context['paginator'].num_pages, 2)
+        response = self.client.get(self.path, {'page': 2})
+        self.assertEqual(len(response.context['action_list']), 2)
+        self.assertContains(response, 'change text')
+
+    def test_ajax_diff(self):
+        """Ajax diff test case
+
+        Tests that only the diff is rendered for ajax requests.
+        """
+        response = self.client.get(self.path, self.data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertTemplateUsed(response, 'frontend/history/history_compare_view.html')
+        self.assertTemplateNotUsed(response, 'frontend/history/history.html')
+        self.assertContains(response, '<ins>+ Changed</ins>')
+        self.assertNotIn('action_list', response.context)
+
+
+class RevertTestCase(TestCase):
+    """Revert test case
+
+    Defines the test cases for the revert of a content to a previous version.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a text field with an attachment in the first version
+        and another attachment in the second version.
+        """
+        self.user = User.objects.create(username='user')
+        self.topic = utils.create_topic()
+        with reversion.create_revision():
+            self.content = utils.create_content(model.TextField.TYPE, self.topic, self.user,
+                                                description='Old')
+            self.text = model.TextField.objects.create(content=self.content, textfield='Old',
+                                                       source='src')
+            self.attachment = ImageAttachment.objects.create(content=self.content,
+                                                             image='old.png', source='src')
+        self.version = Version.objects.get_for_object(self.text).get()
+        self.attachment_pk = self.attachment.pk
+        with reversion.create_revision():
+            self.content.description = 'New'
+            self.content.save()
+            self.text.textfield = 'New'
+            self.text.save()
+            self.attachment.delete()
+            ImageAttachment.objects.create(content=self.content, image='new.png', source='src')
+        self.client.force_login(self.user)
+
+    def test_revert(self):
+        """Revert test case
+
+        Tests that the content, the type specific content and the attachments are restored
+        and that the revert is stored as new version.
+        """
+        path = reverse('frontend:textfield-history', kwargs={
+            'course_id': 1, 'topic_id': self.topic.pk, 'pk': self.text.pk
+        })
+        creation_date = self.content.creation_date
+        self.client.post(path, {'ver_pk': self.version.pk})
+
+        self.content.refresh_from_db()
+        self.text.refresh_from_db()
+        self.assertEqual(self.content.description, 'Old')
+        self.assertEqual(self.content.creation_date, creation_date)
+        self.assertEqual(self.content.author, self.user.profile)
+        self.assertEqual(self.text.textfield, 'Old')
+        self.assertEqual(list(self.content.ImageAttachments.values_list('pk', 'image')),
+                         [(self.attachment_pk, 'old.png')])
+        self.assertEqual(self.content.render_status, Content.RENDERED)
+
+        version = Version.objects.get_for_object(self.text).first()
+        self.assertEqual(version.field_dict['textfield'], 'Old')
+        self.assertEqual(version.revision.version_set.count(), 3)
+        self.assertIn('Reverted to Version', version.revision.get_comment())
+
+    def test_revert_pdf(self):
+        """Revert PDF test case
+
+        Tests that the preview of a content with a PDF is queued to be rendered after the
+        revert.
+        """
+        with reversion.create_revision():
+            content = utils.create_content(model.PDFContent.TYPE, self.topic, self.user)
+            pdf = model.PDFContent.objects.create(content=content, pdf='old.pdf', source='src')
+        version = Version.objects.get_for_object(pdf).get()
+        with reversion.create_revision():
+            pdf.pdf = 'new.pdf'
+            pdf.save()
+        path = reverse('frontend:pdf-history', kwargs={
+            'course_id': 1, 'topic_id': self.topic.pk, 'pk': pdf.pk
+        })
+        with mock.patch('frontend.views.history.queue_rendering') as queue_rendering:
+            self.client.post(path, {'ver_pk': version.pk})
+        queue_rendering.assert_called_once_with(content.pk, self.user.profile.pk)
+        pdf.refresh_from_db()
+        self.assertEqual(pdf.pdf.name, 'old.pdf')
+        content.refresh_from_db()
+        self.assertEqual(content.render_status, Content.RENDER_PENDING)
+
+
 class ContentHistoryCompareViewTestCase(MediaTestCase):
     """ history compare test cases
 
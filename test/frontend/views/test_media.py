@@ -0,0 +1,133 @@
+"""Purpose of this file
+
+This file contains the test cases for /frontend/views/media.py.
+"""
+
+import os
+import shutil
+
+from test import utils
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.test import TestCase, override_settings
+
+from base.storage import get_blob_name, get_linearized_name
+from content.models import PDFContent
+
+# bytes: The data of the served PDF
+PDF_DATA = b'%PDF-1.4\n' + bytes(range(256)) * 4
+
+
+@override_settings(MEDIA_ROOT=utils.MEDIA_ROOT,
+                   MEDIA_SENDFILE={'HEADER': None, 'LOCATION': '/protected-media/'})
+class ServeMediaTestCase(TestCase):
+    """Serve media test case
+
+    Defines the test cases for the protected media.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database with a PDF content which is not public.
+        """
+        self.user = User.objects.create(username='user')
+        self.content = utils.create_content(PDFContent.TYPE, utils.create_topic(), self.user)
+        PDFContent.objects.create(content=self.content, pdf='uploads/slides.pdf', source='src')
+        os.makedirs(os.path.join(utils.MEDIA_ROOT, 'uploads'), exist_ok=True)
+        with open(os.path.join(utils.MEDIA_ROOT, 'uploads/slides.pdf'), 'wb') as file:
+            file.write(PDF_DATA)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down class
+
+        Deletes the media after running the tests.
+        """
+        shutil.rmtree(utils.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_anonymous(self):
+        """Anonymous test case
+
+        Tests that anonymous users are redirected to the login unless the content is public.
+        """
+        response = self.client.get('/media/uploads/slides.pdf')
+        self.assertEqual(response.status_code, 302)
+
+        self.content.public = True
+        self.content.save()
+        response = self.client.get('/media/uploads/slides.pdf')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), PDF_DATA)
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_linearized(self):
+        """Linearized test case
+
+        Tests that the linearized copy of the PDF of a public content is public.
+        """
+        name = get_blob_name('ab' * 32, 'slides.pdf')
+        PDFContent.objects.filter(pk=self.content.pk).update(pdf=name)
+        linearized_path = os.path.join(utils.MEDIA_ROOT, get_linearized_name(name))
+        os.makedirs(os.path.dirname(linearized_path), exist_ok=True)
+        with open(linearized_path, 'wb') as file:
+            file.write(PDF_DATA)
+
+        path = '/media/' + get_linearized_name(name)
+        self.assertEqual(self.client.get(path).status_code, 302)
+        self.content.public = True
+        self.content.save()
+        self.assertEqual(self.client.get(path).status_code, 200)
+
+    def test_logged_in(self):
+        """Logged in test case
+
+        Tests that logged in users may access the files of all contents.
+        """
+        self.client.force_login(self.user)
+        response = self.client.get('/media/uploads/slides.pdf')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_range(self):
+        """Range test case
+
+        Tests that a range of the file is served and that invalid ranges are rejected.
+        """
+        self.client.force_login(self.user)
+        response = self.client.get('/media/uploads/slides.pdf', HTTP_RANGE='bytes=9-18')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), PDF_DATA[9:19])
+        self.assertEqual(response['Content-Range'], f'bytes 9-18/{len(PDF_DATA)}')
+
+        response = self.client.get('/media/uploads/slides.pdf', HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(response.streaming_content), PDF_DATA[-4:])
+
+        response = self.client.get('/media/uploads/slides.pdf',
+                                   HTTP_RANGE=f'bytes={len(PDF_DATA)}-')
+        self.assertEqual(response.status_code, 416)
+
+    @override_settings(MEDIA_SENDFILE={'HEADER': 'X-Accel-Redirect',
+                                       'LOCATION': '/protected-media/'})
+    def test_sendfile(self):
+        """Sendfile test case
+
+        Tests that the transfer is handed to the web server.
+        """
+        self.client.force_login(self.user)
+        response = self.client.get('/media/uploads/slides.pdf')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/uploads/slides.pdf')
+        self.assertEqual(response.content, b'')
+
+    def test_not_found(self):
+        """Not found test case
+
+        Tests that missing files and files outside of the media are not served.
+        """
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/media/uploads/missing.pdf').status_code, 404)
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, 404)
+        self.assertEqual(self.client.get('/media/uploads').status_code, 404)
@@ -0,0 +1,65 @@
+"""Purpose of this file
+
+This file contains the test cases for /frontend/views/metrics.py.
+"""
+
+import tempfile
+
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.test import TestCase, override_settings
+
+from base.metrics import DB_QUERIES, REQUEST_DURATION
+
+
+class MetricsViewTestCase(TestCase):
+    """Metrics view test case
+
+    Defines the test cases for the measured requests and the metrics endpoint.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up a temporary directory of the snapshots.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = override_settings(METRICS={'DIRECTORY': directory.name, 'SECONDS': 10,
+                                              'ALLOWED_IPS': ['127.0.0.1']})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_request(self):
+        """Request test case
+
+        Tests that the wall time and the queries of a request are observed by its view.
+        """
+        self.client.force_login(User.objects.create(username='user'))
+        self.client.get('/courses/')
+        requests = {tuple(labels): values for labels, values in REQUEST_DURATION.snapshot()}
+        self.assertIn(('frontend:courses', 'GET', '200'), requests)
+        queries = {tuple(labels): values for labels, values in DB_QUERIES.snapshot()}
+        # The sum of the queries of the requests
+        self.assertGreater(queries[('frontend:courses',)][-1], 0)
+
+    def test_metrics(self):
+        """Metrics test case
+
+        Tests that the metrics are exposed in the text format of Prometheus.
+        """
+        self.client.get('/courses/')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn('collab_request_duration_seconds_count{view="frontend:courses",'
+                      'method="GET",status="200"}', response.content.decode())
+
+    def test_forbidden(self):
+        """Forbidden test case
+
+        Tests that the metrics are not exposed to other addresses.
+        """
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.1').status_code, 403)
+        user = User.objects.create(username='staff', is_staff=True)
+        self.client.force_login(user)
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.1').status_code, 200)
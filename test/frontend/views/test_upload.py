@@ -0,0 +1,172 @@
+"""Purpose of this file
+
+This file contains the test cases for /frontend/views/upload.py.
+"""
+
+import os
+import shutil
+import tempfile
+
+from test import utils
+
+from django.conf import settings
+from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from content.forms import AddContentFormPdf
+from content.models import ChunkedUpload, PDFContent
+from content.upload import attach_uploads
+
+# bytes: The data of the uploaded PDF
+PDF_DATA = b'%PDF-1.4\n' + b'0' * 3000
+
+# str: The directory of the uploaded chunks
+UPLOAD_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=utils.MEDIA_ROOT,
+                   CHUNKED_UPLOAD={**settings.CHUNKED_UPLOAD, 'ROOT': UPLOAD_ROOT,
+                                   'CHUNK_SIZE': 1024})
+class ChunkedUploadTestCase(TestCase):
+    """Chunked upload test case
+
+    Defines the test cases for the chunked uploads.
+    """
+
+    def setUp(self):
+        """Setup
+
+        Sets up the test database and logs in the user.
+        """
+        self.user = User.objects.create(username='user')
+        self.client.force_login(self.user)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down class
+
+        Deletes the uploaded files after running the tests.
+        """
+        shutil.rmtree(UPLOAD_ROOT, ignore_errors=True)
+        shutil.rmtree(utils.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def start_upload(self, data=PDF_DATA):
+        """Start upload
+
+        Starts the upload of a PDF and returns the url of its chunks.
+
+        :param data: The data of the uploaded file
+        :type data: bytes
+
+        :return: the url of the chunks
+        :rtype: str
+        """
+        response = self.client.post(reverse('frontend:upload-start'), {
+            'kind': ChunkedUpload.PDF, 'filename': 'slides.pdf', 'size': len(data)
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['chunk_size'], 1024)
+        return reverse('frontend:upload-chunk', args=(response.json()['id'],))
+
+    def send_chunk(self, path, start, end, data=PDF_DATA):
+        """Send chunk
+
+        Sends the chunk of the data between start and end.
+
+        :param path: The url of the chunks
+        :type path: str
+        :param start: The start of the chunk
+        :type start: int
+        :param end: The exclusive end of the chunk
+        :type end: int
+        :param data: The data of the uploaded file
+        :type data: bytes
+
+        :return: the response
+        :rtype: JsonResponse
+        """
+        return self.client.put(path, data[start:end], content_type='application/octet-stream',
+                               HTTP_CONTENT_RANGE=f'bytes {start}-{end - 1}/{len(data)}')
+
+    def test_upload(self):
+        """Upload test case
+
+        Tests that the chunks are assembled to the uploaded file.
+        """
+        path = self.start_upload()
+        for start in range(0, len(PDF_DATA), 1024):
+            response = self.send_chunk(path, start, min(start + 1024, len(PDF_DATA)))
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'offset': len(PDF_DATA), 'complete': True})
+        upload = ChunkedUpload.objects.get()
+        with open(upload.path, 'rb') as file:
+            self.assertEqual(file.read(), PDF_DATA)
+
+    def test_resume(self):
+        """Resume test case
+
+        Tests that a chunk at another offset is rejected with the current offset.
+        """
+        path = self.start_upload()
+        self.send_chunk(path, 0, 1024)
+        response = self.send_chunk(path, 2048, len(PDF_DATA))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 1024)
+        self.assertEqual(self.client.get(path).json(), {'offset': 1024, 'complete': False})
+
+    def test_invalid_type(self):
+        """Invalid type test case
+
+        Tests that the upload is rejected after the first chunk if it is not a PDF.
+        """
+        data = b'Text' * 1000
+        path = self.start_upload(data)
+        response = self.send_chunk(path, 0, 1024, data)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(path).json(), {'offset': 0, 'complete': False})
+
+    def test_other_user(self):
+        """Other user test case
+
+        Tests that the upload of another user can not be continued.
+        """
+        path = self.start_upload()
+        self.client.force_login(User.objects.create(username='other'))
+        self.assertEqual(self.send_chunk(path, 0, 1024).status_code, 404)
+
+    def test_too_large(self):
+        """Too large test case
+
+        Tests that files larger than the maximum size are rejected.
+        """
+        response = self.client.post(reverse('frontend:upload-start'), {
+            'kind': ChunkedUpload.PDF, 'filename': 'slides.pdf',
+            'size': settings.CHUNKED_UPLOAD['MAX_SIZE'] + 1
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_attach(self):
+        """Attach test case
+
+        Tests that a complete upload is attached to the form and moved to the media.
+        """
+        path = self.start_upload()
+        for start in range(0, len(PDF_DATA), 1024):
+            self.send_chunk(path, start, min(start + 1024, len(PDF_DATA)))
+        upload = ChunkedUpload.objects.get()
+
+        request = RequestFactory().post('/', {'source': 'src', 'pdf_upload_id': upload.pk})
+        request.user = self.user
+        with attach_uploads(request) as files:
+            form = AddContentFormPdf(request.POST, files)
+            self.assertTrue(form.is_valid(), form.errors)
+            pdf = form.save(commit=False)
+            pdf.content = utils.create_content(PDFContent.TYPE, utils.create_topic(), self.user)
+            pdf.save()
+        self.assertTrue(files['pdf'].closed)
+        self.assertTrue(pdf.pdf.name.endswith('.pdf'))
+        with open(pdf.pdf.path, 'rb') as file:
+            self.assertEqual(file.read(), PDF_DATA)
+        self.assertFalse(os.path.exists(upload.path))
@@ -12,7 +12,7 @@ from django.core.files.images import ImageFile
 
 from django.contrib.auth.models import User  # pylint: disable=imported-auth-user
 
-from base.models.content import Category, Topic, Content, Course
+from base.models.content import Category, Topic, Content, Course, CourseStructureEntry
 
 import content.forms as form
 import content.models as model
@@ -64,9 +64,9 @@ def setup_database():
     Sets up the database to be used for testing which contains a latex content.
     """
     user = User.objects.create()
-    cat = Category.objects.create(title="Category")
+    cat = create_category()
     Course.objects.create(title='Course', description='desc', category=cat)
-    Topic.objects.create(title="Topic", category=cat)
+    create_topic(category=cat)
     content = create_content(model.Latex.TYPE)
     content.save()
     latex_code = form.get_placeholder(model.Latex.TYPE, 'textfield')
@@ -74,22 +74,105 @@ def setup_database():
     Validator.validate_latex(user, content, latex)
 
 
-def create_content(content_type, attachment=None):
+def create_category(title="Category"):
+    """Create category
+
+    Creates a dummy category with the given title.
+
+    :param title: The title of the category
+    :type title: str
+
+    :return: the created category
+    :rtype: Category
+    """
+    return Category.objects.create(title=title)
+
+
+def create_topic(title="Topic", category=None):
+    """Create topic
+
+    Creates a dummy topic with the given title. A new category is created if none is given.
+
+    :param title: The title of the topic
+    :type title: str
+    :param category: The category of the topic
+    :type category: Category or None
+
+    :return: the created topic
+    :rtype: Topic
+    """
+    return Topic.objects.create(title=title,
+                                category=create_category() if category is None else category)
+
+
+def create_course(title='Course', category=None, owner=None, topics=()):
+    """Create course
+
+    Creates a dummy course with the given title whose structure contains the given topics one
+    after another. A new category is created if none is given.
+
+    :param title: The title of the course
+    :type title: str
+    :param category: The category of the course
+    :type category: Category or None
+    :param owner: The owner of the course
+    :type owner: User or None
+    :param topics: The topics of the structure of the course
+    :type topics: Iterable[Topic]
+
+    :return: the created course
+    :rtype: Course
+    """
+    course = Course.objects.create(title=title, description='desc',
+                                   category=create_category() if category is None else category)
+    if owner is not None:
+        course.owners.add(owner.profile)
+    for index, topic in enumerate(topics, 1):
+        CourseStructureEntry.objects.create(course=course, index=str(index), topic=topic)
+    return course
+
+
+def create_content(content_type, topic=None, author=None, **kwargs):
     """Create content
 
+    Create a dummy content with the given content type. The topic and the author default to
+    the first topic and the first user of the database.
+
     :param content_type: The type of the content
     :type content_type: str
-    :param attachment: The attachment of the content
-    :type attachment: ImageAttachment
-
-    Create a dummy content with the given content type and attachment.
+    :param topic: The topic of the content
+    :type topic: Topic or None
+    :param author: The author of the content
+    :type author: User or None
+    :param kwargs: The further fields of the content
+    :type kwargs: dict[str, Any]
 
     :return: the created content
     :rtype: Content
     """
-    return Content.objects.create(author=User.objects.first().profile,
-                                  topic=Topic.objects.first(),
+    kwargs.setdefault('description', 'this is a description')
+    kwargs.setdefault('language', 'de')
+    return Content.objects.create(author=(author or User.objects.first()).profile,
+                                  topic=topic or Topic.objects.first(),
                                   type=content_type,
-                                  description='this is a description',
-                                  language='de',
-                                  attachment=attachment)
+                                  **kwargs)
+
+
+def create_text_field(topic=None, author=None, **kwargs):
+    """Create text field
+
+    Create a dummy content with a text field, see create_content.
+
+    :param topic: The topic of the content
+    :type topic: Topic or None
+    :param author: The author of the content
+    :type author: User or None
+    :param kwargs: The further fields of the content
+    :type kwargs: dict[str, Any]
+
+    :return: the created content
+    :rtype: Content
+    """
+    content = create_content(model.TextField.TYPE, topic, author, **kwargs)
+    model.TextField.objects.create(content=content, textfield='Text', source='src')
+    return content